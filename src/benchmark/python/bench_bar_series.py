@@ -0,0 +1,70 @@
+"""
+Per-cycle cost of handing fetched bars to the strategy: a DataFrame copy of each
+MT5 rates array (the previous get_multi_tf_data) versus a BarSeries view.
+
+For each container the script times one warm evaluation cycle. A cycle is
+wrapping the HTF/LTF arrays and running IndicatorEngine.update on both. It
+also reports the bytes tracemalloc sees allocated per cycle and the memory
+each symbol keeps alive between cycles.
+
+Usage:
+    python src/benchmark/python/bench_bar_series.py [--bars 1000] [--cycles 2000]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Client import Timeframes
+from advisor.Client.Rates import BarSeries
+from advisor.MovingAverage.StreamingMA import IndicatorEngine
+from advisor.Simulator import SyntheticBars
+
+CONTAINERS = {
+    'DataFrame': lambda rates, symbol, timeframe: pd.DataFrame(rates),
+    'BarSeries': BarSeries,
+}
+
+
+def cycle(wrap, engine, data):
+    wrapped = {name: wrap(rates, "EURUSD", name) for name, rates in data.items()}
+    for name, bars in wrapped.items():
+        engine.update("EURUSD", name, bars)
+    return wrapped
+
+
+def retained_bytes(wrapped):
+    return sum(bars.memory_usage(deep=True).sum() if isinstance(bars, pd.DataFrame) else 0  # views own nothing
+               for bars in wrapped.values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bars", type=int, default=1000)
+    parser.add_argument("--cycles", type=int, default=2000)
+    args = parser.parse_args()
+
+    data = SyntheticBars.generate_multi_tf(4 * args.bars, {"HTF": Timeframes.TIMEFRAME_H4, "LTF": Timeframes.TIMEFRAME_H1})
+    data = {name: rates[-args.bars:] for name, rates in data.items()}
+
+    for label, wrap in CONTAINERS.items():
+        engine = IndicatorEngine()
+        wrapped = cycle(wrap, engine, data)  # seeds the indicators
+
+        start = time.perf_counter()
+        for _ in range(args.cycles):
+            cycle(wrap, engine, data)
+        per_cycle = (time.perf_counter() - start) / args.cycles
+
+        tracemalloc.start()
+        cycle(wrap, engine, data)
+        allocated = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print(f"{label:10s} {per_cycle * 1e6:8.1f} µs/cycle  {allocated / 1024:8.1f} KiB allocated/cycle  "
+              f"{retained_bytes(wrapped) / 1024:8.1f} KiB retained/symbol")
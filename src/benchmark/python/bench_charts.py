@@ -0,0 +1,88 @@
+"""
+Entry chart rendering: the per-signal drawing loop MovingAverageCrossover.plot_charts
+used (one scatter and two hlines calls per Buy/Sell, every bar plotted)
+against Backtest.Charts (one collection per marker kind, LTTB-downsampled
+lines), both saved off-screen to PNG. Then it renders --symbols charts with
+Charts.render_all in worker processes.
+
+Usage:
+    python src/benchmark/python/bench_charts.py [--bars 20000] [--symbols 8] [--processes 4]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Backtest import BatchBacktest, Charts
+from advisor.Client import Timeframes
+from advisor.MovingAverage import MovingAverage as MA
+from advisor.Simulator import SyntheticBars
+
+
+def entries_for(bars, seed):
+    data = SyntheticBars.generate_multi_tf(bars, {"HTF": Timeframes.TIMEFRAME_H4, "LTF": Timeframes.TIMEFRAME_H1},
+                                           seed=seed)
+    strategy = MA.MovingAverageCrossover("EURUSD", None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        htf = strategy.calculate_moving_averages(BatchBacktest._frame(BatchBacktest.compact_rates(data['HTF'])), timeframe="HTF")
+        ltf = strategy.calculate_moving_averages(BatchBacktest._frame(BatchBacktest.compact_rates(data['LTF'])), timeframe="LTF")
+        return strategy.identify_entry_levels(htf, ltf.reset_index(drop=True), timeframe="LTF")
+
+
+def render_per_signal(entries, path):
+    """The drawing calls of the old plot_charts, saved instead of shown."""
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(18, 6), dpi=Charts.DPI, layout='tight')
+    ax = fig.subplots()
+    ax.plot(entries['time'], entries['close'], color='black')
+    ax.plot(entries['time'], entries['Fast_MA'], color='blue')
+    ax.plot(entries['time'], entries['Slow_MA'], color='red')
+    for side, marker in (('Buy', '^'), ('Sell', 'v')):
+        signals = entries[entries['Entry'] == side]
+        for i in signals.index:
+            when = signals.loc[i, 'time']
+            ax.scatter(when, signals.loc[i, 'Level'], marker=marker, color='green' if side == 'Buy' else 'red')
+            ax.hlines(y=signals.loc[i, 'TP'], xmin=when - pd.Timedelta(minutes=1), xmax=when + pd.Timedelta(minutes=1),
+                      color='green', linestyles='--')
+            ax.hlines(y=signals.loc[i, 'SL'], xmin=when - pd.Timedelta(minutes=1), xmax=when + pd.Timedelta(minutes=1),
+                      color='red', linestyles='--')
+    fig.savefig(path)
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bars", type=int, default=20000, help="LTF bars per chart")
+    parser.add_argument("--symbols", type=int, default=8)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--skip-legacy", action="store_true", help="only time the collection renderer")
+    args = parser.parse_args()
+
+    entries = entries_for(args.bars, seed=1)
+    signals = int(np.isin(entries['Entry'].to_numpy(dtype=object), ['Buy', 'Sell']).sum())
+    with tempfile.TemporaryDirectory() as out:
+        Charts.render_entries("WARMUP", entries, os.path.join(out, "warmup.png"))
+        print(f"{len(entries)} bars, {signals} signals")
+        if not args.skip_legacy:
+            print(f"per-signal calls : {timed(render_per_signal, entries, os.path.join(out, 'legacy.png')):7.2f}s")
+        print(f"collections+LTTB : {timed(Charts.render_entries, 'EURUSD', entries, os.path.join(out, 'new.png')):7.2f}s")
+        print(f"  as SVG         : {timed(Charts.render_entries, 'EURUSD', entries, os.path.join(out, 'new.svg')):7.2f}s")
+
+        charts = {f"SYM{i:03d}": entries_for(args.bars, seed=i) for i in range(args.symbols)}
+        serial = timed(Charts.render_all, charts, out, "png", 1)
+        parallel = timed(Charts.render_all, charts, out, "png", args.processes)
+        print(f"{args.symbols} charts: serial {serial:.2f}s, worker processes {parallel:.2f}s")
@@ -0,0 +1,118 @@
+"""
+Benchmark the vectorized MovingAverageCrossover.identify_entry_levels against
+the original row-by-row implementation on synthetic H1/H4 bars.
+
+Usage:
+    python src/benchmark/python/bench_entry_levels.py [--sizes 10000 100000 1000000] [--reference-max 10000]
+
+The reference loop is O(n·m) and is only timed up to --reference-max LTF bars;
+for those sizes the two outputs are also checked for equality.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.MovingAverage import MovingAverage as MA
+
+
+def synthetic_rates(bars, freq, seed=0, start="2020-01-01"):
+    rng = np.random.default_rng(seed)
+    close = 1.10 + np.cumsum(rng.normal(0, 0.0008, bars))
+    return pd.DataFrame({
+        'time': pd.date_range(start, periods=bars, freq=freq),
+        'open': close,
+        'high': close + 0.001,
+        'low': close - 0.001,
+        'close': close,
+        'tick_volume': 1,
+        'spread': 1,
+        'real_volume': 0,
+    })
+
+
+def reference_identify_entry_levels(symbol, HTS_data, LTS_data):
+    """The original per-row implementation, kept verbatim for comparison."""
+    sl_distance = 0.003
+    tp_distance = 0.01
+    threshold = 50 * 0.01 if symbol == 'USDJPY' else 0.0050
+
+    for i in range(len(LTS_data)):
+        row = LTS_data.iloc[i]
+        ltf_time = pd.to_datetime(row['time'])
+
+        htf_match = HTS_data[HTS_data['time'] <= ltf_time]
+        if htf_match.empty:
+            continue
+
+        htf_row = htf_match.iloc[-1]
+        market_bias = htf_row['Bias']
+        ltf_bias = row['Bias']
+        ltf_Bias_label = "Buy" if ltf_bias == 'Bullish' else "Sell"
+        range_value = abs(row['close'] - row['Fast_MA'])
+
+        LTS_data.loc[i, 'Market_bias'] = market_bias
+        LTS_data.loc[i, 'ltf_bias'] = ltf_bias
+        LTS_data.loc[i, 'Range'] = range_value
+
+        if range_value <= threshold:
+            if market_bias == 'Bullish' and ltf_Bias_label == 'Buy' and row['close'] > row['Fast_MA']:
+                LTS_data.loc[i, 'Entry'] = 'Buy'
+                LTS_data.loc[i, 'Level'] = row['close']
+                LTS_data.loc[i, 'SL'] = row['close'] - sl_distance
+                LTS_data.loc[i, 'TP'] = row['close'] + tp_distance
+            elif market_bias == 'Bearish' and ltf_Bias_label == 'Sell' and row['close'] < row['Fast_MA']:
+                LTS_data.loc[i, 'Entry'] = 'Sell'
+                LTS_data.loc[i, 'Level'] = row['close']
+                LTS_data.loc[i, 'SL'] = row['close'] + sl_distance
+                LTS_data.loc[i, 'TP'] = row['close'] - tp_distance
+        else:
+            LTS_data.loc[i, 'Entry'] = None
+            LTS_data.loc[i, 'Level'] = None
+            LTS_data.loc[i, 'SL'] = None
+            LTS_data.loc[i, 'TP'] = None
+
+    return LTS_data.drop(columns=['tick_volume', 'real_volume', 'spread', 'Signal'])
+
+
+def prepare(bars, symbol="EURUSD"):
+    strategy = MA.MovingAverageCrossover(symbol, data=None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        htf = strategy.calculate_moving_averages(synthetic_rates(bars // 4 + 200, "4h", seed=1, start="2019-12-01"))
+        ltf = strategy.calculate_moving_averages(synthetic_rates(bars, "h", seed=2))
+    return strategy, htf.reset_index(drop=True), ltf.reset_index(drop=True)
+
+
+def run(sizes, reference_max):
+    print(f"{'bars':>10} {'vectorized (s)':>15} {'reference (s)':>15} {'speedup':>10}")
+    for bars in sizes:
+        strategy, htf, ltf = prepare(bars)
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fast = strategy.identify_entry_levels(htf.copy(), ltf.copy())
+        vectorized = time.perf_counter() - start
+
+        if bars <= reference_max:
+            start = time.perf_counter()
+            slow = reference_identify_entry_levels(strategy.symbol, htf.copy(), ltf.copy())
+            reference = time.perf_counter() - start
+            pd.testing.assert_frame_equal(slow.astype({c: float for c in ('Level', 'SL', 'TP') if c in slow}), fast)
+            print(f"{bars:>10} {vectorized:>15.4f} {reference:>15.4f} {reference / vectorized:>9.0f}x")
+        else:
+            print(f"{bars:>10} {vectorized:>15.4f} {'skipped':>15} {'-':>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--reference-max", type=int, default=10_000)
+    args = parser.parse_args()
+    run(args.sizes, args.reference_max)
@@ -0,0 +1,46 @@
+"""
+Benchmark the event-driven backtester on one year of synthetic M1 bars.
+
+Usage:
+    python src/benchmark/python/bench_event_backtester.py [--bars 372000] [--signal-rate 0.1]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Backtest.EventBacktester import run_backtest
+
+
+def synthetic_signals(bars, signal_rate, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 1.10 + np.cumsum(rng.normal(0, 0.0002, bars))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) + rng.uniform(0, 0.0003, bars)
+    low = np.minimum(open_, close) - rng.uniform(0, 0.0003, bars)
+    direction = rng.choice([0, 1, -1], p=[1 - signal_rate, signal_rate / 2, signal_rate / 2], size=bars)
+    sl = close - direction * 0.003
+    tp = close + direction * 0.01
+    return open_, high, low, close, direction, close, sl, tp
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bars", type=int, default=372_000)  # ~1 year of M1 on a 5-day week
+    parser.add_argument("--signal-rate", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    arrays = synthetic_signals(args.bars, args.signal_rate)
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        result = run_backtest(*arrays)
+        timings.append(time.perf_counter() - start)
+
+    print(f"bars={args.bars} trades={len(result.trades)} best={min(timings):.4f}s median={np.median(timings):.4f}s")
+    print(result.summary())
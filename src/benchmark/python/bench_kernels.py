@@ -0,0 +1,60 @@
+"""
+Cost of each indicator kernel on one close series, next to the pandas rolling
+mean that calculate_moving_averages used before the kernels existed.
+
+Batch rows time one whole-array call. Streaming rows time update() per bar,
+the cost a live worker pays for each newly closed bar.
+
+Usage:
+    python src/benchmark/python/bench_kernels.py [--bars 20000] [--period 50] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.MovingAverage import Kernels
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bars", type=int, default=20000)
+    parser.add_argument("--period", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0005, args.bars))
+    spread = np.abs(rng.normal(0, 0.0004, args.bars))
+    high, low = close + spread, close - spread
+    period = args.period
+
+    batch = {'pandas rolling': lambda: pd.Series(close).rolling(period).mean().to_numpy()}
+    batch.update({name: (lambda name=name: Kernels.moving_average(name, close, period)) for name in Kernels.MOVING_AVERAGES})
+    batch['atr'] = lambda: Kernels.atr(high, low, close, period)
+    for name, func in batch.items():
+        print(f"batch     {name:15s} {best_of(args.repeat, func) * 1e3:8.3f} ms / {args.bars} bars")
+
+    for name in Kernels.MOVING_AVERAGES:
+        indicator = Kernels.streaming(name, period)
+        values = close.tolist()
+        elapsed = best_of(1, lambda: [indicator.update(value) for value in values])
+        print(f"streaming {name:15s} {elapsed / args.bars * 1e6:8.3f} µs / bar")
+    indicator = Kernels.AverageTrueRange(period)
+    columns = high.tolist(), low.tolist(), close.tolist()
+    elapsed = best_of(1, lambda: list(map(indicator.update, *columns)))
+    print(f"streaming {'atr':15s} {elapsed / args.bars * 1e6:8.3f} µs / bar")
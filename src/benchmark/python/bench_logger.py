@@ -0,0 +1,72 @@
+"""
+Benchmark print() throughput into the CSV log: the buffered FileLogger against the
+previous open-write-close per line, with several threads printing at once.
+
+Usage:
+    python src/benchmark/python/bench_logger.py [--lines 20000] [--threads 8]
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Logs.Logger import FileLogger
+
+USER_DATA = {'server': 'Demo', 'account_id': 1}
+
+
+class UnbufferedLogger:
+    """The previous FileLogger.write: one open/csv.writer/close per print()."""
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def write(self, message):
+        message = message.strip()
+        if not message:
+            return
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with open(self.filename, mode='a', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerow([f"{timestamp} »»» Demo-1", f": {message}"])
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def run(logger, lines, threads):
+    def produce(index):
+        for i in range(lines // threads):
+            print(f"🟢 worker {index} evaluated symbol {i}", file=logger)
+
+    workers = [threading.Thread(target=produce, args=(index,)) for index in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    produced = time.perf_counter() - start
+    logger.close()
+    return produced, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=20_000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for label, make in (("unbuffered", lambda path: UnbufferedLogger(path)),
+                            ("buffered", lambda path: FileLogger(USER_DATA, filename=path, redirect=False))):
+            produced, total = run(make(os.path.join(directory, f"{label}.csv")), args.lines, args.threads)
+            print(f"{label:10s} lines={args.lines} threads={args.threads} "
+                  f"print() {produced / args.lines * 1e6:.1f}µs/line, on disk after {total:.3f}s")
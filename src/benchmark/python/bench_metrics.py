@@ -0,0 +1,50 @@
+"""
+Overhead of one Registry.timed block, next to an empty loop of the same length.
+
+The stage timers wrap every identify_entry_levels and get_multi_tf_data call,
+so their cost should stay in the low microseconds.
+
+Usage:
+    python src/benchmark/python/bench_metrics.py [--runs 20000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Metrics import Registry
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def empty_loop(runs):
+    for _ in range(runs):
+        pass
+
+
+def timed_loop(runs):
+    for _ in range(runs):
+        with Registry.timed("identify_entry_levels", "EURUSD", "H1"):
+            pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = best_of(args.repeat, lambda: empty_loop(args.runs))
+    timed = best_of(args.repeat, lambda: timed_loop(args.runs))
+    print(f"empty loop     {baseline / args.runs * 1e6:8.3f} µs / block")
+    print(f"Registry.timed {timed / args.runs * 1e6:8.3f} µs / block")
+    print(f"overhead       {(timed - baseline) / args.runs * 1e6:8.3f} µs / block")
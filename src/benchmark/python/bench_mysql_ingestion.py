@@ -0,0 +1,67 @@
+"""
+Benchmark candle ingestion: the bulk upsert path against the legacy one-row-at-a-time path.
+
+The legacy path is reproduced with batch_size=1 and a retention pass after every row,
+which is what save_candle_data used to do. Runs against a local SQLite file by default;
+pass MySQL credentials to measure a real server.
+
+Usage:
+    python src/benchmark/python/bench_mysql_ingestion.py [--rows 20000] [--max-rows 5000]
+    python src/benchmark/python/bench_mysql_ingestion.py --host localhost --user bot --password ... --database trading_data
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.database.MySQLdatabase import CANDLE_COLUMNS, MySQLDatabase, SQLiteDialect
+
+
+def candle_rows(count, symbol="EURUSD", start=datetime(2024, 1, 1)):
+    return [(symbol, start + timedelta(minutes=i), 1.1, 1.2, 1.0, 1.1 + i * 1e-5, 10.0) for i in range(count)]
+
+
+def ingest(db, table_name, rows, max_rows, per_row):
+    db.create_table(table_name, db.dialect.candle_schema())
+    start = time.perf_counter()
+    if per_row:
+        for row in rows:
+            db.insert_rows(table_name, CANDLE_COLUMNS, [row], conflict_columns=["symbol", "timestamp"],
+                           batch_size=1, max_rows=max_rows)
+    else:
+        db.insert_rows(table_name, CANDLE_COLUMNS, rows, conflict_columns=["symbol", "timestamp"], max_rows=max_rows)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--max-rows", type=int, default=5_000)
+    parser.add_argument("--host")
+    parser.add_argument("--user")
+    parser.add_argument("--password")
+    parser.add_argument("--database")
+    args = parser.parse_args()
+
+    rows = candle_rows(args.rows)
+    with tempfile.TemporaryDirectory() as directory:
+        if args.host:
+            db = MySQLDatabase(args.host, args.user, args.password, args.database)
+        else:
+            path = os.path.join(directory, "candles.db")
+            db = MySQLDatabase(None, None, None, path, dialect=SQLiteDialect,
+                               connect=lambda: sqlite3.connect(path, check_same_thread=False))
+        try:
+            for label, per_row in (("per-row", True), ("bulk", False)):
+                table_name = f"bench_candles_{label.replace('-', '_')}"
+                elapsed = ingest(db, table_name, rows, args.max_rows, per_row)
+                print(f"{label:8s} rows={args.rows} max_rows={args.max_rows} "
+                      f"{elapsed:.3f}s {args.rows / elapsed:,.0f} rows/s")
+                db.cursor.execute(f"DROP TABLE {table_name}")
+        finally:
+            db.close()
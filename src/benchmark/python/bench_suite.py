@@ -0,0 +1,143 @@
+"""
+Offline benchmark suite for the MovingAverageCrossover pipeline on synthetic bars.
+
+No MetaTrader 5 terminal is needed: H1/H4 bars are generated in the copy_rates_*
+dtype by advisor.Simulator.SyntheticBars. For each size the suite times
+calculate_moving_averages, identify_entry_levels, backtest_strategy and
+save_signals_to_csv. Each case is then run once more under tracemalloc to
+record its peak Python allocation.
+
+Results are written as JSON. With --baseline, each case is compared with the
+stored result, and the script exits with status 1 if any case is slower or
+uses more memory than the tolerance allows.
+
+Usage:
+    python src/benchmark/python/bench_suite.py --sizes 10000 100000 --output results.json
+    python src/benchmark/python/bench_suite.py --output baseline.json            # record a baseline
+    python src/benchmark/python/bench_suite.py --baseline baseline.json --time-tolerance 0.25
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Client import Timeframes
+from advisor.MovingAverage import MovingAverage as MA
+from advisor.Simulator import SyntheticBars
+
+
+def make_cases(bars, directory):
+    """(name, setup, run) per stage; setup builds fresh inputs so every repeat starts from the same state."""
+    data = SyntheticBars.generate_multi_tf(bars, {"HTF": Timeframes.TIMEFRAME_H4, "LTF": Timeframes.TIMEFRAME_H1})
+    htf_frame, ltf_frame = SyntheticBars.rates_frame(data["HTF"]), SyntheticBars.rates_frame(data["LTF"])
+    strategy = MA.MovingAverageCrossover("EURUSD", None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        htf = strategy.calculate_moving_averages(htf_frame.copy()).reset_index(drop=True)
+        ltf = strategy.calculate_moving_averages(ltf_frame.copy()).reset_index(drop=True)
+        entries = strategy.identify_entry_levels(htf, ltf.copy())
+    csv_path = os.path.join(directory, "signals.csv")
+
+    def remove_csv():
+        if os.path.exists(csv_path):
+            os.remove(csv_path)
+
+    return [
+        ("calculate_moving_averages", lambda: ltf_frame.copy(), strategy.calculate_moving_averages),
+        ("identify_entry_levels", lambda: ltf.copy(), lambda frame: strategy.identify_entry_levels(htf, frame)),
+        ("backtest_strategy", lambda: entries.copy(), strategy.backtest_strategy),
+        ("save_signals_to_csv", remove_csv, lambda _: strategy.save_signals_to_csv(entries, file_name=csv_path)),
+    ]
+
+
+def measure(setup, run, repeat):
+    timings = []
+    for _ in range(repeat):
+        argument = setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            run(argument)
+            timings.append(time.perf_counter() - start)
+
+    argument = setup()
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            run(argument)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'best': min(timings), 'median': statistics.median(timings), 'peak_bytes': peak}
+
+
+def run_suite(sizes, repeat):
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for bars in sizes:
+            for name, setup, run in make_cases(bars, directory):
+                result = {'case': name, 'bars': bars, **measure(setup, run, repeat)}
+                results.append(result)
+                print(f"{name:28s} {bars:>9} bars  best {result['best']:.4f}s  "
+                      f"median {result['median']:.4f}s  peak {result['peak_bytes'] / 2**20:.1f} MiB")
+    return {
+        'meta': {
+            'created': time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(report, baseline, time_tolerance, memory_tolerance):
+    """Regressions of `report` against `baseline`, matched on (case, bars); cases missing from either side are skipped."""
+    previous = {(r['case'], r['bars']): r for r in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        before = previous.get((result['case'], result['bars']))
+        if before is None:
+            continue
+        for metric, tolerance in (('best', time_tolerance), ('peak_bytes', memory_tolerance)):
+            if before[metric] and result[metric] > before[metric] * (1 + tolerance):
+                regressions.append({'case': result['case'], 'bars': result['bars'], 'metric': metric,
+                                    'baseline': before[metric], 'current': result[metric],
+                                    'ratio': result[metric] / before[metric]})
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline")
+    parser.add_argument("--time-tolerance", type=float, default=0.20)
+    parser.add_argument("--memory-tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+
+    report = run_suite(args.sizes, args.repeat)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            report['regressions'] = compare(report, json.load(f), args.time_tolerance, args.memory_tolerance)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    for regression in report.get('regressions', []):
+        print(f"❌ {regression['case']} ({regression['bars']} bars) {regression['metric']}: "
+              f"{regression['baseline']:.4g} -> {regression['current']:.4g} ({regression['ratio']:.2f}x)")
+    sys.exit(1 if report.get('regressions') else 0)
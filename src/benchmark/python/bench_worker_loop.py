@@ -0,0 +1,92 @@
+"""
+Load-test the live worker loop against the in-process MetaTrader 5 simulator.
+
+Each round every symbol is evaluated on a WorkerPool, as the bot does:
+MetaTrader5Client.get_multi_tf_data fetches HTF/LTF bars through the backend
+proxy, then IndicatorEngine.update refreshes the streaming moving averages.
+Between rounds the simulated clock moves forward one LTF bar, so warm rounds
+exercise the incremental paths (bar cache tail fetch, streaming update).
+Simulated call latency is real sleeping, so it shows how the pool overlaps waits.
+With --session every call goes through one MT5Session dispatcher thread, as in
+the live bot, where the terminal is not thread-safe.
+
+Usage:
+    python src/benchmark/python/bench_worker_loop.py [--symbols 2000] [--rounds 3] [--workers 16] [--latency 0.002]
+    python src/benchmark/python/bench_worker_loop.py --session
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Client import Backend
+from advisor.Client.Advisor import MetaTrader5Client
+from advisor.Client.Session import MT5Session
+from advisor.MovingAverage.StreamingMA import IndicatorEngine
+from advisor.Scheduler.WorkerPool import WorkerPool
+from advisor.Simulator.MT5Simulator import MT5Simulator
+
+
+class SteppedClock:
+    """Virtual bar time that only moves when advanced; waits sleep for real so latency is felt."""
+
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds, stop_event=None):
+        time.sleep(seconds)
+        return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--history", type=int, default=1000, help="bars the client keeps per timeframe")
+    parser.add_argument("--latency", type=float, default=0.002, help="seconds per simulated terminal call")
+    parser.add_argument("--session", action="store_true", help="serialize calls through an MT5Session")
+    args = parser.parse_args()
+
+    clock = SteppedClock(time.time() // 3600 * 3600 + 1800)
+    simulator = MT5Simulator(symbols=args.symbols, history=4 * args.history + 8, latency=args.latency, clock=clock)
+    session = MT5Session(simulator).start() if args.session else None
+    Backend.use(session or simulator)
+    client = MetaTrader5Client(history=args.history)
+    engine = IndicatorEngine()
+    pool = WorkerPool(max_workers=args.workers, task_timeout=600.0)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        client.initialize(None)
+    symbols = client.get_Symbols()
+
+    def evaluate(symbol):
+        data = client.get_multi_tf_data(symbol)
+        return {name: engine.update(symbol, client.TF[name], frame) for name, frame in data.items()}
+
+    timings = []
+    for round_number in range(args.rounds):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = pool.run_round(symbols, evaluate)
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        print(f"round {round_number}: {len(results)}/{len(symbols)} symbols in {elapsed:.2f}s "
+              f"({len(results) / elapsed:,.0f} symbols/s)")
+        clock.now += 3600
+    pool.shutdown()
+    if session is not None:
+        print(f"session: {session.stats()}")
+        session.close()
+
+    warm = timings[1:] or timings
+    print(f"{args.symbols} symbols, {args.workers} workers, latency {args.latency * 1000:.1f} ms: "
+          f"cold {timings[0]:.2f}s, warm median {statistics.median(warm):.2f}s per round")
@@ -0,0 +1,126 @@
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from advisor.Backtest import Charts
+from advisor.Client import Timeframes
+from advisor.Trade import SymbolSpecs
+
+COLUMNS = ('time', 'open', 'high', 'low', 'close')
+
+
+def compact_rates(rates):
+    """Reduce a rates DataFrame/structured array to the float64/int64 columns a backtest needs."""
+    return {
+        'time': Timeframes.epoch_seconds(rates['time']),
+        **{column: np.ascontiguousarray(rates[column], dtype=np.float64) for column in COLUMNS[1:]},
+    }
+
+
+def fetch_history(client, symbols):
+    """
+    Fetch every symbol's HTF/LTF history in one pass before any CPU work starts.
+
+    :return: dict of symbol -> {'HTF': arrays, 'LTF': arrays}; symbols with missing data are skipped.
+    """
+    history = {}
+    for symbol in symbols:
+        data = client.get_rates_range(symbol)
+        if "HTF" not in data or "LTF" not in data:
+            print(f"⚠️ Missing history for {symbol}, skipping it in the batch.")
+            continue
+        history[symbol] = {tf_name: compact_rates(rates) for tf_name, rates in data.items()}
+    return history
+
+
+def backtest_symbol(symbol, htf, ltf, fast_period=50, slow_period=150, chart_dir=None, pip_size=None,
+                    signal_dir=None):
+    """
+    Process-pool task: run the MovingAverageCrossover pipeline and the event backtester
+    for one symbol from compact arrays.
+
+    identify_entry_levels gets (HTF, LTF) as its signature names them; the old
+    sequential backtest passed them swapped, taking the market bias from the LTF.
+    With `signal_dir` the entry levels are appended to <signal_dir>/<symbol>_entry_levels.csv
+    as the old backtest did.
+
+    :return: (summary dict, trade structured array).
+    """
+    from advisor.MovingAverage import MovingAverage as MA
+
+    started = time.perf_counter()
+    strategy = MA.MovingAverageCrossover(symbol, None, fast_period=fast_period, slow_period=slow_period,
+                                         pip_size=pip_size)
+    with contextlib.redirect_stdout(io.StringIO()):
+        htf_data = strategy.calculate_moving_averages(_frame(htf), timeframe="HTF")
+        ltf_data = strategy.calculate_moving_averages(_frame(ltf), timeframe="LTF")
+        entries = strategy.identify_entry_levels(htf_data, ltf_data.reset_index(drop=True), timeframe="LTF")
+        result = strategy.backtest_trades(entries)
+        if signal_dir is not None:
+            strategy.save_signals_to_csv(entries, file_name=os.path.join(signal_dir, f"{symbol}_entry_levels.csv"))
+
+    summary = {'symbol': symbol, 'bars': len(ltf['close']), **result.summary()}
+    if chart_dir is not None:
+        summary['chart'] = render_chart(symbol, entries, result, chart_dir)
+    summary['seconds'] = time.perf_counter() - started
+    return summary, result.trades
+
+
+def render_chart(symbol, entries, result, chart_dir, fmt="png"):
+    """Render the close, MAs, entries and equity off-screen to `chart_dir`/<symbol>.<fmt>."""
+    return Charts.render_entries(symbol, entries, os.path.join(chart_dir, f"{symbol}.{fmt}"), equity=result.equity)
+
+
+def run_batch_backtest(client, symbols, processes=None, chart_dir=None, fast_period=50, slow_period=150,
+                       signal_dir=None):
+    """
+    Headless backtest of many symbols.
+
+    1. Fetch all history from the terminal in one pass.
+    2. Fan the CPU work out over a process pool, one symbol per task, passing compact arrays
+       and the symbol's pip size from the spec cache.
+    3. Aggregate the per-symbol results into one report.
+
+    Entry levels are written to `signal_dir` when given, see backtest_symbol.
+
+    :return: (report DataFrame sorted by net_pnl, dict of symbol -> trade array).
+    """
+    started = time.perf_counter()
+    history = fetch_history(client, symbols)
+    print(f"📥 History fetched for {len(history)} symbols in {time.perf_counter() - started:.1f}s.")
+
+    rows, trades = [], {}
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = {
+            pool.submit(backtest_symbol, symbol, data['HTF'], data['LTF'], fast_period, slow_period, chart_dir,
+                        SymbolSpecs.SPECS.pip(symbol), signal_dir): symbol
+            for symbol, data in history.items()
+        }
+        for future, symbol in futures.items():
+            try:
+                summary, symbol_trades = future.result()
+            except Exception as e:
+                print(f"❌ Backtest failed for {symbol}: {e}")
+                continue
+            rows.append(summary)
+            trades[symbol] = symbol_trades
+
+    report = pd.DataFrame(rows)
+    if len(report):
+        report = report.sort_values('net_pnl', ascending=False, kind='stable').reset_index(drop=True)
+        print(f"✅ Backtested {len(report)} symbols, {int(report['trades'].sum())} trades, "
+              f"net pnl {report['net_pnl'].sum():.5f} in {time.perf_counter() - started:.1f}s.")
+    return report, trades
+
+
+def _frame(arrays):
+    frame = pd.DataFrame({column: arrays[column] for column in COLUMNS})
+    frame['time'] = pd.to_datetime(frame['time'], unit='s')
+    # identify_entry_levels drops the volume/spread columns of a full MT5 frame
+    frame['tick_volume'] = frame['real_volume'] = frame['spread'] = 0
+    return frame
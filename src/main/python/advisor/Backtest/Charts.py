@@ -0,0 +1,169 @@
+"""
+Off-screen entry charts that stay fast on long histories.
+
+- Close and moving averages are downsampled to about one point per horizontal
+  pixel with Largest-Triangle-Three-Buckets, which keeps spikes and turns
+  that plain striding drops.
+- Buy and Sell markers are one scatter collection each. All TP segments are
+  one LineCollection and all SL segments are another, whatever the number of
+  signals.
+- Figures are built on matplotlib.figure.Figure without pyplot, so rendering
+  needs no GUI backend and never blocks. The file extension (.png/.svg)
+  picks the format.
+
+matplotlib is imported on first use.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+DPI = 100
+COLUMNS = ('time', 'close', 'Fast_MA', 'Slow_MA', 'Entry', 'Level', 'SL', 'TP')
+SIDES = (('Buy', '^', 'green'), ('Sell', 'v', 'red'))
+
+
+def lttb(x, y, threshold):
+    """
+    Indices of the `threshold` points Largest-Triangle-Three-Buckets keeps from (x, y).
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously kept
+    point and the next bucket's mean. Series with at most `threshold` points are
+    returned whole.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    # Next-bucket means for every bucket at once; the last bucket looks at the final point
+    sums_x, sums_y = np.add.reduceat(x[1:n - 1], edges[:-1] - 1), np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    mean_x = np.append(sums_x[1:] / counts[1:], x[-1])
+    mean_y = np.append(sums_y[1:] / counts[1:], y[-1])
+
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        px, py = x[previous], y[previous]
+        area = np.abs((px - mean_x[bucket]) * (y[start:stop] - py) - (px - x[start:stop]) * (mean_y[bucket] - py))
+        previous = start + int(np.argmax(area))
+        kept[bucket + 1] = previous
+    return kept
+
+
+def _column(entries, name, dtype=float):
+    values = entries[name]
+    return values.to_numpy(dtype=dtype) if hasattr(values, 'to_numpy') else np.asarray(values, dtype=dtype)
+
+
+def draw_entries(fig, symbol, entries, equity=None, fast_period=None, slow_period=None, max_points=None):
+    """
+    Draw close, MAs, MA zones, entries and their SL/TP levels into `fig`; adds an equity panel when given.
+
+    :param entries: identify_entry_levels output (DataFrame or dict of arrays) with time, close,
+                    Fast_MA, Slow_MA, Entry, Level, SL and TP.
+    :param max_points: points kept per line, defaults to the figure's width in pixels.
+    :return: the price axes.
+    """
+    import matplotlib.dates as mdates
+    from matplotlib.collections import LineCollection
+
+    times = mdates.date2num(np.asarray(entries['time'], dtype='datetime64[ns]'))
+    close, fast, slow = (_column(entries, name) for name in ('close', 'Fast_MA', 'Slow_MA'))
+    if not len(close):
+        raise ValueError("No Close data available")
+    max_points = max_points or int(fig.get_figwidth() * fig.dpi)
+
+    if equity is not None:
+        price_ax, equity_ax = fig.subplots(2, 1, sharex=True, height_ratios=(3, 1))
+    else:
+        price_ax, equity_ax = fig.subplots(), None
+
+    kept = lttb(times, close, max_points)
+    t, close_kept, fast_kept, slow_kept = times[kept], close[kept], fast[kept], slow[kept]
+    price_ax.plot(t, close_kept, color='black', linewidth=0.6, label='Close')
+    price_ax.plot(t, fast_kept, color='blue', linewidth=0.6, label=f"Fast MA ({fast_period})" if fast_period else 'Fast MA')
+    price_ax.plot(t, slow_kept, color='red', linewidth=0.6, label=f"Slow MA ({slow_period})" if slow_period else 'Slow MA')
+    price_ax.fill_between(t, fast_kept, slow_kept, where=fast_kept > slow_kept, color='green', alpha=0.2,
+                          label='Bullish Zone')
+    price_ax.fill_between(t, fast_kept, slow_kept, where=fast_kept < slow_kept, color='red', alpha=0.2,
+                          label='Bearish Zone')
+    price_ax.fill_between(t, fast_kept, close_kept, where=np.abs(fast_kept - close_kept) <= 0.005, color='orange',
+                          alpha=0.3, label='Range')
+
+    side = np.asarray(entries['Entry'], dtype=object)
+    level, sl, tp = (_column(entries, name) for name in ('Level', 'SL', 'TP'))
+    signals = np.zeros(len(side), dtype=bool)
+    for name, marker, color in SIDES:
+        is_side = side == name
+        price_ax.scatter(times[is_side], level[is_side], marker=marker, color=color, s=14, label=f"{name} Signal",
+                         zorder=3)
+        signals |= is_side
+
+    # Short level segments centred on each entry, wide enough to see at any zoom
+    signals &= np.isfinite(sl) & np.isfinite(tp)
+    half_width = max((times[-1] - times[0]) / 400, np.median(np.diff(times)) if len(times) > 1 else 0.0)
+    starts, ends = times[signals] - half_width, times[signals] + half_width
+    for values, color, label in ((tp[signals], 'green', 'TP'), (sl[signals], 'red', 'SL')):
+        segments = np.stack([np.column_stack([starts, values]), np.column_stack([ends, values])], axis=1)
+        price_ax.add_collection(LineCollection(segments, colors=color, linestyles='--', linewidths=0.8, label=label))
+
+    price_ax.set_title(f"{symbol}-Moving Average Entry Signals")
+    price_ax.set_ylabel("Price")
+    price_ax.grid(True, linewidth=0.3)
+    price_ax.legend(loc='upper left', fontsize='small')
+    if equity_ax is not None:
+        equity = np.asarray(equity, dtype=float)
+        kept = lttb(times, equity, max_points)
+        equity_ax.plot(times[kept], equity[kept], color='green', linewidth=0.8, label='Equity')
+        equity_ax.legend(loc='upper left', fontsize='small')
+    bottom_ax = equity_ax or price_ax
+    bottom_ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+    bottom_ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+    bottom_ax.set_xlabel("Time")
+    fig.autofmt_xdate()
+    return price_ax
+
+
+def render_entries(symbol, entries, path, equity=None, fast_period=None, slow_period=None,
+                   size=(18, 8), dpi=DPI):
+    """Render an entry chart off-screen to `path`; the extension (.png, .svg, ...) picks the format."""
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=size, dpi=dpi, layout='tight')
+    draw_entries(fig, symbol, entries, equity=equity, fast_period=fast_period, slow_period=slow_period)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fig.savefig(path)
+    return path
+
+
+def _render_task(args):
+    symbol, entries, path, equity, fast_period, slow_period = args
+    return symbol, render_entries(symbol, entries, path, equity=equity, fast_period=fast_period,
+                                  slow_period=slow_period)
+
+
+def render_all(charts, chart_dir, fmt="png", processes=None, fast_period=None, slow_period=None):
+    """
+    Render many entry charts in parallel worker processes.
+
+    :param charts: dict of symbol -> entries, or symbol -> (entries, equity).
+    :return: dict of symbol -> written path.
+    """
+    tasks = []
+    for symbol, chart in charts.items():
+        entries, equity = chart if isinstance(chart, tuple) else (chart, None)
+        entries = {column: np.asarray(entries[column]) for column in COLUMNS}  # only what is drawn is pickled
+        tasks.append((symbol, entries, os.path.join(chart_dir, f"{symbol}.{fmt}"), equity, fast_period, slow_period))
+    if processes == 1 or len(tasks) < 2:
+        return dict(map(_render_task, tasks))
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return dict(pool.map(_render_task, tasks))
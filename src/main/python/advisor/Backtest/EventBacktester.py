@@ -0,0 +1,150 @@
+import numpy as np
+
+EXIT_END = 0
+EXIT_TP = 1
+EXIT_SL = -1
+
+TRADE_DTYPE = np.dtype([
+    ('entry_index', np.int64),
+    ('exit_index', np.int64),
+    ('direction', np.int8),
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('sl', np.float64),
+    ('tp', np.float64),
+    ('pnl', np.float64),
+    ('exit_reason', np.int8),
+])
+
+
+class BacktestResult:
+    """Trade list (structured array, TRADE_DTYPE) plus a per-bar equity curve."""
+
+    __slots__ = ('trades', 'equity', 'initial_equity')
+
+    def __init__(self, trades, equity, initial_equity):
+        self.trades = trades
+        self.equity = equity
+        self.initial_equity = initial_equity
+
+    def summary(self):
+        pnl = self.trades['pnl']
+        wins = pnl[pnl > 0]
+        losses = pnl[pnl < 0]
+        peak = np.maximum.accumulate(self.equity) if len(self.equity) else self.equity
+        return {
+            'trades': int(len(pnl)),
+            'wins': int(len(wins)),
+            'win_rate': float(len(wins) / len(pnl)) if len(pnl) else 0.0,
+            'net_pnl': float(pnl.sum()),
+            'profit_factor': float(wins.sum() / -losses.sum()) if len(losses) else float('inf') if len(wins) else 0.0,
+            'max_drawdown': float((peak - self.equity).max()) if len(self.equity) else 0.0,
+            'final_equity': float(self.equity[-1]) if len(self.equity) else self.initial_equity,
+        }
+
+    def trades_frame(self, times=None):
+        import pandas as pd
+
+        frame = pd.DataFrame(self.trades)
+        if times is not None and len(frame):
+            times = np.asarray(times)
+            frame.insert(0, 'entry_time', times[frame['entry_index']])
+            frame.insert(1, 'exit_time', times[frame['exit_index']])
+        return frame
+
+
+def run_backtest(open_, high, low, close, direction, level, sl, tp,
+                 units=1.0, initial_equity=0.0, sl_first=True, search_window=64):
+    """
+    Event-driven backtest of Entry/Level/SL/TP signals on OHLC arrays.
+
+    A position opens at `level` on the close of a bar whose `direction` is +1 (buy)
+    or -1 (sell), provided no position is open. Exits are resolved against the
+    high/low of the following bars. A bar that gaps through a level fills at its
+    open. When one bar touches both SL and TP, the open decides if it is beyond
+    either level, otherwise `sl_first` chooses the conservative outcome. A new
+    position may open on the close of the bar that stopped the previous one out.
+
+    The loop only visits signal bars and exit bars. The search for an exit scans
+    windows of bars with numpy, so no per-bar Python work is done.
+
+    :return: BacktestResult with pnl in price units × `units`.
+    """
+    open_, high, low, close = (np.asarray(a, dtype=np.float64) for a in (open_, high, low, close))
+    level, sl, tp = (np.asarray(a, dtype=np.float64) for a in (level, sl, tp))
+    direction = np.asarray(direction, dtype=np.int8)
+    bars = len(close)
+
+    signals = np.flatnonzero((direction != 0) & ~np.isnan(level) & ~np.isnan(sl) & ~np.isnan(tp))
+    records = []
+    next_bar = 0
+    while True:
+        k = np.searchsorted(signals, next_bar)
+        if k >= len(signals):
+            break
+        entry = int(signals[k])
+        side = int(direction[entry])
+        stop, target = sl[entry], tp[entry]
+
+        exit_index, exit_price, reason = _find_exit(
+            entry, side, stop, target, open_, high, low, close, sl_first, search_window)
+        records.append((entry, exit_index, side, level[entry], exit_price, stop, target,
+                        side * (exit_price - level[entry]) * units, reason))
+        if reason == EXIT_END:
+            break
+        next_bar = exit_index
+
+    trades = np.array(records, dtype=TRADE_DTYPE)
+    return BacktestResult(trades, _equity_curve(trades, close, bars, units, initial_equity), initial_equity)
+
+
+def _find_exit(entry, side, stop, target, open_, high, low, close, sl_first, search_window):
+    bars = len(close)
+    start = entry + 1
+    window = search_window
+    while start < bars:
+        end = min(bars, start + window)
+        if side > 0:
+            hit_sl = low[start:end] <= stop
+            hit_tp = high[start:end] >= target
+        else:
+            hit_sl = high[start:end] >= stop
+            hit_tp = low[start:end] <= target
+        hits = np.flatnonzero(hit_sl | hit_tp)
+        if len(hits):
+            j = start + int(hits[0])
+            return (j,) + _resolve_bar(side, stop, target, open_[j], hit_sl[hits[0]], hit_tp[hits[0]], sl_first)
+        start = end
+        window *= 2
+    return bars - 1, close[-1], EXIT_END
+
+
+def _resolve_bar(side, stop, target, bar_open, hit_sl, hit_tp, sl_first):
+    # Gaps: the bar opened beyond a level, so that level was hit first at the open price
+    if side * (bar_open - stop) <= 0:
+        return bar_open, EXIT_SL
+    if side * (bar_open - target) >= 0:
+        return bar_open, EXIT_TP
+    if hit_sl and hit_tp:
+        return (stop, EXIT_SL) if sl_first else (target, EXIT_TP)
+    return (stop, EXIT_SL) if hit_sl else (target, EXIT_TP)
+
+
+def _equity_curve(trades, close, bars, units, initial_equity):
+    realized = np.zeros(bars)
+    if len(trades) == 0:
+        return realized + initial_equity
+    np.add.at(realized, trades['exit_index'], trades['pnl'])
+
+    # Bars [entry, exit) carry the open trade's mark-to-market; intervals never overlap
+    owner = np.zeros(bars + 1, dtype=np.int64)
+    ids = np.arange(1, len(trades) + 1)
+    np.add.at(owner, trades['entry_index'], ids)
+    np.add.at(owner, trades['exit_index'], -ids)
+    owner = np.cumsum(owner[:-1])
+    inside = owner > 0
+    trade = owner[inside] - 1
+
+    unrealized = np.zeros(bars)
+    unrealized[inside] = trades['direction'][trade] * (close[inside] - trades['entry_price'][trade]) * units
+    return initial_equity + np.cumsum(realized) + unrealized
@@ -0,0 +1,105 @@
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+
+from advisor.Backtest import EventBacktester
+from advisor.Client import Timeframes
+from advisor.MovingAverage import Kernels
+from advisor.MovingAverage import MovingAverage as MA
+
+
+class SharedMovingAverages:
+    """
+    Every shifted moving average of one close series, memoised per period.
+
+    mean(period)[t] is the `ma_type` average (see Kernels) of the `period` closes
+    before bar t, NaN for the first `period` bars; for 'sma' it equals
+    close.rolling(period).mean().shift()[t]. Each period is computed once per sweep.
+    """
+
+    def __init__(self, close, ma_type='sma'):
+        self.close = np.asarray(close, dtype=np.float64)
+        self.ma_type = ma_type
+        self._cache = {}
+
+    def mean(self, period):
+        ma = self._cache.get(period)
+        if ma is None:
+            ma = Kernels.shifted(Kernels.moving_average(self.ma_type, self.close, period))
+            self._cache[period] = ma
+        return ma
+
+    def bullish(self, fast_period, slow_period):
+        return self.mean(fast_period) > self.mean(slow_period)
+
+
+def _period_pairs(fast_periods, slow_periods):
+    return [(fast, slow) for fast, slow in itertools.product(fast_periods, slow_periods) if fast < slow]
+
+
+def sweep(htf_data, ltf_data, fast_periods, slow_periods, htf_fast_periods=None, htf_slow_periods=None,
+          symbol=None, sl_distance=MA.SL_DISTANCE, tp_distance=MA.TP_DISTANCE, threshold=None, pip_size=None,
+          rank_by='net_pnl', ma_type='sma', **backtest_kwargs):
+    """
+    Evaluate every (fast, slow) moving-average pair on the same history and rank the results.
+
+    By default the HTF uses the same pair as the LTF, as the live bot does. Pass
+    htf_fast_periods/htf_slow_periods to sweep the HTF pair independently, which
+    evaluates the cross product of LTF pairs and HTF pairs.
+
+    Each combination applies the identify_entry_levels rule as whole-array operations
+    on the shared means and runs the event-driven backtester on the result.
+
+    :param htf_data, ltf_data: raw rates (DataFrame or structured array) with time/open/high/low/close.
+    :param ma_type: moving average for every period: 'sma', 'ema', 'wma' or 'hma'.
+    :return: DataFrame of metrics per combination, best `rank_by` first.
+    """
+    started = time.perf_counter()
+    threshold = MA.entry_threshold(symbol, pip_size) if threshold is None else threshold
+
+    ltf_time = Timeframes.epoch_seconds(ltf_data['time'])
+    htf_time = Timeframes.epoch_seconds(htf_data['time'])
+    open_, high, low, close = (np.asarray(ltf_data[c], dtype=np.float64) for c in ('open', 'high', 'low', 'close'))
+
+    ltf_means = SharedMovingAverages(close, ma_type)
+    htf_means = SharedMovingAverages(htf_data['close'], ma_type)
+    # Index of the latest HTF bar at or before each LTF bar, computed once for the sweep
+    htf_index = np.searchsorted(htf_time, ltf_time, side='right') - 1
+
+    ltf_pairs = _period_pairs(fast_periods, slow_periods)
+    if htf_fast_periods is None and htf_slow_periods is None:
+        combinations = [(pair, pair) for pair in ltf_pairs]
+    else:
+        htf_pairs = _period_pairs(htf_fast_periods or fast_periods, htf_slow_periods or slow_periods)
+        combinations = list(itertools.product(ltf_pairs, htf_pairs))
+
+    market_cache = {}
+    rows = []
+    for (fast, slow), (htf_fast, htf_slow) in combinations:
+        market = market_cache.get((htf_fast, htf_slow))
+        if market is None:
+            bullish = htf_means.bullish(htf_fast, htf_slow)
+            matched = htf_index >= htf_slow  # the pandas path drops HTF rows without a slow MA
+            market = (bullish[np.clip(htf_index, 0, None)] & matched, matched)
+            market_cache[(htf_fast, htf_slow)] = market
+        market_bullish, matched = market
+
+        fast_ma = ltf_means.mean(fast)
+        valid = matched & (np.arange(len(close)) >= slow)
+        buy, sell, _ = MA.entry_signals(close, fast_ma, ltf_means.bullish(fast, slow), market_bullish, valid, threshold)
+        direction = buy.astype(np.int8) - sell.astype(np.int8)
+
+        result = EventBacktester.run_backtest(
+            open_, high, low, close, direction, close,
+            close - direction * sl_distance, close + direction * tp_distance, **backtest_kwargs)
+        rows.append({'ltf_fast': fast, 'ltf_slow': slow, 'htf_fast': htf_fast, 'htf_slow': htf_slow,
+                     **result.summary()})
+
+    table = pd.DataFrame(rows)
+    if len(table):
+        table = table.sort_values(rank_by, ascending=False, kind='stable').reset_index(drop=True)
+    print(f"Parameter sweep evaluated {len(rows)} combinations in {time.perf_counter() - started:.2f}s.")
+    return table
+
@@ -1,41 +1,81 @@
-import matplotlib.pyplot as plt
-from tkinter import messagebox
 import pandas as pd
-from pandas.plotting import register_matplotlib_converters
 import numpy as np
-import MetaTrader5 as mt5
 import time
 from dateutil.relativedelta import relativedelta
 import datetime
 import os
 
+from advisor.Client.Backend import mt5
+from advisor.Client.BarCache import BarCache
+from advisor.Client import Resampler
+from advisor.Client import Timeframes
+from advisor.Client.Rates import BarSeries
+from advisor.Metrics.Registry import count_bars, timed
 
-register_matplotlib_converters()
+
+def _pyplot():
+    """matplotlib.pyplot with pandas' datetime converters registered, imported on the first plot."""
+    import matplotlib.pyplot as plt
+    from pandas.plotting import register_matplotlib_converters
+
+    register_matplotlib_converters()
+    return plt
 
 
 class MetaTrader5Client:
     def __init__(self, 
                 threshold = 0.0100, 
-                timeframes= {
-                "HTF": mt5.TIMEFRAME_H4,
-                "LTF" :mt5.TIMEFRAME_H1}
+                timeframes=None,
+                history=1000,
+                bar_store=None,
+                dialogs=True,
+                derive_timeframes=False,
+                session_offset=0,
+                validate_derived=False
             ):
+        """
+        :param derive_timeframes: request only the lowest timeframe in `timeframes` from the
+                                  terminal and build the others from it (see Client.Resampler).
+        :param session_offset: seconds the broker's session shifts derived bar boundaries, e.g.
+                               -7200 when its daily bar opens at 22:00 server time.
+        :param validate_derived: also fetch the broker's own bars of each derived timeframe and
+                                 report differences; doubles the requests, for checking a broker.
+        """
         self.symbols = []
         self.THRESHOLD = threshold
         self.account_info = None
         self.terminal_info = None
-        self.TF = timeframes
+        # Defaults use the constant values so no backend is needed to build a client
+        self.TF = timeframes or {
+                "HTF": Timeframes.TIMEFRAME_H4,
+                "LTF": Timeframes.TIMEFRAME_H1}
+        self.history = history
+        self.derive_timeframes = derive_timeframes
+        self.session_offset = session_offset
+        self.validate_derived = validate_derived
+        self._resamplers = {}
+        self.derived_reports = {}  # (symbol, timeframe) -> last Resampler.compare() result
+        # Derived timeframes need `history` of their own bars out of the base bars
+        self.bar_cache = BarCache(history * self._base_bars_per_bar())
+        self.bar_store = bar_store  # optional database.BarStore for local history
+        self.dialogs = dialogs  # False in the headless service: report login results on stdout only
         
+    def _dialog(self, kind, title, message):
+        """Show a tkinter messagebox (tkinter loads on the first one) unless dialogs are off."""
+        if self.dialogs:
+            from tkinter import messagebox
+            getattr(messagebox, kind)(title, message)
+
     def logIn(self, user_data):
         print("🔑 Logging in to MetaTrader 5...")
         res = self.initialize(user_data)
         
         if not res[0]:
-            messagebox.showerror("Connection failed", f"Failed to log in with error code ={ mt5.last_error()}")
+            self._dialog("showerror", "Connection failed", f"Failed to log in with error code ={ mt5.last_error()}")
             print(f"failed to log in with error code ={ mt5.last_error()}")
             mt5.shutdown()
             return False
-        messagebox.showinfo("Login successful", "Connecting to MetaTrader 5....")
+        self._dialog("showinfo", "Login successful", "Connecting to MetaTrader 5....")
         print(f"✅ Successfully connected to MT5 account {user_data['account_id']} on server '{user_data['server']}'")
         return res
 
@@ -45,7 +85,7 @@ class MetaTrader5Client:
                 print("Initializing MetaTrader 5 with user data...")
                 if not mt5.initialize(login=int(user_data['account_id']), password=user_data['password'], server=user_data['server']):
                     print("initialize() failed, error code =", mt5.last_error())
-                    messagebox.showerror("Login Error", "Failed to connect to MetaTrader 5.")
+                    self._dialog("showerror", "Login Error", "Failed to connect to MetaTrader 5.")
                     mt5.shutdown()
                     return False
                 
@@ -106,53 +146,154 @@ class MetaTrader5Client:
         - A message if data retrieval fails.
         - The retrieved market data.
         """
-        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, bars)
+        rates = self._copy_rates(symbol, timeframe, bars)
         if rates is None:
-            print(f"Failed to get data for {symbol}")
             return None
 
         return pd.DataFrame(rates)
 
+    def _copy_rates(self, symbol, timeframe, count):
+        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, count)
+        if rates is None:
+            print(f"Failed to get data for {symbol}")
+        return rates
+
     def get_rates_range(self, symbol):
+        """Six months of bars per timeframe as BarSeries; to_frame() gives a DataFrame with datetime times."""
         multi_tf_data = {}
 
         end_date = datetime.datetime.now()
         start_date = end_date - relativedelta(months=6)
+        base = self._base_timeframe()
 
         for tf_name, tf_value in self.TF.items():
-            rates = mt5.copy_rates_range(symbol, tf_value, start_date, end_date)
+            if base is not None and tf_value != base:
+                continue  # built from the base bars below
+            timeframe = Timeframes.timeframe_name(tf_value)
+            with timed("get_rates_range", symbol, timeframe):
+                rates = self._rates_range(symbol, tf_value, start_date, end_date)
+            count_bars("get_rates_range", symbol, timeframe, rates)
             if rates is not None and len(rates) > 0:
-                df = pd.DataFrame(rates)
-                df['time'] = pd.to_datetime(df['time'], unit='s')  # convert timestamps to datetime
-                multi_tf_data[tf_name] = df
+                multi_tf_data[tf_name] = BarSeries(rates, symbol, tf_value)
             else:
                 print(f"Failed to retrieve {symbol} rates for {tf_name}, error: {mt5.last_error()}")
 
+        if base is not None:
+            base_rates = next((series.rates for series in multi_tf_data.values() if series.timeframe == base), None)
+            for tf_name, tf_value in self.TF.items():
+                if tf_value == base or base_rates is None:
+                    continue
+                with timed("resample", symbol, Timeframes.timeframe_name(tf_value)):
+                    rates = Resampler.resample(base_rates, tf_value, self.session_offset, drop_partial=True)
+                if self.validate_derived:
+                    self.validate_timeframe(symbol, tf_value, rates,
+                                            mt5.copy_rates_range(symbol, tf_value, start_date, end_date))
+                multi_tf_data[tf_name] = BarSeries(rates, symbol, tf_value)
+
         return multi_tf_data
 
+    def _rates_range(self, symbol, timeframe, start_date, end_date):
+        """
+        Rates between two dates. With a local bar store only the bars after the last
+        stored one are requested from the terminal; the rest is read from disk.
+        """
+        if self.bar_store is None:
+            return mt5.copy_rates_range(symbol, timeframe, start_date, end_date)
+
+        last_time = self.bar_store.last_time(symbol, timeframe)
+        fetch_from = start_date
+        if last_time is not None and last_time >= start_date.replace(tzinfo=datetime.timezone.utc).timestamp():
+            fetch_from = datetime.datetime.fromtimestamp(last_time, datetime.timezone.utc).replace(tzinfo=None)
+
+        rates = mt5.copy_rates_range(symbol, timeframe, fetch_from, end_date)
+        if rates is not None and len(rates) > 0:
+            self.bar_store.upsert(symbol, timeframe, rates)
+        elif last_time is None:
+            return rates
+        return self.bar_store.read_range(symbol, timeframe, start_date, end_date)
+
     def get_multi_tf_data(self, symbol):
-        """Fetch data for multiple timeframes and return as a dictionary with HTF and LTF keys."""
+        """
+        Fetch data for multiple timeframes and return as a dictionary with HTF and LTF keys.
+        Values are BarSeries views; call to_frame() where a DataFrame is needed.
+        """
 
         multi_tf_data = {}
+        base = self._base_timeframe()
+        base_rates = None
 
         print(f'🔍 Fetching data for {symbol}...')
         
         # Loop over the provided timeframes
         for tf_name, tf_value in self.TF.items():
-           
-            # Fetch live data for each timeframe
-            data = self.get_live_data(symbol, tf_value, 1000)
-
-            if data is not None:
-                # Store the fetched data in the dictionary under its corresponding timeframe name
-                multi_tf_data[tf_name] = pd.DataFrame(data)
+            if base is not None and tf_value != base:
+                continue  # built from the base bars below
+
+            # Only bars since the last closed one are requested once the cache is warm
+            timeframe = Timeframes.timeframe_name(tf_value)
+            with timed("get_multi_tf_data", symbol, timeframe):
+                rates = self.bar_cache.get(symbol, tf_value, self._copy_rates)
+            count_bars("get_multi_tf_data", symbol, timeframe, rates)
+
+            if rates is not None:
+                # A view over the cached bars; nothing is copied per cycle
+                base_rates = rates
+                multi_tf_data[tf_name] = BarSeries(rates[-self.history:], symbol, tf_value)
             else:
                 print(f"Failed to fetch data for {symbol} on {tf_name}.")
 
+        if base is not None and base_rates is not None:
+            for tf_name, tf_value in self.TF.items():
+                if tf_value == base:
+                    continue
+                with timed("resample", symbol, Timeframes.timeframe_name(tf_value)):
+                    rates = self._resampler(symbol, tf_value, base).update(base_rates)
+                if self.validate_derived:
+                    self.validate_timeframe(symbol, tf_value, rates, self._copy_rates(symbol, tf_value, len(rates)))
+                multi_tf_data[tf_name] = BarSeries(rates, symbol, tf_value)
+
         # Store the data and return
         self.data = multi_tf_data
         return multi_tf_data
 
+    def _base_timeframe(self):
+        """The lowest configured timeframe when higher ones are derived from it, else None."""
+        if not self.derive_timeframes:
+            return None
+        return min(self.TF.values(), key=Timeframes.timeframe_seconds)
+
+    def _base_bars_per_bar(self):
+        base = self._base_timeframe()
+        if base is None:
+            return 1
+        return max(Timeframes.timeframe_seconds(tf) // Timeframes.timeframe_seconds(base) for tf in self.TF.values())
+
+    def _resampler(self, symbol, timeframe, base):
+        key = (symbol, timeframe)
+        resampler = self._resamplers.get(key)
+        if resampler is None:
+            resampler = self._resamplers.setdefault(
+                key, Resampler.Resampler(timeframe, base, self.session_offset, self.history))
+        return resampler
+
+    def validate_timeframe(self, symbol, timeframe, derived, broker):
+        """
+        Compare derived bars with the broker's `broker` bars of the same timeframe and keep
+        the result in derived_reports. Differences are printed.
+        """
+        name = Timeframes.timeframe_name(timeframe)
+        if broker is None or len(broker) == 0:
+            print(f"Failed to fetch {symbol} {name} bars to validate, error: {mt5.last_error()}")
+            return None
+        report = Resampler.compare(derived, broker)
+        self.derived_reports[(symbol, timeframe)] = report
+        if not report['ok']:
+            print(f"⚠️ Derived {symbol} {name} bars differ from the broker's: "
+                  f"{len(report['mismatched'])} mismatched, {len(report['missing'])} missing, "
+                  f"{len(report['extra'])} extra of {report['compared']} compared. "
+                  f"Check session_offset.")
+        return report
+
     def toCSVFile(self, file_path):
         """
         Save ratesData to a CSV file.
@@ -183,6 +324,7 @@ class DataPlotter:
         if ticks is None or len(ticks) == 0:
             print("No data to plot.")
             return
+        plt = _pyplot()
         ticks_frame = pd.DataFrame(ticks)
         ticks_frame['time'] = pd.to_datetime(ticks_frame['time'], unit='s')
         plt.plot(ticks_frame['time'], ticks_frame['ask'], 'r-', label='ask')
@@ -196,6 +338,7 @@ class DataPlotter:
         if rates is None or len(rates) == 0:
             print("No data to plot.")
             return
+        plt = _pyplot()
         rates_frame = pd.DataFrame(rates)
         rates_frame['time'] = pd.to_datetime(rates_frame['time'], unit='s')
         plt.plot(rates_frame['time'], rates_frame['close'], label='close')
@@ -214,6 +357,7 @@ class DataPlotter:
         if 'close' not in rates.columns or rates['close'].empty:
                 raise ValueError("No Close data available")
 
+        plt = _pyplot()
         plt.figure(figsize=(12, 6))
 
         # Plot the close price
@@ -0,0 +1,79 @@
+"""
+The MetaTrader 5 implementation the advisor talks to.
+
+Modules import the proxy instead of the package:
+
+    from advisor.Client.Backend import mt5
+
+Calls go to the selected backend. The backend is chosen on first use from the
+MT5_BACKEND environment variable:
+- "terminal" (default): the MetaTrader5 package, which needs a Windows terminal.
+- "simulator": an in-process advisor.Simulator.MT5Simulator, configured by
+  MT5_SIM_SYMBOLS (count or comma-separated names), MT5_SIM_LATENCY,
+  MT5_SIM_FILL_LATENCY and MT5_SIM_SEED.
+
+Call use() to install a backend object explicitly, e.g. a configured simulator
+in tests or replays.
+"""
+import os
+import threading
+
+BACKEND_ENV = "MT5_BACKEND"
+
+
+class BackendProxy:
+    """Forwards attribute access to the selected backend module or object."""
+
+    def __init__(self):
+        self._backend = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        backend = self._backend
+        if backend is None:
+            backend = self._select()
+        return getattr(backend, name)
+
+    def _select(self):
+        with self._lock:
+            if self._backend is None:
+                self._backend = create_backend(os.getenv(BACKEND_ENV, "terminal"))
+            return self._backend
+
+
+mt5 = BackendProxy()
+
+
+def use(backend):
+    """Install `backend` (the MetaTrader5 module or a compatible object); returns the previous one."""
+    with mt5._lock:
+        previous, mt5._backend = mt5._backend, backend
+    return previous
+
+
+def current():
+    return mt5._backend if mt5._backend is not None else mt5._select()
+
+
+def create_backend(name):
+    name = (name or "terminal").strip().lower()
+    if name == "terminal":
+        import MetaTrader5
+
+        return MetaTrader5
+    if name == "simulator":
+        from advisor.Simulator.MT5Simulator import MT5Simulator
+
+        symbols = os.getenv("MT5_SIM_SYMBOLS")
+        options = {}
+        if symbols:
+            options['symbols'] = int(symbols) if symbols.isdigit() else [s.strip() for s in symbols.split(",") if s.strip()]
+        if os.getenv("MT5_SIM_LATENCY"):
+            options['latency'] = float(os.getenv("MT5_SIM_LATENCY"))
+        if os.getenv("MT5_SIM_FILL_LATENCY"):
+            options['fill_latency'] = float(os.getenv("MT5_SIM_FILL_LATENCY"))
+        if os.getenv("MT5_SIM_SEED"):
+            options['seed'] = int(os.getenv("MT5_SIM_SEED"))
+        print(f"🧪 Using the simulated MetaTrader 5 backend ({BACKEND_ENV}=simulator).")
+        return MT5Simulator(**options)
+    raise ValueError(f"Unknown {BACKEND_ENV} '{name}', expected 'terminal' or 'simulator'.")
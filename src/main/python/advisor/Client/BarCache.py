@@ -0,0 +1,118 @@
+import threading
+
+import numpy as np
+
+
+class _CachedSeries:
+    __slots__ = ('buffer', 'start', 'end', 'lock')
+
+    def __init__(self, rates, capacity):
+        self.buffer = np.empty(capacity, dtype=rates.dtype)
+        self.start = 0
+        self.end = 0
+        self.lock = threading.Lock()
+
+    @property
+    def bars(self):
+        return self.buffer[self.start:self.end]
+
+
+class BarCache:
+    """
+    Per (symbol, timeframe) cache of MT5 rates.
+
+    The first request for a key downloads `history` bars. Later requests only ask
+    the terminal for the bars since the last closed bar plus the still-forming one,
+    widening the request until it overlaps the cached history. New bars are written
+    into a preallocated buffer and the oldest bars are dropped past `history`.
+    """
+
+    def __init__(self, history=1000, initial_delta=3):
+        if history < 2:
+            raise ValueError("history must hold at least two bars.")
+        self.history = history
+        self.initial_delta = max(2, initial_delta)
+        self._series = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bars_transferred = 0
+        self.bytes_transferred = 0
+
+    def get(self, symbol, timeframe, fetch):
+        """
+        Return up to `history` bars for the key, newest (forming) bar last.
+
+        :param fetch: callable(symbol, timeframe, count) returning the newest `count`
+                      bars as an MT5 structured array, or None on failure.
+        :return: structured array view that stays valid until the next call for this key.
+        """
+        key = (symbol, timeframe)
+        series = self._series.get(key)
+
+        if series is None:
+            rates = fetch(symbol, timeframe, self.history)
+            if rates is None or len(rates) == 0:
+                return None
+            self._record(rates, miss=True)
+            with self._lock:
+                series = self._series.setdefault(key, _CachedSeries(rates, 2 * self.history))
+            with series.lock:
+                self._append(series, rates)
+                return series.bars
+
+        with series.lock:
+            last_closed = series.buffer['time'][series.end - 2] if series.end - series.start >= 2 else None
+            count = self.initial_delta
+            while True:
+                rates = fetch(symbol, timeframe, count)
+                if rates is None or len(rates) == 0:
+                    return None
+                overlaps = last_closed is not None and rates['time'][0] <= last_closed
+                if overlaps or count >= self.history:
+                    break
+                self._record(rates)
+                count = min(count * 2, self.history)
+
+            self._record(rates, hit=overlaps, miss=not overlaps)
+            if overlaps:
+                # Re-fetched bars (at least the previously forming one) replace the cached copies
+                series.end = series.start + int(np.searchsorted(series.bars['time'], rates['time'][0], side='left'))
+            else:
+                series.start = series.end = 0
+            self._append(series, rates)
+            return series.bars
+
+    def invalidate(self, symbol=None, timeframe=None):
+        with self._lock:
+            for key in list(self._series):
+                if (symbol is None or key[0] == symbol) and (timeframe is None or key[1] == timeframe):
+                    del self._series[key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'bars_transferred': self.bars_transferred,
+                'bytes_transferred': self.bytes_transferred,
+                'series': len(self._series),
+            }
+
+    def _append(self, series, rates):
+        rates = rates[-self.history:]
+        if series.end + len(rates) > len(series.buffer):
+            # Compact: move only the tail that survives the trim to the front
+            keep = min(self.history - len(rates), series.end - series.start)
+            series.buffer[:keep] = series.buffer[series.end - keep:series.end]
+            series.start, series.end = 0, keep
+        series.buffer[series.end:series.end + len(rates)] = rates
+        series.end += len(rates)
+        series.start = max(series.start, series.end - self.history)
+
+    def _record(self, rates, hit=False, miss=False):
+        with self._lock:
+            self.hits += hit
+            self.misses += miss
+            self.bars_transferred += len(rates)
+            self.bytes_transferred += rates.nbytes
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+# Layout of the structured arrays returned by mt5.copy_rates_* (little-endian, packed)
+RATES_DTYPE = np.dtype([
+    ('time', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('tick_volume', '<u8'),
+    ('spread', '<i4'),
+    ('real_volume', '<u8'),
+])
+
+
+class BarSeries:
+    """
+    Bars of one symbol/timeframe backed by an MT5 rates array, without copying it.
+
+    Only the columns the strategy reads are exposed, as numpy views
+    (series['close'] or series.close); times are MT5 epoch seconds. Slicing
+    returns another view. to_frame() builds a DataFrame on demand, e.g. for
+    plotting or CSV.
+
+    A series built on a BarCache result shares the cache's buffer, so it is
+    valid until the next fetch of the same symbol and timeframe.
+    """
+
+    __slots__ = ('rates', 'symbol', 'timeframe')
+
+    COLUMNS = ('time', 'open', 'high', 'low', 'close')
+
+    def __init__(self, rates, symbol=None, timeframe=None):
+        self.rates = rates
+        self.symbol = symbol
+        self.timeframe = timeframe
+
+    def __len__(self):
+        return len(self.rates)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in self.COLUMNS:
+                raise KeyError(key)
+            return self.rates[key]
+        return BarSeries(self.rates[key], self.symbol, self.timeframe)
+
+    def __contains__(self, column):
+        return column in self.COLUMNS
+
+    def __repr__(self):
+        return f"BarSeries({self.symbol!r}, {self.timeframe!r}, {len(self)} bars)"
+
+    @property
+    def columns(self):
+        return list(self.COLUMNS)
+
+    @property
+    def time(self):
+        return self.rates['time']
+
+    @property
+    def open(self):
+        return self.rates['open']
+
+    @property
+    def high(self):
+        return self.rates['high']
+
+    @property
+    def low(self):
+        return self.rates['low']
+
+    @property
+    def close(self):
+        return self.rates['close']
+
+    @property
+    def nbytes(self):
+        return self.rates.nbytes
+
+    def to_frame(self, columns=None, parse_dates=True):
+        """
+        DataFrame copy of the bars (all MT5 columns by default).
+
+        :param parse_dates: convert 'time' to datetime64, as get_rates_range used to return it.
+        """
+        frame = pd.DataFrame(self.rates if columns is None else {c: self.rates[c] for c in columns})
+        if parse_dates and 'time' in frame:
+            frame['time'] = pd.to_datetime(frame['time'], unit='s')
+        return frame
@@ -0,0 +1,180 @@
+"""
+Higher-timeframe bars built from a lower-timeframe stream.
+
+Bars are grouped into buckets of the target timeframe that start at
+`session_offset` seconds past the timeframe's natural boundary (server-time
+midnight for D1, 00/04/08... for H4, Sunday for W1). Set the offset to match
+the broker's session when its daily bar does not start at server midnight,
+e.g. -2 * 3600 for days that open at 22:00. Each bucket takes the first open,
+the highest high, the lowest low and the last close; tick and real volume
+add up and the spread is the bucket's lowest, as in the terminal's own bars.
+
+    resample(rates, timeframe)   whole-array aggregation
+    Resampler                    incremental: keeps the forming bar up to date
+    compare(local, broker)       validation against the broker's own bars
+"""
+import threading
+
+import numpy as np
+
+from advisor.Client import Timeframes
+from advisor.Client.Rates import RATES_DTYPE
+
+# Weeks start on Sunday; the epoch was a Thursday
+_WEEK_OFFSET = 4 * Timeframes.DAY
+COMPARED_FIELDS = ('open', 'high', 'low', 'close', 'tick_volume')
+
+
+def bucket_starts(times, timeframe, session_offset=0):
+    """Open time of the `timeframe` bucket holding each time (epoch seconds)."""
+    if Timeframes.is_monthly(timeframe):
+        raise ValueError("Monthly bars are not supported.")
+    step = Timeframes.timeframe_seconds(timeframe)
+    offset = session_offset - (_WEEK_OFFSET if step == Timeframes.WEEK else 0)
+    times = Timeframes.epoch_seconds(times)
+    return (times - offset) // step * step + offset
+
+
+def resample(rates, timeframe, session_offset=0, drop_partial=False):
+    """
+    Aggregate MT5 rates into `timeframe` bars.
+
+    :param drop_partial: drop the first bar when the rates start after its bucket opened,
+                         i.e. when it was built from only part of its bars.
+    :return: structured array (RATES_DTYPE), one row per bucket that has bars.
+    """
+    if len(rates) == 0:
+        return np.empty(0, dtype=RATES_DTYPE)
+    buckets = bucket_starts(rates['time'], timeframe, session_offset)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(rates)] - 1
+
+    out = np.empty(len(starts), dtype=RATES_DTYPE)
+    out['time'] = buckets[starts]
+    out['open'] = rates['open'][starts]
+    out['close'] = rates['close'][ends]
+    out['high'] = np.maximum.reduceat(rates['high'], starts)
+    out['low'] = np.minimum.reduceat(rates['low'], starts)
+    out['tick_volume'] = np.add.reduceat(rates['tick_volume'], starts)
+    out['spread'] = np.minimum.reduceat(rates['spread'], starts)
+    out['real_volume'] = np.add.reduceat(rates['real_volume'], starts)
+    if drop_partial and out['time'][0] < rates['time'][0]:
+        out = out[1:]
+    return out
+
+
+class Resampler:
+    """
+    One higher timeframe of one symbol, kept up to date from lower-timeframe rates.
+
+    update() takes the base rates as BarCache returns them (newest, still-forming
+    bar last). Only the bars from the open of the forming higher-timeframe bar
+    onwards are aggregated again: completed bars are kept, the forming bar is
+    rebuilt in place and bars that started since the last call are appended. If
+    the rates no longer reach back to the forming bar (bars were missed), the
+    whole window is aggregated again.
+
+    Usage:
+        h4 = Resampler(TIMEFRAME_H4, TIMEFRAME_H1)
+        bars = h4.update(h1_rates)  # call again with each newer H1 window
+    """
+
+    def __init__(self, timeframe, base_timeframe, session_offset=0, history=1000):
+        if Timeframes.is_monthly(timeframe) or Timeframes.is_monthly(base_timeframe):
+            raise ValueError("Monthly bars are not supported.")
+        step, base_step = Timeframes.timeframe_seconds(timeframe), Timeframes.timeframe_seconds(base_timeframe)
+        if step < base_step or step % base_step:
+            raise ValueError(f"{Timeframes.timeframe_name(timeframe)} is not a whole multiple of "
+                             f"{Timeframes.timeframe_name(base_timeframe)}.")
+        if history < 1:
+            raise ValueError("history must hold at least one bar.")
+        self.timeframe = timeframe
+        self.base_timeframe = base_timeframe
+        self.session_offset = session_offset
+        self.history = history
+        self._buffer = np.empty(2 * history, dtype=RATES_DTYPE)
+        self._start = 0
+        self._end = 0
+        self._lock = threading.Lock()
+
+    @property
+    def bars(self):
+        """Aggregated bars, forming bar last; a view valid until the next update()."""
+        return self._buffer[self._start:self._end]
+
+    def update(self, rates):
+        """Ingest base rates and return up to `history` aggregated bars, forming bar last."""
+        if rates is None or len(rates) == 0:
+            return self.bars
+        with self._lock:
+            forming = self._buffer['time'][self._end - 1] if self._end > self._start else None
+            if forming is None or rates['time'][0] > forming:
+                self._start = self._end = 0
+                self._append(resample(rates, self.timeframe, self.session_offset, drop_partial=True))
+                return self.bars
+
+            position = int(np.searchsorted(rates['time'], forming, side='left'))
+            bars = resample(rates[position:], self.timeframe, self.session_offset)
+            if len(bars):
+                self._end = self._start + int(np.searchsorted(self.bars['time'], bars['time'][0], side='left'))
+                self._append(bars)
+            return self.bars
+
+    def reset(self):
+        with self._lock:
+            self._start = self._end = 0
+
+    def _append(self, bars):
+        bars = bars[-self.history:]
+        if self._end + len(bars) > len(self._buffer):
+            keep = min(self.history - len(bars), self._end - self._start)
+            self._buffer[:keep] = self._buffer[self._end - keep:self._end]
+            self._start, self._end = 0, keep
+        self._buffer[self._end:self._end + len(bars)] = bars
+        self._end += len(bars)
+        self._start = max(self._start, self._end - self.history)
+
+
+def compare(local, broker, fields=COMPARED_FIELDS, tolerance=0.0, closed_only=True):
+    """
+    Compare locally built bars with the broker's bars of the same timeframe.
+
+    Only the time span both cover is compared. With closed_only the newest bar
+    of each side is left out, since a forming bar can move between two fetches.
+
+    :param tolerance: largest absolute difference per field still counted as equal.
+    :return: dict with 'compared' (bars present on both sides), 'missing' (broker bar
+             times absent locally), 'extra' (local times the broker does not have),
+             'mismatched' (times whose fields differ), 'max_diff' per field and 'ok'.
+    """
+    if closed_only:
+        local, broker = local[:-1], broker[:-1]
+    local_time, broker_time = Timeframes.epoch_seconds(local['time']), Timeframes.epoch_seconds(broker['time'])
+    if len(local_time) and len(broker_time):
+        first, last = max(local_time[0], broker_time[0]), min(local_time[-1], broker_time[-1])
+    else:
+        first, last = 0, -1
+    local_span = (local_time >= first) & (local_time <= last)
+    broker_span = (broker_time >= first) & (broker_time <= last)
+    common, local_index, broker_index = np.intersect1d(local_time, broker_time, assume_unique=True,
+                                                       return_indices=True)
+
+    differs = np.zeros(len(common), dtype=bool)
+    max_diff = {}
+    for field in fields:
+        diff = np.abs(np.asarray(local[field][local_index], dtype=float)
+                      - np.asarray(broker[field][broker_index], dtype=float))
+        max_diff[field] = float(diff.max()) if len(diff) else 0.0
+        differs |= diff > tolerance
+
+    missing = np.setdiff1d(broker_time[broker_span], local_time, assume_unique=True)
+    extra = np.setdiff1d(local_time[local_span], broker_time, assume_unique=True)
+    mismatched = common[differs]
+    return {
+        'compared': len(common),
+        'missing': missing.tolist(),
+        'extra': extra.tolist(),
+        'mismatched': mismatched.tolist(),
+        'max_diff': max_diff,
+        'ok': not (len(missing) or len(extra) or len(mismatched)),
+    }
@@ -0,0 +1,226 @@
+import collections
+import threading
+from concurrent.futures import Future
+
+from advisor.Client import Backend
+
+# IPC errors of the MetaTrader5 package: send/receive failed, init failed, no connection, timeout
+DISCONNECTED = (-10001, -10002, -10003, -10004, -10005)
+SUCCESS = (1, "Success")
+
+# Read-only calls: identical queued requests share one terminal call
+COALESCED = frozenset({
+    "account_info", "terminal_info", "symbols_total", "symbols_get", "symbol_info", "symbol_info_tick",
+    "copy_rates_from_pos", "copy_rates_from", "copy_rates_range", "copy_ticks_from", "copy_ticks_range",
+    "positions_total", "positions_get", "orders_total", "orders_get",
+})
+# Served before queued reads
+PRIORITY = frozenset({"order_send", "order_check"})
+
+
+class _Request:
+    __slots__ = ('key', 'name', 'args', 'kwargs', 'future')
+
+    def __init__(self, key, name, args, kwargs, future):
+        self.key = key
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs
+        self.future = future
+
+
+class MT5Session:
+    """
+    Owns the terminal connection and runs every MetaTrader5 call on one dispatcher thread.
+
+    The MetaTrader5 package is not thread-safe. Workers therefore submit calls
+    and get a Future back, or call the session like the module itself. The
+    dispatcher:
+    - serves order_send/order_check before queued reads,
+    - answers identical queued read requests (same function and arguments)
+      with one terminal call,
+    - on an IPC error (DISCONNECTED) shuts the terminal down, initializes it
+      again with the session's credentials and retries the call, up to
+      `reconnect_attempts` times `reconnect_delay` seconds apart. Orders
+      (PRIORITY) are never retried: a timed-out order_send may already have
+      reached the server, so the session reconnects and returns the original
+      error to the caller.
+
+    last_error() returns the error of the calling thread's own last request.
+
+    Usage:
+        session = MT5Session().start()
+        Backend.use(session)  # every `from advisor.Client.Backend import mt5` now goes through it
+        session.initialize(login=..., password=..., server=...)
+        future = session.submit("copy_rates_from_pos", "EURUSD", mt5.TIMEFRAME_H1, 0, 100)
+    """
+
+    def __init__(self, backend=None, reconnect_attempts=3, reconnect_delay=1.0):
+        if backend is None:
+            backend = Backend.current()
+            if isinstance(backend, MT5Session):
+                backend = backend.backend
+        self.backend = backend
+        self.reconnect_attempts = reconnect_attempts
+        self.reconnect_delay = reconnect_delay
+        self._credentials = None
+        self._reads = collections.deque()
+        self._orders = collections.deque()
+        self._pending = {}  # key -> queued coalescable request
+        self._condition = threading.Condition()
+        self._closing = threading.Event()
+        self._local = threading.local()
+        self._stats = collections.Counter()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="mt5-session", daemon=True)
+        self._thread.start()
+        return self
+
+    # ---------- worker API ----------
+
+    def submit(self, name, *args, **kwargs):
+        """
+        Queue backend.`name`(*args, **kwargs) for the dispatcher.
+
+        :return: Future of the call's result; once done, its `last_error` attribute holds the call's error.
+        """
+        key = None
+        if name in COALESCED:
+            key = (name, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                key = None
+        with self._condition:
+            if self._closing.is_set():
+                raise RuntimeError("The MT5 session is closed.")
+            request = self._pending.get(key) if key is not None else None
+            if request is not None:
+                self._stats['coalesced'] += 1
+                return request.future
+            request = _Request(key, name, args, kwargs, Future())
+            if key is not None:
+                self._pending[key] = request
+            (self._orders if name in PRIORITY else self._reads).append(request)
+            self._stats['submitted'] += 1
+            self._condition.notify()
+        return request.future
+
+    def call(self, name, *args, timeout=None, **kwargs):
+        """Run backend.`name` on the dispatcher and wait for it; the error is kept for last_error()."""
+        future = self.submit(name, *args, **kwargs)
+        result = future.result(timeout)
+        self._local.error = future.last_error
+        return result
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        value = getattr(self.backend, name)
+        if name.isupper() or not callable(value):
+            return value  # constants such as mt5.ORDER_TYPE_BUY
+        return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+
+    # ---------- connection ----------
+
+    def initialize(self, *args, **kwargs):
+        """
+        Connect the terminal. Repeated calls with the same credentials while
+        connected return True without logging in again.
+        """
+        credentials = (args, kwargs)
+        if self._credentials == credentials and self.call("terminal_info") is not None:
+            self._local.error = SUCCESS
+            return True
+        connected = self.call("initialize", *args, **kwargs)
+        if connected:
+            self._credentials = credentials
+        return connected
+
+    def login(self, *args, **kwargs):
+        return self.call("login", *args, **kwargs)
+
+    def last_error(self):
+        return getattr(self._local, 'error', SUCCESS)
+
+    def shutdown(self):
+        """Disconnect the terminal; the session keeps running and reconnects on the next initialize()."""
+        self._credentials = None
+        return self.call("shutdown")
+
+    def close(self, timeout=10.0):
+        """
+        Serve the queued requests, disconnect and stop the dispatcher.
+
+        The dispatcher disconnects the terminal itself after its last call, so a
+        close() that times out never calls into the terminal alongside it.
+        """
+        with self._condition:
+            self._closing.set()
+            self._condition.notify_all()
+        if self._thread is None:
+            self.backend.shutdown()
+            return
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            print(f"⚠️ MT5 session still busy after {timeout}s; it disconnects once the current call returns.")
+
+    def stats(self):
+        with self._condition:
+            stats = dict(self._stats)
+            stats['queued'] = len(self._reads) + len(self._orders)
+        return stats
+
+    # ---------- dispatcher thread ----------
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not (self._orders or self._reads or self._closing.is_set()):
+                    self._condition.wait()
+                if not (self._orders or self._reads):
+                    break
+                request = (self._orders or self._reads).popleft()
+                if request.key is not None:
+                    # Requests arriving from now on need a fresh answer
+                    del self._pending[request.key]
+            if request.future.set_running_or_notify_cancel():
+                try:
+                    result, request.future.last_error = self._execute(request.name, request.args, request.kwargs)
+                    request.future.set_result(result)
+                except Exception as e:
+                    request.future.last_error = (-1, str(e))
+                    request.future.set_exception(e)
+        self.backend.shutdown()
+
+    def _execute(self, name, args, kwargs):
+        """(result, last_error) of one call, reconnecting on IPC errors."""
+        function = getattr(self.backend, name)
+        for attempt in range(self.reconnect_attempts + 1):
+            result = function(*args, **kwargs)
+            self._stats['calls'] += 1
+            if result is not None and result is not False:
+                return result, SUCCESS
+            error = tuple(self.backend.last_error())
+            if error[0] not in DISCONNECTED or self._credentials is None or name in ("initialize", "shutdown"):
+                return result, error
+            if name in PRIORITY:
+                self._reconnect()
+                return result, error
+            if attempt < self.reconnect_attempts and not self._reconnect():
+                break
+        return result, error
+
+    def _reconnect(self):
+        if self._closing.wait(self.reconnect_delay):
+            return False
+        print("🔌 MetaTrader 5 connection lost, reconnecting...")
+        args, kwargs = self._credentials
+        self.backend.shutdown()
+        connected = self.backend.initialize(*args, **kwargs)
+        self._stats['reconnects'] += 1
+        if connected:
+            print("✅ Reconnected to MetaTrader 5.")
+        return True
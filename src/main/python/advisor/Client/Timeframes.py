@@ -0,0 +1,85 @@
+"""
+Helpers for MetaTrader 5 timeframe constants.
+
+MT5 encodes timeframes as plain minutes (M1..M30), 0x4000 | hours (H1..D1),
+0x8000 | weeks (W1) and 0xC000 | months (MN1), so they can be decoded without
+importing the terminal package.
+"""
+import datetime
+
+import numpy as np
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+
+_HOURS_FLAG = 0x4000
+_WEEKS_FLAG = 0x8000
+_MONTHS_FLAG = 0xC000
+
+# Same values as the MetaTrader5 package's TIMEFRAME_* constants
+TIMEFRAME_M1 = 1
+TIMEFRAME_M5 = 5
+TIMEFRAME_M15 = 15
+TIMEFRAME_M30 = 30
+TIMEFRAME_H1 = _HOURS_FLAG | 1
+TIMEFRAME_H4 = _HOURS_FLAG | 4
+TIMEFRAME_D1 = _HOURS_FLAG | 24
+TIMEFRAME_W1 = _WEEKS_FLAG | 1
+TIMEFRAME_MN1 = _MONTHS_FLAG | 1
+
+
+def is_monthly(timeframe):
+    return timeframe & _MONTHS_FLAG == _MONTHS_FLAG
+
+
+def timeframe_seconds(timeframe):
+    """
+    Length of one bar in seconds. Monthly bars have no fixed length; an average
+    30-day month is returned for them, use is_monthly() where it matters.
+    """
+    if is_monthly(timeframe):
+        return (timeframe & 0x3FFF) * 30 * DAY
+    if timeframe & _WEEKS_FLAG:
+        return (timeframe & 0x3FFF) * WEEK
+    if timeframe & _HOURS_FLAG:
+        return (timeframe & 0x3FFF) * HOUR
+    return timeframe * MINUTE
+
+
+def timeframe_name(timeframe):
+    if is_monthly(timeframe):
+        return f"MN{timeframe & 0x3FFF}"
+    if timeframe & _WEEKS_FLAG:
+        return f"W{timeframe & 0x3FFF}"
+    if timeframe & _HOURS_FLAG:
+        hours = timeframe & 0x3FFF
+        return "D1" if hours == 24 else f"H{hours}"
+    return f"M{timeframe}"
+
+
+def epoch_seconds(times):
+    """Bar times (datetime64 or MT5 integer seconds) as an int64 array of epoch seconds."""
+    values = np.asarray(times)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[s]').astype(np.int64)
+    return values.astype(np.int64)
+
+
+def to_epoch(value):
+    """
+    One point in time as int epoch seconds, or None for None.
+
+    Takes MT5 integer seconds, datetime/pd.Timestamp, np.datetime64, dates and
+    ISO strings. Naive values are UTC, as MT5 treats them.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer, float, np.floating)):
+        return int(value)
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return int(value.timestamp())
+    return int(np.datetime64(value, 's').astype(np.int64))
@@ -0,0 +1,86 @@
+"""
+The account and risk settings the bot runs with (`user_data`), built without the GUI.
+
+UserGUI.submit collects the same fields from its form. The headless service
+reads them from an INI file with an [advisor] section and/or from environment
+variables, which take precedence:
+
+    [advisor]             environment
+    volume = 0.01         ADVISOR_VOLUME
+    sl = 20               ADVISOR_SL        (SL distance in points)
+    rr = 1:3              ADVISOR_RR        (TP = SL x the larger side)
+    server = Broker-Demo  ADVISOR_SERVER
+    account = 12345678    ADVISOR_ACCOUNT
+    password = ...        ADVISOR_PASSWORD
+
+ADVISOR_CONFIG names the file when no path is passed.
+"""
+import configparser
+import os
+
+CONFIG_ENV = "ADVISOR_CONFIG"
+SECTION = "advisor"
+FIELDS = ("volume", "sl", "rr", "server", "account", "password")
+
+
+def rr_multiple(rr):
+    """TP multiple of the SL for a risk/reward string such as '1:3'."""
+    try:
+        return max(float(part) for part in str(rr).split(':'))
+    except ValueError:
+        raise ValueError(f"RR Ratio must look like 1:3, got '{rr}'.") from None
+
+
+def build_user_data(volume, sl, rr, server, account_id, password):
+    """
+    Validate the settings form's fields and return the user_data dict the client and trader use.
+
+    :raises ValueError: with the message the GUI shows for the first invalid field.
+    """
+    volume, sl, rr = (str(value).strip() for value in (volume, sl, rr))
+    server, account_id, password = (str(value or "").strip() for value in (server, account_id, password))
+    if not server or not volume:
+        raise ValueError("Server and Volume are required.")
+    if not account_id.isdigit() or len(account_id) < 5:
+        raise ValueError("Valid Account ID is required.")
+    if not password or not (8 <= len(password) <= 16):
+        raise ValueError("Password must be 8–16 characters.")
+    try:
+        volume, sl = float(volume), float(sl)
+    except ValueError:
+        raise ValueError("Volume and SL distance must be numbers.") from None
+
+    return {
+        "volume": volume,
+        'sl': sl,
+        'tp': sl * rr_multiple(rr),
+        "server": server,
+        "account_id": account_id,
+        "password": password,
+    }
+
+
+def load_user_data(path=None, environ=None):
+    """
+    Build user_data from the config file at `path` (or $ADVISOR_CONFIG) overlaid with ADVISOR_* variables.
+
+    :raises ValueError: if the file is missing or a field is absent or invalid.
+    """
+    environ = os.environ if environ is None else environ
+    path = path or environ.get(CONFIG_ENV)
+    values = {}
+    if path:
+        parser = configparser.ConfigParser(interpolation=None)
+        if not parser.read(path, encoding="utf-8"):
+            raise ValueError(f"Config file '{path}' not found.")
+        if parser.has_section(SECTION):
+            values.update(parser[SECTION])
+    for field in FIELDS:
+        if environ.get(f"ADVISOR_{field.upper()}"):
+            values[field] = environ[f"ADVISOR_{field.upper()}"]
+
+    missing = [field for field in FIELDS if not values.get(field)]
+    if missing:
+        raise ValueError(f"Missing settings: {', '.join(missing)} (config [{SECTION}] keys or ADVISOR_* variables).")
+    return build_user_data(values['volume'], values['sl'], values['rr'], values['server'], values['account'],
+                           values['password'])
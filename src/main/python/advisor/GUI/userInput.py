@@ -3,6 +3,7 @@ from tkinter import messagebox
 from tkinter.scrolledtext import ScrolledText
 import queue, sys, datetime
 from advisor.Logs import Logger as logs
+from advisor.Client import UserConfig
 
 
 class TextRedirector:
@@ -133,26 +134,12 @@ class UserGUI:
         account_id = self.account_entry.get().strip()
         password = self.password_entry.get().strip()
 
-        # Validations
-        if not server or not volume:
-            messagebox.showerror("Input Error", "Server and Volume are required.")
-            return None
-        if not account_id.isdigit() or len(account_id) < 5:
-            messagebox.showerror("Input Error", "Valid Account ID is required.")
-            return None
-        if not password or not (8 <= len(password) <= 16):
-            messagebox.showerror("Input Error", "Password must be 8–16 characters.")
+        try:
+            self.user_data = UserConfig.build_user_data(volume, sl, rr, server, account_id, password)
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e))
             return None
 
-        self.user_data = {
-            "volume": volume,
-            'sl': sl,
-            'tp': sl * self.getPtRatio(rr),
-            "server": server,
-            "account_id": account_id,
-            "password": password,
-        }
-
         self.root.withdraw()
         self.should_run = True
 
@@ -167,8 +154,7 @@ class UserGUI:
         return self.user_data
     
     def getPtRatio(self, rr: str):
-        rrValues = [int(digit) for digit in (rr.split(':'))]
-        return max(rrValues) 
+        return UserConfig.rr_multiple(rr)
         
         
     def quit(self):
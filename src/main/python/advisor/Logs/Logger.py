@@ -1,10 +1,178 @@
-import sys
+import atexit
+import collections
 import csv
+import gzip
 import os
+import shutil
+import sys
+import threading
+import time
+import traceback
 from datetime import datetime
 
+
+class AsyncLogWriter:
+    """
+    Appends CSV rows to a log file from a background thread.
+
+    Records are tuples whose first item is a time.time() stamp; `format_record` turns
+    one into a CSV row. Producers call submit(), which only appends to a deque under a
+    short lock (the counters flush() relies on change with it) and never touches the
+    disk. The writer thread keeps the file open and writes records in batches. A batch is flushed when `batch_size` records are waiting,
+    when `flush_interval` seconds have passed, or on close().
+
+    Rotation, checked before each batch:
+    - `max_bytes`: rotate once the file would grow past this size.
+    - `rotate_interval`: rotate when a batch starts in a new interval (seconds since the epoch).
+    Rotated files are renamed to <name>.1 ... <name>.<backup_count>, oldest last, and
+    gzip-compressed to <name>.N.gz when `compress` is set.
+    """
+
+    def __init__(self, filename, format_record, batch_size=256, flush_interval=1.0, max_bytes=None,
+                 rotate_interval=None, backup_count=5, compress=False, max_pending=100_000):
+        self.filename = filename
+        self.format_record = format_record
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.compress = compress
+        self.dropped = 0
+
+        self._pending = collections.deque(maxlen=max_pending)
+        self._lock = threading.Lock()  # guards _pending, _submitted and dropped
+        self._wake = threading.Event()
+        self._closed = False
+        self._flushed = threading.Condition()
+        self._written = 0
+        self._submitted = 0
+        self._file = None
+        self._period = None
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, record):
+        if self._closed:
+            return
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1  # the deque discards the oldest record
+            self._submitted += 1
+            self._pending.append(record)
+            waiting = len(self._pending)
+        if waiting >= self.batch_size:
+            self._wake.set()
+
+    def wake(self):
+        """Ask the writer thread to write what is pending now, without waiting for it."""
+        self._wake.set()
+
+    def flush(self, timeout=None):
+        """Write everything submitted so far and wait until it is on disk. Returns True on success."""
+        with self._lock:
+            target = self._submitted - self.dropped
+        self._wake.set()
+        with self._flushed:
+            return self._flushed.wait_for(lambda: self._written >= target or not self._thread.is_alive(), timeout)
+
+    def close(self, timeout=5.0):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout)
+
+    # ---------- writer thread ----------
+
+    def _run(self):
+        try:
+            while not self._closed:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                self._write_pending()
+            self._write_pending()
+        finally:
+            if self._file is not None:
+                self._file.close()
+            with self._flushed:
+                self._flushed.notify_all()
+
+    def _write_pending(self):
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+        if batch:
+            try:
+                rows = [self.format_record(record) for record in batch]
+                self._rotate_if_needed(batch[0], rows)
+                csv.writer(self._open()).writerows(rows)
+                self._file.flush()
+            except Exception as e:
+                sys.__stderr__.write(f"❌ Failed to write {len(batch)} log records: {e}\n")
+        with self._flushed:
+            self._written += len(batch)
+            self._flushed.notify_all()
+
+    def _open(self):
+        if self._file is None:
+            directory = os.path.dirname(self.filename)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.filename, mode='a', newline='', encoding='utf-8')
+        return self._file
+
+    def _rotate_if_needed(self, first_record, rows):
+        rotate = False
+        if self.rotate_interval:
+            period = int(first_record[0] // self.rotate_interval)
+            if self._period is None:
+                self._period = self._file_period()
+            rotate = self._period is not None and period != self._period
+            self._period = period
+        if not rotate and self.max_bytes:
+            size = self._file.tell() if self._file is not None else _file_size(self.filename)
+            rotate = size > 0 and size + sum(len(str(value)) + 3 for row in rows for value in row) > self.max_bytes
+        if rotate:
+            self._rotate()
+
+    def _file_period(self):
+        try:
+            return int(os.path.getmtime(self.filename) // self.rotate_interval)
+        except OSError:
+            return None
+
+    def _rotate(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if not os.path.exists(self.filename):
+            return
+        suffix = ".gz" if self.compress else ""
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.filename}.{index}{suffix}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.filename}.{index + 1}{suffix}")
+        if self.backup_count < 1:
+            os.remove(self.filename)
+        elif self.compress:
+            with open(self.filename, 'rb') as source, gzip.open(f"{self.filename}.1.gz", 'wb') as target:
+                shutil.copyfileobj(source, target)
+            os.remove(self.filename)
+        else:
+            os.replace(self.filename, f"{self.filename}.1")
+
+
 class FileLogger:
-    def __init__(self, user_data, filename=None):
+    """
+    Redirects print() and uncaught exceptions to a CSV log in ~/Documents/TradingBotLogs.
+
+    write() only stamps the message with the time and queues it. Formatting and
+    file I/O happen on the AsyncLogWriter thread. Extra keyword arguments configure
+    the writer, e.g. FileLogger(user_data, max_bytes=10_000_000, compress=True).
+    """
+
+    def __init__(self, user_data, filename=None, redirect=True, **writer_options):
         self.user_data = user_data
 
         # Dynamically resolve the user's Documents folder
@@ -13,33 +181,41 @@ class FileLogger:
         os.makedirs(logs_dir, exist_ok=True)
 
         self.filename = filename or os.path.join(logs_dir, "logs.csv")
-        self._init_file()
-        
-        # Redirect print() to this logger
-        sys.stdout = self
-        sys.stderr = self
-        sys.excepthook = self
-
-    def _init_file(self):
-        is_new = not os.path.exists(self.filename)
-        if is_new:
-            with open(self.filename, mode='w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow([])
-            
+        self.writer = AsyncLogWriter(self.filename, self._format_record, **writer_options)
+        atexit.register(self.close)
+
+        if redirect:
+            # Redirect print() to this logger
+            sys.stdout = self
+            sys.stderr = self
+            sys.excepthook = self
+
     def write(self, message: str):
-        
-        message = message.strip()
-        if not message:
-            return
+        # print() writes the text and the line ending separately; blank writes are skipped here
+        if message and not message.isspace():
+            self.writer.submit((time.time(), message))
+        return len(message)
+
+    def __call__(self, exc_type, exc_value, exc_traceback):
+        """sys.excepthook: log uncaught exceptions with their traceback."""
+        self.write("".join(traceback.format_exception(exc_type, exc_value, exc_traceback)))
 
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def flush(self):
+        # Called by print(flush=True) and the interpreter; wake the writer without waiting for it
+        self.writer.wake()
+
+    def close(self, timeout=5.0):
+        self.writer.close(timeout)
+
+    def _format_record(self, record):
+        created, message = record
+        timestamp = datetime.fromtimestamp(created).strftime("%Y-%m-%d %H:%M:%S")
         account_info = f"{timestamp} »»» {self.user_data.get('server')}-{self.user_data.get('account_id')}"
-        log_entry = f": {message}"
+        return [account_info, f": {message.strip()}"]
 
-        with open(self.filename, mode='a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow([account_info, log_entry])
 
-    def flush(self):
-        pass
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
@@ -0,0 +1,132 @@
+import json
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from advisor.Metrics.Registry import REGISTRY
+
+
+def prometheus_text(registry=REGISTRY):
+    """Render every metric in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for metric in registry.metrics():
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for labels, child in metric.series():
+            if metric.kind == 'histogram':
+                snapshot = child.snapshot()
+                for bound, count in snapshot['buckets'].items():
+                    lines.append(f"{metric.name}_bucket{_labels(labels, le=bound)} {count}")
+                lines.append(f"{metric.name}_sum{_labels(labels)} {_number(snapshot['sum'])}")
+                lines.append(f"{metric.name}_count{_labels(labels)} {snapshot['count']}")
+            else:
+                lines.append(f"{metric.name}{_labels(labels)} {_number(child.value)}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    Local pull endpoint for the metrics registry on a daemon thread.
+
+    GET /metrics       Prometheus text format
+    GET /metrics.json  the same data as a JSON snapshot, with mean/max/p50/p95 per series
+
+    Binds to 127.0.0.1 by default; port 0 picks a free port (see `port`).
+    """
+
+    def __init__(self, port=9108, host="127.0.0.1", registry=REGISTRY):
+        self.registry = registry
+        self.server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        self.server.daemon_threads = True
+        self.server.registry = registry
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, name="metrics-server", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        print(f"📈 Metrics available at http://{self.server.server_address[0]}:{self.port}/metrics")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class SnapshotWriter:
+    """Writes registry.snapshot() to a JSON file every `interval` seconds, and once more on stop()."""
+
+    def __init__(self, path, interval=60.0, registry=REGISTRY):
+        self.path = path
+        self.interval = interval
+        self.registry = registry
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-snapshot", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def write(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Write then rename so readers never see a partial file
+        with open(self.path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(self.registry.snapshot(), f, indent=1)
+        os.replace(self.path + ".tmp", self.path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._write_safely()
+        self._write_safely()
+
+    def _write_safely(self):
+        try:
+            self.write()
+        except Exception as e:
+            print(f"⚠️ Failed to write metrics snapshot: {e}")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            body = prometheus_text(self.server.registry).encode()
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path == "/metrics.json":
+            body = json.dumps(self.server.registry.snapshot()).encode()
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass  # stdout is the bot's log; scrapes would flood it
+
+
+def _labels(labels, **extra):
+    labels = {**labels, **extra}
+    if not labels:
+        return ""
+    escaped = (f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return "{" + ",".join(escaped) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value):
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
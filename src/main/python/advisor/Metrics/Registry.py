@@ -0,0 +1,217 @@
+import bisect
+import functools
+import threading
+import time
+
+# Upper bounds in seconds, from sub-millisecond indicator updates to slow terminal/HTTP calls
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Counter:
+    """Monotonic counter for one set of label values."""
+
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1.0):
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self):
+        return {'value': self.value}
+
+
+class Histogram:
+    """Fixed-bucket histogram for one set of label values: per-bucket counts, sum, count and max."""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count', 'max', '_lock')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+            if value > self.max:
+                self.max = value
+
+    def snapshot(self):
+        with self._lock:
+            counts, total, count, maximum = list(self.counts), self.sum, self.count, self.max
+        cumulative, buckets = 0, {}
+        for bound, bucket_count in zip(self.bounds + (float('inf'),), counts):
+            cumulative += bucket_count
+            buckets['+Inf' if bound == float('inf') else repr(bound)] = cumulative
+        return {
+            'count': count,
+            'sum': total,
+            'mean': total / count if count else 0.0,
+            'max': maximum,
+            'p50': _quantile(self.bounds, counts, count, 0.50),
+            'p95': _quantile(self.bounds, counts, count, 0.95),
+            'buckets': buckets,
+        }
+
+
+class Metric:
+    """A named metric family; labels() returns the child series for one set of label values."""
+
+    def __init__(self, name, help_text, kind, label_names, factory):
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.label_names = tuple(label_names)
+        self._factory = factory
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} expects labels {self.label_names}, got {values}.")
+            with self._lock:
+                child = self._children.setdefault(values, self._factory())
+        return child
+
+    def series(self):
+        with self._lock:
+            children = list(self._children.items())
+        for values, child in children:
+            yield dict(zip(self.label_names, map(str, values))), child
+
+
+class MetricsRegistry:
+    """
+    Process-wide set of metric families.
+
+    Setting `enabled` to False turns every timed() block into a no-op without
+    removing the instrumentation.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name, help_text, labels=()):
+        return self._register(name, help_text, 'counter', labels, Counter)
+
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        buckets = tuple(sorted(buckets))
+        return self._register(name, help_text, 'histogram', labels, lambda: Histogram(buckets))
+
+    def metrics(self):
+        with self._lock:
+            return list(self._metrics.values())
+
+    def snapshot(self):
+        """Every series as plain data, for the JSON exporter."""
+        return {
+            'time': time.time(),
+            'metrics': {
+                metric.name: {
+                    'type': metric.kind,
+                    'help': metric.help,
+                    'series': [{'labels': labels, **child.snapshot()} for labels, child in metric.series()],
+                }
+                for metric in self.metrics()
+            },
+        }
+
+    def clear(self):
+        for metric in self.metrics():
+            with metric._lock:
+                metric._children.clear()
+
+    def _register(self, name, help_text, kind, labels, factory):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Metric(name, help_text, kind, labels, factory)
+            elif metric.kind != kind or metric.label_names != tuple(labels):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind} with labels {metric.label_names}.")
+            return metric
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "advisor_stage_seconds", "Latency of advisor pipeline stages in seconds.", ("stage", "symbol", "timeframe"))
+STAGE_ERRORS = REGISTRY.counter(
+    "advisor_stage_errors_total", "Pipeline stage calls that raised.", ("stage", "symbol", "timeframe"))
+BARS = REGISTRY.counter(
+    "advisor_bars_total", "Bars returned by data stages.", ("stage", "symbol", "timeframe"))
+
+
+class timed:
+    """
+    Time a pipeline stage into advisor_stage_seconds{stage, symbol, timeframe}.
+
+    Usage:
+        with Registry.timed("get_multi_tf_data", symbol, "H1"):
+            ...
+    An exception inside the block is counted in advisor_stage_errors_total and re-raised.
+    """
+
+    __slots__ = ('labels', 'started')
+
+    def __init__(self, stage, symbol="", timeframe=""):
+        self.labels = (stage, symbol or "", timeframe or "")
+        self.started = None
+
+    def __enter__(self):
+        if REGISTRY.enabled:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if self.started is not None:
+            STAGE_SECONDS.labels(*self.labels).observe(time.perf_counter() - self.started)
+            if exc_type is not None:
+                STAGE_ERRORS.labels(*self.labels).inc()
+        return False
+
+
+def timed_method(stage):
+    """
+    Decorator form of timed() for strategy methods: the symbol label is taken from
+    `self.symbol` and the timeframe label from a `timeframe=` keyword argument.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with timed(stage, getattr(self, 'symbol', ""), kwargs.get('timeframe')):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count_bars(stage, symbol, timeframe, rates):
+    if REGISTRY.enabled and rates is not None:
+        BARS.labels(stage, symbol or "", timeframe or "").inc(len(rates))
+
+
+def _quantile(bounds, counts, count, q):
+    """Estimate a quantile by linear interpolation inside the bucket that holds it."""
+    if not count:
+        return 0.0
+    rank = q * count
+    cumulative, lower = 0, 0.0
+    for bound, bucket_count in zip(bounds, counts):
+        if cumulative + bucket_count >= rank:
+            return lower + (bound - lower) * ((rank - cumulative) / bucket_count if bucket_count else 0.0)
+        cumulative += bucket_count
+        lower = bound
+    return bounds[-1]
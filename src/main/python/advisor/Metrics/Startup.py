@@ -0,0 +1,78 @@
+import os
+import re
+import subprocess
+import sys
+
+# Optional dependencies that only plotting, the GUI, Telegram, MySQL or the live terminal need
+OPTIONAL = ("matplotlib", "tkinter", "telegram", "requests", "dotenv", "MetaTrader5", "mysql")
+
+SOURCE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\S+)\s*$")
+
+
+class ImportProfile:
+    """
+    Import cost of one module in a fresh interpreter, parsed from `python -X importtime`.
+
+    `modules` holds (name, self_seconds, cumulative_seconds) per imported module
+    in import order. `loaded` lists which of OPTIONAL ended up in sys.modules.
+    """
+
+    def __init__(self, target, modules, loaded):
+        self.target = target
+        self.modules = modules
+        self.loaded = loaded
+
+    @property
+    def total(self):
+        """Seconds spent importing `target`, including everything it pulled in."""
+        return sum(self_time for _, self_time, _ in self.modules)
+
+    def by_package(self):
+        """Self time summed per top-level package, slowest first."""
+        totals = {}
+        for name, self_time, _ in self.modules:
+            root = name.split('.')[0]
+            totals[root] = totals.get(root, 0.0) + self_time
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+    def report(self, top=15):
+        lines = [f"⏱️ import {self.target}: {self.total * 1000:.1f} ms"]
+        lines.append("  slowest packages (self time):")
+        for root, seconds in self.by_package()[:top]:
+            lines.append(f"    {root:30s} {seconds * 1000:8.1f} ms")
+        lines.append("  advisor modules (cumulative):")
+        for name, _, cumulative in self.modules:
+            if name.startswith("advisor"):
+                lines.append(f"    {name:40s} {cumulative * 1000:8.1f} ms")
+        lines.append(f"  optional dependencies loaded: {', '.join(self.loaded) or 'none'}")
+        return "\n".join(lines)
+
+
+def profile_import(target="advisor.RunAdvisorBot", env=None):
+    """
+    Import `target` in a new interpreter with -X importtime and return its ImportProfile.
+
+    A subprocess is used because modules already imported by the caller would not be timed.
+    """
+    check = f"import sys; import {target}; print(','.join(m for m in {OPTIONAL!r} if m in sys.modules))"
+    environment = dict(os.environ if env is None else env)
+    environment['PYTHONPATH'] = os.pathsep.join(filter(None, (SOURCE_ROOT, environment.get('PYTHONPATH'))))
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", check],
+                               capture_output=True, text=True, env=environment, cwd=SOURCE_ROOT)
+    if completed.returncode != 0:
+        raise ValueError(f"Importing {target} failed:\n{completed.stderr[-2000:]}")
+
+    modules = []
+    for line in completed.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:  # the header line has no numbers and is skipped
+            self_us, cumulative_us, name = match.groups()
+            modules.append((name, int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    loaded = [name for name in completed.stdout.strip().split(',') if name]
+    return ImportProfile(target, modules, loaded)
+
+
+if __name__ == "__main__":
+    for target in sys.argv[1:] or ["advisor.RunAdvisorBot"]:
+        print(profile_import(target).report())
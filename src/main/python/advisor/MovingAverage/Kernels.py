@@ -0,0 +1,338 @@
+"""
+Indicator kernels, each in a batch and a streaming form that agree to float rounding.
+
+Batch functions take whole NumPy arrays and run in O(n) with vectorised
+blocks (no Python loop per bar). Values before the first full window are NaN,
+like a pandas rolling window with min_periods=period. Streaming classes
+ingest one bar per update() in O(1) and return None until they are warm.
+
+    sma  RollingMean        simple mean of the last `period` values
+    ema  ExponentialMean    alpha = 2 / (period + 1), seeded with the first value
+                            (pandas ewm(span=period, adjust=False, min_periods=period))
+    wma  WeightedMean       linear weights 1..period, newest heaviest
+    hma  HullMean           WMA(2*WMA(n/2) - WMA(n), sqrt(n))
+    atr  AverageTrueRange   Wilder's ATR: the first value is the mean true range of
+                            bars 1..period, then alpha = 1 / period
+
+moving_average(name, ...) and streaming(name, ...) select a moving average by name.
+"""
+import math
+
+import numpy as np
+
+# Bars per vectorised WMA block; block-local sums keep the result within ~1e-12 of the direct sum
+BLOCK = 1024
+
+
+def _values(values):
+    return np.asarray(values, dtype=np.float64)
+
+
+def sma(values, period):
+    values = _values(values)
+    _check(period)
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        # Cumulative sum of the offsets from the first value: smaller magnitudes, less rounding
+        cumsum = np.concatenate(([0.0], np.cumsum(values - values[0])))
+        out[period - 1:] = (cumsum[period:] - cumsum[:-period]) / period + values[0]
+    return out
+
+
+def wma(values, period):
+    values = _values(values)
+    _check(period)
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n < period:
+        return out
+    denominator = period * (period + 1) / 2
+    # Per block: sum of k*x over the window from block-local cumulative sums of x and i*x
+    for first in range(period - 1, n, BLOCK):
+        last = min(first + BLOCK, n)
+        segment = values[first - period + 1:last]
+        offset = segment[0]
+        segment = segment - offset
+        index = np.arange(len(segment), dtype=np.float64)
+        sums = np.concatenate(([0.0], np.cumsum(segment)))
+        weighted = np.concatenate(([0.0], np.cumsum(index * segment)))
+        start = np.arange(last - first)  # window start within the segment
+        window_sum = sums[start + period] - sums[start]
+        numerator = weighted[start + period] - weighted[start] - (start - 1) * window_sum
+        out[first:last] = numerator / denominator + offset
+    return out
+
+
+def ema(values, period):
+    values = _values(values)
+    _check(period)
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        smoothed = np.empty(len(values))
+        smoothed[0] = values[0]
+        smoothed[1:] = _smooth(values[1:], 2.0 / (period + 1), values[0])
+        out[period - 1:] = smoothed[period - 1:]
+    return out
+
+
+def hma(values, period):
+    values = _values(values)
+    _check(period)
+    half, root = max(1, period // 2), max(1, int(math.sqrt(period)))
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        raw = 2.0 * wma(values, half) - wma(values, period)
+        out[period - 1:] = wma(raw[period - 1:], root)
+    return out
+
+
+def true_range(high, low, close):
+    """High-low range widened to the previous close; NaN for the first bar, which has none."""
+    high, low, close = _values(high), _values(low), _values(close)
+    tr = np.full(len(close), np.nan)
+    if len(close) > 1:
+        previous = close[:-1]
+        tr[1:] = np.maximum(high[1:] - low[1:], np.maximum(np.abs(high[1:] - previous), np.abs(low[1:] - previous)))
+    return tr
+
+
+def atr(high, low, close, period=14):
+    _check(period)
+    tr = true_range(high, low, close)
+    out = np.full(len(tr), np.nan)
+    if len(tr) > period:
+        seed = tr[1:period + 1].mean()
+        out[period] = seed
+        out[period + 1:] = _smooth(tr[period + 1:], 1.0 / period, seed)
+    return out
+
+
+def _smooth(values, alpha, seed):
+    """
+    y[t] = (1 - alpha) * y[t-1] + alpha * values[t] from y[-1] = seed.
+
+    Solved per block as a scaled cumulative sum. The block length keeps
+    (1 - alpha) ** -block below 2**60, far from overflow; the relative error
+    stays near float rounding / alpha whatever the block length.
+    """
+    decay = 1.0 - alpha
+    out = np.empty(len(values))
+    if decay <= 0.0:
+        out[:] = values
+        return out
+    block = max(1, min(BLOCK, int(60 * math.log(2) / -math.log(decay))))
+    powers = decay ** np.arange(block + 1)
+    inverse = 1.0 / powers[:block]
+    previous = seed
+    for first in range(0, len(values), block):
+        chunk = values[first:first + block]
+        k = len(chunk)
+        smoothed = powers[1:k + 1] * previous + alpha * powers[:k] * np.cumsum(chunk * inverse[:k])
+        out[first:first + k] = smoothed
+        previous = smoothed[-1]
+    return out
+
+
+def _check(period):
+    if period < 1:
+        raise ValueError("period must be at least 1.")
+
+
+class RollingMean:
+    """
+    Fixed-window simple moving average over a ring buffer.
+
+    Each update is O(1): the running sum gains the new value and loses the one
+    that drops out of the window. The sum is re-derived exactly with math.fsum
+    every time the buffer wraps, so float drift never accumulates past one window.
+    """
+
+    __slots__ = ('period', '_buffer', '_index', '_count', '_sum')
+
+    def __init__(self, period):
+        _check(period)
+        self.period = period
+        self._buffer = [0.0] * period
+        self._index = 0
+        self._count = 0
+        self._sum = 0.0
+
+    def update(self, value):
+        value = float(value)
+        self._sum += value - self._buffer[self._index]
+        self._buffer[self._index] = value
+        self._index += 1
+        if self._index == self.period:
+            self._index = 0
+            self._sum = math.fsum(self._buffer)
+        if self._count < self.period:
+            self._count += 1
+        return self.value
+
+    @property
+    def value(self):
+        if self._count < self.period:
+            return None
+        return self._sum / self.period
+
+
+class WeightedMean:
+    """
+    Linearly weighted moving average (weights 1..period, newest heaviest) over a ring buffer.
+
+    Sliding the window lowers every weight by one, so the weighted sum drops by the
+    window sum and gains period * value: O(1) per update. Both sums are recomputed
+    exactly each time the buffer wraps.
+    """
+
+    __slots__ = ('period', '_buffer', '_index', '_count', '_sum', '_weighted', '_denominator')
+
+    def __init__(self, period):
+        _check(period)
+        self.period = period
+        self._buffer = [0.0] * period
+        self._index = 0
+        self._count = 0
+        self._sum = 0.0
+        self._weighted = 0.0
+        self._denominator = period * (period + 1) / 2
+
+    def update(self, value):
+        value = float(value)
+        if self._count == self.period:
+            self._weighted += self.period * value - self._sum
+            self._sum += value - self._buffer[self._index]
+        else:
+            self._count += 1
+            self._weighted += self._count * value
+            self._sum += value
+        self._buffer[self._index] = value
+        self._index += 1
+        if self._index == self.period:
+            self._index = 0  # the buffer is now in time order, oldest first
+            self._sum = math.fsum(self._buffer)
+            self._weighted = math.fsum(weight * v for weight, v in enumerate(self._buffer, 1))
+        return self.value
+
+    @property
+    def value(self):
+        if self._count < self.period:
+            return None
+        return self._weighted / self._denominator
+
+
+class ExponentialMean:
+    """Exponential moving average with alpha = 2 / (period + 1), seeded with the first value."""
+
+    __slots__ = ('period', 'alpha', '_count', '_value')
+
+    def __init__(self, period, alpha=None):
+        _check(period)
+        self.period = period
+        self.alpha = 2.0 / (period + 1) if alpha is None else alpha
+        self._count = 0
+        self._value = None
+
+    def update(self, value):
+        value = float(value)
+        if self._value is None:
+            self._value = value
+        else:
+            self._value = (1.0 - self.alpha) * self._value + self.alpha * value
+        self._count += 1
+        return self.value
+
+    @property
+    def value(self):
+        if self._count < self.period:
+            return None
+        return self._value
+
+
+class HullMean:
+    """Hull moving average: WMA over sqrt(period) of 2 * WMA(period / 2) - WMA(period)."""
+
+    __slots__ = ('period', '_half', '_full', '_smooth')
+
+    def __init__(self, period):
+        _check(period)
+        self.period = period
+        self._half = WeightedMean(max(1, period // 2))
+        self._full = WeightedMean(period)
+        self._smooth = WeightedMean(max(1, int(math.sqrt(period))))
+
+    def update(self, value):
+        half = self._half.update(value)
+        full = self._full.update(value)
+        if full is None:
+            return None
+        return self._smooth.update(2.0 * half - full)
+
+    @property
+    def value(self):
+        return self._smooth.value
+
+
+class AverageTrueRange:
+    """Wilder's average true range, updated with each bar's high, low and close."""
+
+    __slots__ = ('period', '_previous_close', '_seed', '_count', '_value')
+
+    def __init__(self, period=14):
+        _check(period)
+        self.period = period
+        self._previous_close = None
+        self._seed = []
+        self._count = 0
+        self._value = None
+
+    def update(self, high, low, close):
+        high, low, close = float(high), float(low), float(close)
+        previous, self._previous_close = self._previous_close, close
+        if previous is None:
+            return None
+        tr = max(high - low, abs(high - previous), abs(low - previous))
+        if self._value is None:
+            self._seed.append(tr)
+            if len(self._seed) == self.period:
+                self._value = sum(self._seed) / self.period
+                self._seed = None
+        else:
+            alpha = 1.0 / self.period
+            self._value = (1.0 - alpha) * self._value + alpha * tr
+        return self._value
+
+    @property
+    def value(self):
+        return self._value
+
+
+MOVING_AVERAGES = {
+    'sma': (sma, RollingMean),
+    'ema': (ema, ExponentialMean),
+    'wma': (wma, WeightedMean),
+    'hma': (hma, HullMean),
+}
+
+
+def _kernel(name):
+    try:
+        return MOVING_AVERAGES[name.lower()]
+    except (KeyError, AttributeError):
+        raise ValueError(f"Unknown moving average '{name}', expected one of {', '.join(MOVING_AVERAGES)}.") from None
+
+
+def moving_average(name, values, period):
+    """Batch moving average `name` ('sma', 'ema', 'wma' or 'hma') of `values`."""
+    return _kernel(name)[0](values, period)
+
+
+def streaming(name, period):
+    """Streaming moving average `name`; update(value) returns the current value or None."""
+    return _kernel(name)[1](period)
+
+
+def shifted(values):
+    """`values` moved one bar later (NaN first), like pandas .shift()."""
+    values = _values(values)
+    return np.concatenate(([np.nan], values[:-1])) if len(values) else values
@@ -1,35 +1,98 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
 import datetime
 import os
 import numpy as np
 
+from advisor.Backtest import EventBacktester
+from advisor.database import SignalLog
+from advisor.MovingAverage import Kernels
+from advisor.Metrics.Registry import timed_method
+
+SL_DISTANCE = 0.003
+TP_DISTANCE = 0.01
+
+
+def entry_threshold(symbol, pip_size=None):
+    """
+    Maximum distance between close and Fast_MA for an entry: 50 pips × pip size.
+
+    :param pip_size: the symbol's pip (Trade.SymbolSpecs); without one USDJPY uses 0.01 and others 0.0001.
+    """
+    if pip_size is None:
+        pip_size = 0.01 if symbol == 'USDJPY' else 0.0001
+    return 50 * pip_size
+
+
+def entry_signals(close, fast_ma, ltf_bullish, market_bullish, matched, threshold):
+    """
+    Whole-array entry rule shared by identify_entry_levels and the parameter sweep.
+
+    Buy when HTF and LTF are both bullish and the close sits above, and within
+    `threshold` of, the fast MA; sell on the mirrored bearish condition.
+    Bars without an HTF match never signal.
+
+    :return: (buy, sell, out_of_range) boolean arrays.
+    """
+    range_value = np.abs(close - fast_ma)
+    in_range = matched & (range_value <= threshold)
+    out_of_range = matched & ~(range_value <= threshold)
+    buy = in_range & market_bullish & ltf_bullish & (close > fast_ma)
+    sell = in_range & ~market_bullish & ~ltf_bullish & (close < fast_ma)
+    return buy, sell, out_of_range
+
+
 class MovingAverageCrossover:
 
-    def __init__(self,  symbol, data, fast_period=50, slow_period=150):
+    def __init__(self,  symbol, data, fast_period=50, slow_period=150, pip_size=None, signal_log=None,
+                 ma_type='sma', atr_period=14, sl_atr=None, tp_atr=None):
         """
         Initialize the strategy with data and parameters.
         
         :param data: DataFrame containing historical data (must include 'close').
         :param fast_period: Period for the fast-moving average.
         :param slow_period: Period for the slow-moving average.
+        :param pip_size: the symbol's pip size for the entry threshold, see entry_threshold.
+        :param signal_log: optional database.SignalLog that run_moving_average_strategy appends to
+                           instead of the per-symbol CSV.
+        :param ma_type: moving average for both periods: 'sma', 'ema', 'wma' or 'hma' (see Kernels).
+        :param atr_period: ATR period used by sl_atr/tp_atr.
+        :param sl_atr: stop-loss distance as a multiple of the ATR; SL_DISTANCE when None.
+        :param tp_atr: take-profit distance as a multiple of the ATR; TP_DISTANCE when None.
         """
+        if str(ma_type).lower() not in Kernels.MOVING_AVERAGES:
+            raise ValueError(f"Unknown moving average '{ma_type}', expected one of {', '.join(Kernels.MOVING_AVERAGES)}.")
         ltf_data = data
         self.entries = None
         self.fast_period = fast_period
         self.slow_period = slow_period
         self.signals = None
         self.results = None
+        self.trade_results = None
         self.symbol = symbol
+        self.pip_size = pip_size
+        self.signal_log = signal_log
+        self.ma_type = ma_type
+        self.atr_period = atr_period
+        self.sl_atr = sl_atr
+        self.tp_atr = tp_atr
 
-    def calculate_moving_averages(self, data):
-        """Calculate the fast and slow moving averages."""
+    @timed_method("calculate_moving_averages")
+    def calculate_moving_averages(self, data, timeframe=None):
+        """
+        Calculate the fast and slow moving averages.
+
+        :param timeframe: optional timeframe name, used only to label the stage metrics.
+        """
         if 'close' not in data.columns:
             raise ValueError("'close' column is missing in the data.")
   
-        data['Fast_MA'] = data['close'].rolling(window=self.fast_period).mean().shift()
-        data['Slow_MA'] = data['close'].rolling(window=self.slow_period).mean().shift()
+        close = data['close'].to_numpy(dtype=float)
+        data['Fast_MA'] = Kernels.shifted(Kernels.moving_average(self.ma_type, close, self.fast_period))
+        data['Slow_MA'] = Kernels.shifted(Kernels.moving_average(self.ma_type, close, self.slow_period))
+        if self.sl_atr is not None or self.tp_atr is not None:
+            if 'high' not in data.columns or 'low' not in data.columns:
+                raise ValueError("'high' and 'low' columns are required for ATR levels.")
+            data['ATR'] = Kernels.shifted(Kernels.atr(data['high'], data['low'], close, self.atr_period))
         data['Signal'] = np.where(data['Fast_MA'] > data['Slow_MA'], 1, 
                           np.where(data['Fast_MA'] < data['Slow_MA'], -1, 0))
   
@@ -41,7 +104,8 @@ class MovingAverageCrossover:
         print(f'MA Data Available for {self.symbol}')
         return self.data	
 
-    def identify_entry_levels(self, HTS_data: pd.DataFrame, LTS_data: pd.DataFrame):
+    @timed_method("identify_entry_levels")
+    def identify_entry_levels(self, HTS_data: pd.DataFrame, LTS_data: pd.DataFrame, timeframe=None):
         """
         _summary_
         Identify entry levels (buy and sell) based on crossovers.
@@ -54,54 +118,52 @@ class MovingAverageCrossover:
         if 'Bias' not in HTS_data.columns or 'Bias' not in LTS_data.columns:
             raise ValueError("'Bias' column is missing in the data.")   
         
-        # Define constants outside the loop
-        sl_distance = 0.003
-        tp_distance = 0.01
-        threshold = 50 * 0.01 if self.symbol == 'USDJPY' else 0.0050  # 50 pips × pip size
-
-        for i in range(len(LTS_data)):
-            row = LTS_data.iloc[i]
-            ltf_time = pd.to_datetime(row['time'])
-
-            # Match HTF row
-            htf_match = HTS_data[HTS_data['time'] <= ltf_time]
-            if htf_match.empty:
-                continue
-
-            htf_row = htf_match.iloc[-1]
-            market_bias = htf_row['Bias']
-            ltf_bias = row['Bias']
-            
-            # Derive LTF label
-            ltf_Bias_label = "Buy" if ltf_bias == 'Bullish' else "Sell"
-
-            # Calculate Range
-            range_value = abs(row['close'] - row['Fast_MA'])
-
-            # Set columns cleanly
-            LTS_data.loc[i, 'Market_bias'] = market_bias
-            LTS_data.loc[i, 'ltf_bias'] = ltf_bias
-            LTS_data.loc[i, 'Range'] = range_value
-
-            if range_value <= threshold:
-                if market_bias == 'Bullish' and ltf_Bias_label == 'Buy' and row['close'] > row['Fast_MA']:
-                    LTS_data.loc[i, 'Entry'] = 'Buy'
-                    LTS_data.loc[i, 'Level'] = row['close']
-                    LTS_data.loc[i, 'SL'] = row['close'] - sl_distance
-                    LTS_data.loc[i, 'TP'] = row['close'] + tp_distance
-
-                elif market_bias == 'Bearish' and ltf_Bias_label == 'Sell' and row['close'] < row['Fast_MA']:
-                    LTS_data.loc[i, 'Entry'] = 'Sell'
-                    LTS_data.loc[i, 'Level'] = row['close']
-                    LTS_data.loc[i, 'SL'] = row['close'] + sl_distance
-                    LTS_data.loc[i, 'TP'] = row['close'] - tp_distance
+        sl_distance = self._level_distance(LTS_data, self.sl_atr, SL_DISTANCE)
+        tp_distance = self._level_distance(LTS_data, self.tp_atr, TP_DISTANCE)
+        threshold = entry_threshold(self.symbol, self.pip_size)
 
-            else:
-                LTS_data.loc[i, 'Entry'] = None
-                LTS_data.loc[i, 'Level'] = None
-                LTS_data.loc[i, 'SL'] = None
-                LTS_data.loc[i, 'TP'] = None
+        # Align the latest HTF bias onto every LTF bar with a single as-of join
+        ltf_time, htf_time = LTS_data['time'], HTS_data['time']
+        if not (pd.api.types.is_numeric_dtype(ltf_time) and pd.api.types.is_numeric_dtype(htf_time)):
+            ltf_time, htf_time = pd.to_datetime(ltf_time), pd.to_datetime(htf_time)
+        ltf_keys = pd.DataFrame({'time': ltf_time.to_numpy(), '_pos': np.arange(len(LTS_data))})
+        htf_keys = pd.DataFrame({'time': htf_time.to_numpy(), 'Market_bias': HTS_data['Bias'].to_numpy()})
+        aligned = pd.merge_asof(
+            ltf_keys.sort_values('time', kind='stable'),
+            htf_keys.sort_values('time', kind='stable'),
+            on='time', direction='backward', allow_exact_matches=True,
+        ).sort_values('_pos', kind='stable')
 
+        market_bias = aligned['Market_bias'].to_numpy(dtype=object)
+        matched = aligned['Market_bias'].notna().to_numpy()
+        if not matched.any():
+            print("Entry levels identified.")
+            return LTS_data.drop(columns=['tick_volume', 'real_volume', 'spread', 'Signal'])
+
+        close = LTS_data['close'].to_numpy(dtype=float)
+        fast_ma = LTS_data['Fast_MA'].to_numpy(dtype=float)
+        ltf_bias = LTS_data['Bias'].to_numpy(dtype=object)
+        range_value = np.abs(close - fast_ma)
+
+        buy, sell, out_of_range = entry_signals(
+            close, fast_ma, ltf_bias == 'Bullish', market_bias == 'Bullish', matched, threshold)
+
+        # Set columns as whole-column operations; unmatched bars stay empty
+        LTS_data['Market_bias'] = np.where(matched, market_bias, np.nan)
+        LTS_data['ltf_bias'] = np.where(matched, ltf_bias, np.nan)
+        LTS_data['Range'] = np.where(matched, range_value, np.nan)
+
+        if buy.any() or sell.any() or out_of_range.any():
+            entry = np.full(len(LTS_data), np.nan, dtype=object)
+            entry[out_of_range] = None
+            entry[buy] = 'Buy'
+            entry[sell] = 'Sell'
+            signal = buy | sell
+            direction = np.where(buy, 1.0, -1.0)
+            LTS_data['Entry'] = entry
+            LTS_data['Level'] = np.where(signal, close, np.nan)
+            LTS_data['SL'] = np.where(signal, close - direction * sl_distance, np.nan)
+            LTS_data['TP'] = np.where(signal, close + direction * tp_distance, np.nan)
 
         # Clean up bad columns created by tuple headers (from Excel maybe?)
         cleaned_data = LTS_data.drop(columns=['tick_volume', 'real_volume', 'spread', 'Signal'])
@@ -110,43 +172,82 @@ class MovingAverageCrossover:
         print("Entry levels identified.")
             
         return cleaned_data
+
+    def _level_distance(self, data, multiple, fixed):
+        """SL/TP distance per bar: `multiple` × ATR when configured, otherwise the fixed distance."""
+        if multiple is None:
+            return fixed
+        if 'ATR' not in data.columns:
+            raise ValueError("'ATR' column is missing in the data.")
+        return multiple * data['ATR'].to_numpy(dtype=float)
     
 
     def save_signals_to_csv(self, data, file_name="src/main/python/advisor/Logs/Rates"):
         """
         Save identified entry levels to a CSV file.
         - Creates the file if it doesn't exist.
-        - Appends to the file if it already exists.
+        - Appends only the rows newer than the file's last time, so repeated
+          runs over an overlapping window never duplicate rows.
         """
-  
         if data is not None:
             file_exists = os.path.isfile(file_name)
+            written = SignalLog.append_csv(file_name, data)
             if not file_exists:
-                data.to_csv(file_name, index=False, mode='w')
                 print(f"New file created and entry levels saved to {file_name}.")
             else:
-                data.to_csv(file_name, index=False, mode='a', header=False)
-                print(f"Entry levels appended to existing file {file_name}.")
+                print(f"{written} new entry levels appended to existing file {file_name}.")
         else:
                 print("No signals to save. Please run 'identify_entry_levels()' first.")
 
-    def backtest_strategy(self):
-        """Backtest the strategy by calculating strategy returns."""
+    def backtest_strategy(self, data=None):
+        """
+        Backtest the strategy by calculating strategy returns.
+
+        :param data: output of identify_entry_levels (defaults to self.data); Entry
+                     'Buy'/'Sell' become positions of +1/-1 on the following bar.
+        """
+        if data is not None:
+            self.data = data
+        if 'Entry' not in self.data.columns:
+            raise ValueError("'Entry' column is missing in the data. Run identify_entry_levels() first.")
 
-        self.data['Position'] = self.data['Entry'].shift(1)  # Avoid lookahead bias
+        entry = self.data['Entry'].to_numpy(dtype=object)
+        position = np.where(entry == 'Buy', 1.0, np.where(entry == 'Sell', -1.0, 0.0))
+        self.data['Position'] = pd.Series(position, index=self.data.index).shift(1)  # Avoid lookahead bias
         self.data['Market_Returns'] = self.data['close'].pct_change()
         self.data['Strategy_Returns'] = self.data['Market_Returns'] * self.data['Position']
         self.data['Cumulative_Market_Returns'] = (1 + self.data['Market_Returns']).cumprod()
         self.data['Cumulative_Strategy_Returns'] = (1 + self.data['Strategy_Returns']).cumprod()
-        self.results = self.data.dropna().copy() 
+        self.results = self.data.dropna(subset=['Position', 'Market_Returns']).copy()
         print("Backtest completed.")
         return self.results
 
+    def backtest_trades(self, ltf_data, **kwargs):
+        """
+        Backtest the Entry/Level/SL/TP levels from identify_entry_levels with the
+        event-driven engine, resolving exits against each bar's high and low.
+
+        :return: BacktestResult with the trade list and equity curve.
+        """
+        for column in ('open', 'high', 'low', 'close', 'Entry', 'Level', 'SL', 'TP'):
+            if column not in ltf_data.columns:
+                raise ValueError(f"'{column}' column is missing in the data. Run identify_entry_levels() first.")
+
+        entry = ltf_data['Entry'].to_numpy(dtype=object)
+        direction = np.where(entry == 'Buy', 1, np.where(entry == 'Sell', -1, 0))
+        self.trade_results = EventBacktester.run_backtest(
+            ltf_data['open'].to_numpy(), ltf_data['high'].to_numpy(), ltf_data['low'].to_numpy(),
+            ltf_data['close'].to_numpy(), direction, ltf_data['Level'].to_numpy(dtype=float),
+            ltf_data['SL'].to_numpy(dtype=float), ltf_data['TP'].to_numpy(dtype=float), **kwargs)
+        print(f"Event backtest completed: {len(self.trade_results.trades)} trades.")
+        return self.trade_results
+
     def plot_performance(self):
         """Visualize the strategy performance against market performance."""
         if self.results is None:
                 raise ValueError("No results available. Run backtest_strategy() first.")
-        
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=(12, 6))
         plt.plot(self.results.index, self.results['Cumulative_Market_Returns'], label='Market Returns', color='blue')
         plt.plot(self.results.index, self.results['Cumulative_Strategy_Returns'], label='Strategy Returns', color='green')
@@ -154,77 +255,30 @@ class MovingAverageCrossover:
         plt.legend()
         plt.show()
             
-    def plot_charts(self, ltf_data):
+    def plot_charts(self, ltf_data, path=None):
+        """
+        Chart close, MAs, entries and their SL/TP levels (see Backtest.Charts).
+
+        :param path: write the chart off-screen to this .png/.svg file and return the path;
+                     without it the chart opens in a pyplot window.
+        """
         if 'Entry' not in ltf_data.columns:
             raise ValueError("Error: 'Entry' column is missing in `ltf_data`. Check data processing.")
         if 'close' not in ltf_data.columns or ltf_data['close'].empty:
             raise ValueError("No Close data available")
+        from advisor.Backtest import Charts
 
-        # Ensure both datasets use datetime index for consistency
-        if not isinstance(self.data.index, pd.DatetimeIndex):
-            self.data.index = pd.to_datetime(self.data.index)
+        ltf_data = ltf_data.assign(time=pd.to_datetime(ltf_data['time'])).sort_values(by='time')
+        if path is not None:
+            return Charts.render_entries(self.symbol, ltf_data, path, fast_period=self.fast_period,
+                                         slow_period=self.slow_period, size=(18, 6))
 
-        ax = plt.subplots(figsize=(18, 6))
+        import matplotlib.pyplot as plt
 
-        # Plot market data (uses self.data.index)
-        # Ensure time column is in datetime format and sorted
-        ltf_data['time'] = pd.to_datetime(ltf_data['time'])
-        ltf_data = ltf_data.sort_values(by='time')
+        fig = plt.figure(figsize=(18, 6), layout='tight')
+        Charts.draw_entries(fig, self.symbol, ltf_data, fast_period=self.fast_period, slow_period=self.slow_period)
+        plt.show()
 
-        # Set time as x-axis ticks properly
-        ax.plot(ltf_data['time'], ltf_data['close'], label="Close", color='black')
-        ax.plot(ltf_data['time'], ltf_data['Fast_MA'], label=f"Fast MA ({self.fast_period})", color='blue')
-        ax.plot(ltf_data['time'], ltf_data['Slow_MA'], label=f"Slow MA ({self.slow_period})", color='red')
-        
-        ax.fill_between(ltf_data['time'], ltf_data['Fast_MA'], ltf_data['Slow_MA'], where=(ltf_data['Fast_MA'] > ltf_data['Slow_MA']), color='green', alpha=0.3, label='Bullish Zone')
-        ax.fill_between(ltf_data['time'], ltf_data['Fast_MA'], ltf_data['Slow_MA'], where=(ltf_data['Fast_MA'] < ltf_data['Slow_MA']), color='red', alpha=0.3, label='Bearish Zone')
-        ax.fill_between(ltf_data['time'], ltf_data['Fast_MA'], ltf_data['close'], where=(ltf_data['Fast_MA'] - ltf_data['close'] <= 0.005), color='orange', alpha=0.3, label='Range')
-
-        # Plot Buy signals
-        buy_signals = ltf_data[ltf_data['Entry'] == 'Buy']
-        if not buy_signals.empty:
-            for i in buy_signals.index:
-                time = buy_signals.loc[i, 'time']
-                tp = buy_signals.loc[i, 'TP']
-                sl = buy_signals.loc[i, 'SL']
-                ax.scatter(time, buy_signals.loc[i, 'Level'], marker='^', color='green', label='Buy Signal' if i == buy_signals.index[0] else "")
-                # Draw short horizontal lines (1-minute window or so)
-                ax.hlines(y=tp, xmin=time - pd.Timedelta(minutes=1), xmax=time + pd.Timedelta(minutes=1),
-                        color='green', linestyles='--', label='TP' if i == buy_signals.index[0] else "")
-                
-                ax.hlines(y=sl, xmin=time - pd.Timedelta(minutes=1), xmax=time + pd.Timedelta(minutes=1),
-                        color='red', linestyles='--', label='SL' if i == buy_signals.index[0] else "")
-        # Plot Sell signals
-        sell_signals = ltf_data[ltf_data['Entry'] == 'Sell']
-        if not sell_signals.empty:
-            for i in sell_signals.index:
-                time = sell_signals.loc[i, 'time']
-                tp = sell_signals.loc[i, 'TP']
-                sl = sell_signals.loc[i, 'SL']
-                
-                ax.scatter(time, sell_signals.loc[i, 'Level'], marker='v', color='red', label='Sell Signal' if i == sell_signals.index[0] else "")
-                
-                # Draw short horizontal lines (1-minute window or so)
-                ax.hlines(y=tp, xmin=time - pd.Timedelta(minutes=1), xmax=time + pd.Timedelta(minutes=1),
-                        color='green', linestyles='--', label='TP' if i == sell_signals.index[0] else "")
-                
-                ax.hlines(y=sl, xmin=time - pd.Timedelta(minutes=1), xmax=time + pd.Timedelta(minutes=1),
-                        color='red', linestyles='--', label='SL' if i == sell_signals.index[0] else "")
-
-        ax.set_xticks(ltf_data['time'][::max(1, len(ltf_data) // 10)])  # show ~10 evenly spaced labels
-        ax.tick_params(axis='x', rotation=45)
-
-        plt.title(f"{self.symbol}-Moving Average Entry Signals")
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-        ax.xaxis.set_major_locator(mdates.AutoDateLocator())
-        plt.xticks(rotation=45)
-        plt.xlabel("Time")
-        plt.ylabel("Price")
-        plt.legend()
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()    
-    
     def run_moving_average_strategy(self, symbol, data, MA: 'MovingAverageCrossover'):
         """
         Fetch rates data and apply the Moving Average Crossover strategy.
@@ -243,7 +297,10 @@ class MovingAverageCrossover:
             return None
         
         ltf_data = self.identify_entry_levels(ltf_data, htf_data)
-        self.save_signals_to_csv(file_name=f"src/main/python/Advisor/Logs/{self.symbol}_entry_levels.csv", data=ltf_data)
+        if self.signal_log is not None:
+            self.signal_log.append(self.symbol, ltf_data)
+        else:
+            self.save_signals_to_csv(file_name=f"src/main/python/Advisor/Logs/{self.symbol}_entry_levels.csv", data=ltf_data)
         
         # results = self.backtest_strategy()
 
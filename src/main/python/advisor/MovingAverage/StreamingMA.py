@@ -0,0 +1,136 @@
+import threading
+
+import numpy as np
+
+from advisor.Client import Timeframes
+from advisor.MovingAverage import Kernels
+from advisor.MovingAverage.Kernels import RollingMean  # noqa: F401  re-exported for existing callers
+
+
+class StreamingMovingAverages:
+    """
+    Incremental equivalent of MovingAverageCrossover.calculate_moving_averages.
+
+    Only closed bars are ingested. Because the pandas path shifts the rolling
+    means by one bar, the Fast_MA/Slow_MA reported for the still-forming bar
+    are the means of the last `period` closed bars, which is exactly what the
+    ring buffers hold. `ma_type` picks any Kernels moving average ('sma', 'ema',
+    'wma', 'hma').
+    """
+
+    def __init__(self, fast_period=50, slow_period=150, ma_type='sma'):
+        self.fast = Kernels.streaming(ma_type, fast_period)
+        self.slow = Kernels.streaming(ma_type, slow_period)
+        self.last_time = None
+        self._signal = None
+        self._previous_signal = None
+
+    @property
+    def ready(self):
+        return self.slow.value is not None and self.fast.value is not None
+
+    def update(self, bar_time, close):
+        """Ingest one closed bar. Bars at or before the last seen time are ignored."""
+        if self.last_time is not None and bar_time <= self.last_time:
+            return False
+        self._previous_signal = self._signal
+        self.fast.update(close)
+        self.slow.update(close)
+        self._signal = self._signal_for(self.fast.value, self.slow.value)
+        self.last_time = bar_time
+        return True
+
+    def seed(self, times, closes):
+        """Ingest a block of closed history, returning the number of new bars."""
+        added = 0
+        for bar_time, close in zip(times, closes):
+            added += self.update(bar_time, close)
+        return added
+
+    def latest(self, bar_time=None, close=None):
+        """
+        Snapshot for the forming bar, keyed like a calculate_moving_averages row.
+        Returns None until the slow window is full.
+        """
+        if not self.ready:
+            return None
+        fast_ma, slow_ma = self.fast.value, self.slow.value
+        crossover = np.nan if self._previous_signal is None else float(self._signal - self._previous_signal)
+        return {
+            'time': bar_time,
+            'close': close,
+            'Fast_MA': fast_ma,
+            'Slow_MA': slow_ma,
+            'Signal': self._signal,
+            'Crossover': crossover,
+            'Bias': "Bullish" if fast_ma > slow_ma else "Bearish",
+        }
+
+    @staticmethod
+    def _signal_for(fast_ma, slow_ma):
+        if fast_ma is None or slow_ma is None:
+            return 0
+        return 1 if fast_ma > slow_ma else -1 if fast_ma < slow_ma else 0
+
+
+class IndicatorEngine:
+    """
+    Per-symbol/per-timeframe registry of streaming moving averages for the live workers.
+
+    Feed it the same rates the worker already fetched (newest bar last, still forming);
+    the first call seeds the indicator from history and later calls only ingest bars
+    closed since the previous call.
+    """
+
+    def __init__(self, fast_period=50, slow_period=150, ma_type='sma'):
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.ma_type = ma_type
+        self._indicators = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol, timeframe):
+        key = (symbol, timeframe)
+        indicator = self._indicators.get(key)
+        if indicator is None:
+            with self._lock:
+                indicator = self._indicators.setdefault(
+                    key, StreamingMovingAverages(self.fast_period, self.slow_period, self.ma_type))
+        return indicator
+
+    def update(self, symbol, timeframe, rates):
+        """
+        Ingest newly closed bars from `rates` and return the latest snapshot.
+
+        :param rates: DataFrame or MT5 structured array with 'time' and 'close'.
+        """
+        if rates is None or len(rates) == 0:
+            return None
+        times = Timeframes.epoch_seconds(rates['time'])
+        closes = np.asarray(rates['close'], dtype=float)
+
+        indicator = self.get(symbol, timeframe)
+        closed = len(times) - 1
+        if indicator.last_time is not None and times[0] > indicator.last_time:
+            # Bars were missed between calls, the window can no longer be trusted
+            indicator = self._reseed(symbol, timeframe)
+        start = 0
+        if indicator.last_time is not None:
+            start = int(np.searchsorted(times[:closed], indicator.last_time, side='right'))
+        indicator.seed(times[start:closed].tolist(), closes[start:closed].tolist())
+        return indicator.latest(times[-1], closes[-1])
+
+    def _reseed(self, symbol, timeframe):
+        with self._lock:
+            indicator = StreamingMovingAverages(self.fast_period, self.slow_period, self.ma_type)
+            self._indicators[(symbol, timeframe)] = indicator
+        return indicator
+
+    def reset(self, symbol=None):
+        with self._lock:
+            if symbol is None:
+                self._indicators.clear()
+            else:
+                for key in [k for k in self._indicators if k[0] == symbol]:
+                    del self._indicators[key]
+
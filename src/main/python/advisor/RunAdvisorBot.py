@@ -1,138 +1,173 @@
-import time
+import argparse
+import os
+import signal
 import sys
-import threading, queue
+import threading
+import multiprocessing
 
 from advisor.Client import Advisor as Advisor
-from advisor.MovingAverage import MovingAverage as MA
-from advisor.Trade import TradesAlgo as algorithim
-from advisor.GUI import userInput as gui
-from advisor.Telegram import Messanger
+from advisor.Client import Backend, Session, UserConfig
+from advisor.Backtest import BatchBacktest
+from advisor.MovingAverage import StreamingMA
+from advisor.Trade import Evaluator
+from advisor.Scheduler import BarScheduler, WorkerPool
+from advisor.Metrics import Exporter as metrics
 
 
 class RunAdvisorBot:
-    def __init__(self):
+    def __init__(self, max_workers=5, task_timeout=120.0, headless=False, user_data=None, messenger=None):
+        """
+        :param headless: run without the Tk setup form and log window; `user_data` must then be given
+                         (see Client.UserConfig) and logs stay on stdout.
+        :param messenger: anything with send_message()/close(); defaults to the Telegram bot.
+        """
         self.symbols = None
         self.init = None
-        self.gui = gui.UserGUI()
-        
-        self.log_window = gui.LogWindow(None)
-        sys.stdout = self.log_window.redirector
-        sys.stderr = self.log_window.redirector
-        # self.gui.user_data = self.gui.user_data
-        self.symbol_queue = queue.Queue()
-        self.client = Advisor.MetaTrader5Client()
-        self.telegram = Messanger.TelegramMessenger()
-        self.telegram.run_bot_async()  # Start the Telegram bot in a separate thread
-
-    def backtest(self, symbols: list):
-        client = Advisor.MetaTrader5Client()
-        client.initialize(self.gui.user_data)
-        for symbol in symbols:
-            data = client.get_rates_range(symbol)
-            
-            htf_strategy = MA.MovingAverageCrossover(symbol, data=data["HTF"])
-            ltf_strategy = MA.MovingAverageCrossover(symbol, data=data["LTF"])
-            
-            HTF_data = htf_strategy.calculate_moving_averages(data["HTF"])
-            LTF_data = ltf_strategy.calculate_moving_averages(data["LTF"])
-            
-            data = {'HTF': HTF_data, 'LTF': LTF_data}
-            ltf_strategy.run_moving_average_strategy(symbol, data, ltf_strategy)
+        self.headless = headless
+        self.user_data = user_data
+        self.gui = None
+        if not headless:
+            # tkinter loads here, not at import, so backtest worker processes
+            # (which import this module as __main__) and the headless service start without it
+            from advisor.GUI import userInput as gui
+
+            self.gui = gui.UserGUI()
+            self.log_window = gui.LogWindow(None)
+            sys.stdout = self.log_window.redirector
+            sys.stderr = self.log_window.redirector
+        self.client = Advisor.MetaTrader5Client(dialogs=not headless)
+        self.indicators = StreamingMA.IndicatorEngine()
+        self.scheduler = BarScheduler.BarCloseScheduler(self.client.TF, grace=5.0)
+        self.stop_event = threading.Event()
+        self.pool = WorkerPool.WorkerPool(max_workers=max_workers, task_timeout=task_timeout)
+        if messenger is None:
+            from advisor.Telegram import Messanger
+
+            messenger = Messanger.TelegramMessenger()
+            messenger.run_bot_async()  # Start the Telegram bot in a separate thread
+        self.telegram = messenger
+        self.evaluator = Evaluator.SymbolEvaluator(self.client, self.indicators, self.telegram)
+
+    def backtest(self, symbols: list, processes=None, chart_dir=None, signal_dir="src/main/python/Advisor/Logs"):
+        """
+        Headless batch backtest: fetch all history once, backtest symbols in parallel
+        worker processes and return one aggregated report. Charts are rendered
+        off-screen into `chart_dir` when given; entry levels go to
+        `signal_dir`/<symbol>_entry_levels.csv (None skips them).
+        """
+        # Reuses the live client; initialize() is a no-op when the session is already logged in
+        self.client.initialize(self.user_data)
+        report, trades = BatchBacktest.run_batch_backtest(self.client, symbols, processes=processes, chart_dir=chart_dir,
+                                                         signal_dir=signal_dir)
+        print(report.to_string(index=False))
+        return report, trades
+
+    def evaluate_symbol(self, symbol):
+        """Run one evaluation cycle for `symbol`; scheduled as a short task on the worker pool."""
+        return self.evaluator.evaluate(symbol)
 
     def worker(self):
-        while not self.symbol_queue.empty():
-            symbol = self.symbol_queue.get()
+        """Evaluate every symbol on the bounded pool, then wait for the next LTF bar close."""
+        while self.init and not self.stop_event.is_set():
+            self.pool.run_round(self.symbols, self.evaluate_symbol)
+
+            print('🛌 Workers sleeping until the next LTF bar closes....')
+            if self.scheduler.wait_for_close("LTF", self.stop_event) is None:
+                break
+
+    def stop(self, signum=None, frame=None):
+        """Ask the worker loop to finish its round and exit; installed as the SIGTERM/SIGINT handler."""
+        print(f"🛑 Stop requested{f' by signal {signum}' if signum else ''}, finishing the current round...")
+        self.stop_event.set()
+
+    def start_metrics(self):
+        """
+        Serve stage metrics on 127.0.0.1:$ADVISOR_METRICS_PORT (default 9108; 0 disables the
+        endpoint) and snapshot them to ~/Documents/TradingBotLogs/metrics.json every minute.
+        """
+        metrics_server = None
+        port = int(os.getenv("ADVISOR_METRICS_PORT", "9108"))
+        if port:
             try:
-                print(f'✅ Thread started for {symbol}...')
-                while self.init:
-                    data = self.client.get_multi_tf_data(symbol)
-                    if data is None:
-                        print(f'❌error: No data returned for {symbol}. Retrying in 10 seconds...')
-                        time.sleep(10)
-                        continue
-
-                    if "HTF" not in data or "LTF" not in data:
-                        print(f'⚠️ error :Missing timeframes for {symbol}. Skipping...')
-                        break
-
-                    htf_strategy = MA.MovingAverageCrossover(symbol, data=data["HTF"])
-                    ltf_strategy = MA.MovingAverageCrossover(symbol, data=data["LTF"])
-
-                    HTF_data = htf_strategy.calculate_moving_averages(data["HTF"])
-                    LTF_data = ltf_strategy.calculate_moving_averages(data["LTF"])
-
-                    if "Fast_MA" not in LTF_data.columns or "Slow_MA" not in LTF_data.columns:
-                        print(f'❌ Missing MA columns in LTF data for {symbol}')
-                        break
-
-                    if HTF_data is None or LTF_data is None:
-                        print(f'⚠️ Moving averages not calculated for {symbol}. Skipping...')
-                        time.sleep(10)
-                        continue
-
-                    htf_latest = HTF_data.iloc[-1]
-                    ltf_latest = LTF_data.iloc[-1]
-                    current_price = ltf_latest['close']
-
-                    market_Bias = "Bullish" if htf_latest['Fast_MA'] > htf_latest['Slow_MA'] else "Bearish"
-                    ltf_Bias = "Buy" if ltf_latest["Fast_MA"] > ltf_latest['Slow_MA'] else "Sell"
-
-                    trade = algorithim.MT5TradingAlgorithm(symbol, self.telegram, self.gui.user_data)
-                    trade.run_Trades(market_Bias, ltf_Bias, ltf_latest, current_price, self.client.THRESHOLD, symbol)
-
-                    print(f'🛌 {symbol} Thread sleeping for 15 minutes....')
-                    time.sleep(900)  # 15 minutes
-
-            except Exception as e:
-                print(f'❌ Exception in thread {symbol}: {e}')
-
-            finally:
-                self.symbol_queue.task_done()
-                print(f'❌ Thread for {symbol} has ended.')
+                metrics_server = metrics.MetricsServer(port=port).start()
+            except OSError as e:
+                print(f"⚠️ Metrics endpoint not started on port {port}: {e}")
+        snapshot_path = os.path.join(os.path.expanduser("~"), "Documents", "TradingBotLogs", "metrics.json")
+        return metrics_server, metrics.SnapshotWriter(snapshot_path).start()
 
     def start_bot_logic(self):
-        tempClient = Advisor.MetaTrader5Client()
-    
-        res = tempClient.initialize(self.gui.user_data)
-        if not res[0]:
-            print('❌ Failed to initialize MetaTrader5. Exiting...')
-            sys.exit(1)
-
-        self.symbols = res[1]
-        tempClient.shutdown()
-        print('Marketwatch symbols:', self.symbols)
-
-        for sym in self.symbols:
-            self.symbol_queue.put(sym)
+        # One session owns the terminal: every mt5 call from the workers goes through its dispatcher
+        self.session = Session.MT5Session().start()
+        previous = Backend.use(self.session)
 
-        if not self.client.logIn(self.gui.user_data):
+        res = self.client.logIn(self.user_data)
+        if not res:
             print('❌ Login failed.')
+            self.session.close()
+            Backend.use(previous)
             return
+        self.symbols = res[1]
+        print('Marketwatch symbols:', self.symbols)
         self.init = True
-
-        print('🏃‍♂️ Running worker threads...')
-        threads = []
-        for _ in range(len(self.symbols)):  # Max 5 workers
-            t = threading.Thread(target=self.worker)
-            t.start()
-            threads.append(t)
-
-        for t in threads:
-            t.join()
-
-        print("✅ All threads completed.")
-        self.client.shutdown()
-
-
-if __name__ == "__main__":
+        self.evaluator.user_data = self.user_data
+
+        metrics_server, snapshots = self.start_metrics()
+        print(f'🏃‍♂️ Running {self.pool.max_workers} workers for {len(self.symbols)} symbols...')
+        try:
+            self.worker()
+        finally:
+            if metrics_server is not None:
+                metrics_server.stop()
+            snapshots.stop()
+            self.pool.shutdown(wait_for_tasks=False)
+            print("✅ All workers completed.")
+            self.session.close()
+            Backend.use(previous)  # a closed session would fail every later mt5 call
+            self.telegram.close()
+
+
+def run_headless(config=None, max_workers=5):
+    """
+    Service entry point: settings come from `config` (or $ADVISOR_CONFIG) and ADVISOR_* variables,
+    SIGTERM/SIGINT stop the worker loop after the current round, and tkinter is never imported.
+    """
+    user_data = UserConfig.load_user_data(config)
+    bot = RunAdvisorBot(max_workers=max_workers, headless=True, user_data=user_data)
+    signal.signal(signal.SIGTERM, bot.stop)
+    signal.signal(signal.SIGINT, bot.stop)
+    bot.start_bot_logic()
+    return bot
+
+
+def run_gui():
     bot = RunAdvisorBot()
     # bot.backtest(bot.symbols)
     def check_gui_closed():
         if bot.gui.should_run:
             print('🟢running bot......')
+            bot.user_data = bot.gui.user_data
             threading.Thread(target=bot.start_bot_logic).start()
         else:
             bot.gui.root.after(1000, check_gui_closed)
 
     check_gui_closed()
     bot.gui.root.mainloop()
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()  # backtest worker processes in the PyInstaller bundle
+    parser = argparse.ArgumentParser(description="Moving average advisor for MetaTrader 5.")
+    parser.add_argument("--headless", action="store_true",
+                        help="run as a service without the GUI (also ADVISOR_HEADLESS=1)")
+    parser.add_argument("--config", help=f"INI file with an [{UserConfig.SECTION}] section "
+                                         f"(default ${UserConfig.CONFIG_ENV}); ADVISOR_* variables override it")
+    parser.add_argument("--workers", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.headless or os.getenv("ADVISOR_HEADLESS") == "1":
+        try:
+            run_headless(args.config, max_workers=args.workers)
+        except ValueError as e:
+            sys.exit(f"❌ {e}")
+    else:
+        run_gui()
@@ -0,0 +1,101 @@
+import calendar
+import datetime
+import threading
+import time
+
+from advisor.Client import Timeframes
+
+
+class SystemClock:
+    """Real clock: wall time for bar boundaries, monotonic time for waiting."""
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds, stop_event=None):
+        if stop_event is not None:
+            return stop_event.wait(seconds)
+        time.sleep(seconds)
+        return False
+
+
+class BarCloseScheduler:
+    """
+    Central scheduler that wakes evaluations right after a bar closes.
+
+    Bar boundaries are computed on the broker's server clock (UTC + server_offset
+    seconds), so H4/D1 closes line up with the terminal's candles. Each wait turns
+    the wall-clock close into a monotonic deadline, which keeps the cadence fixed
+    no matter how long the previous cycle took and immune to wall-clock jumps.
+
+    :param timeframes: mapping of name -> MT5 timeframe, e.g. MetaTrader5Client.TF.
+    :param grace: seconds to wait after the close so the terminal has the new bar.
+    :param server_offset: broker server time minus UTC, in seconds.
+    :param clock: object with time(), monotonic() and sleep(seconds, stop_event).
+    """
+
+    def __init__(self, timeframes, grace=5.0, server_offset=0, clock=None):
+        self.timeframes = dict(timeframes)
+        self.grace = grace
+        self.server_offset = server_offset
+        self.clock = clock or SystemClock()
+
+    def next_close(self, timeframe, now=None):
+        """Wall-clock (UTC epoch) time of the next close of `timeframe` after `now`."""
+        timeframe = self.timeframes.get(timeframe, timeframe)
+        now = self.clock.time() if now is None else now
+        server_now = now + self.server_offset
+
+        if Timeframes.is_monthly(timeframe):
+            current = datetime.datetime.fromtimestamp(server_now, datetime.timezone.utc)
+            months = current.year * 12 + current.month - 1 + (timeframe & 0x3FFF)
+            year, month = divmod(months, 12)
+            close = calendar.timegm((year, month + 1, 1, 0, 0, 0))
+        else:
+            period = Timeframes.timeframe_seconds(timeframe)
+            # Weekly bars open on Sunday; the epoch started on a Thursday
+            anchor = 4 * Timeframes.DAY if period % Timeframes.WEEK == 0 else 0
+            close = ((server_now + anchor) // period + 1) * period - anchor
+
+        return close - self.server_offset
+
+    def next_fire_time(self, timeframe, now=None):
+        return self.next_close(timeframe, now) + self.grace
+
+    def next_fire_times(self, now=None):
+        """Next fire time (UTC epoch) for every configured timeframe, keyed by name."""
+        now = self.clock.time() if now is None else now
+        return {name: self.next_fire_time(tf, now) for name, tf in self.timeframes.items()}
+
+    def seconds_until(self, timeframe, now=None):
+        now = self.clock.time() if now is None else now
+        return max(0.0, self.next_fire_time(timeframe, now) - now)
+
+    def wait_for_close(self, timeframe, stop_event=None):
+        """
+        Block until the next close of `timeframe` plus the grace offset.
+
+        :return: the fire time that was waited for (UTC epoch), or None if stop_event was set.
+        """
+        wall_now = self.clock.time()
+        fire_at = self.next_fire_time(timeframe, wall_now)
+        deadline = self.clock.monotonic() + (fire_at - wall_now)
+
+        while True:
+            remaining = deadline - self.clock.monotonic()
+            if remaining <= 0:
+                return fire_at
+            if self.clock.sleep(remaining, stop_event) or (stop_event is not None and stop_event.is_set()):
+                return None
+
+    def run(self, timeframe, callback, stop_event=None):
+        """Call callback(fire_time) after every close of `timeframe` until stop_event is set."""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            fired = self.wait_for_close(timeframe, stop_event)
+            if fired is None:
+                break
+            callback(fired)
@@ -0,0 +1,167 @@
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+
+
+class TaskStats:
+    """Runtime statistics for one task key (symbol)."""
+
+    __slots__ = ('runs', 'failures', 'timeouts', 'skipped', 'total_time', 'max_time', 'last_time')
+
+    def __init__(self):
+        self.runs = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.last_time = 0.0
+
+    def record(self, elapsed, failed):
+        self.runs += 1
+        self.failures += failed
+        self.total_time += elapsed
+        self.last_time = elapsed
+        self.max_time = max(self.max_time, elapsed)
+
+    def as_dict(self):
+        return {
+            'runs': self.runs,
+            'failures': self.failures,
+            'timeouts': self.timeouts,
+            'skipped': self.skipped,
+            'mean_time': self.total_time / self.runs if self.runs else 0.0,
+            'max_time': self.max_time,
+            'last_time': self.last_time,
+        }
+
+
+class WorkerPool:
+    """
+    Bounded pool that runs one short evaluation task per key (symbol).
+
+    Tasks are served first-in first-out, and a key is never queued twice: if a
+    symbol's previous evaluation is still queued or running, the new one is
+    skipped. This stops one slow symbol from crowding out the others.
+    Python threads cannot be killed, so a task that overruns `task_timeout` is
+    recorded as timed out and abandoned by run_round(). Its key stays busy
+    until the call returns.
+    """
+
+    def __init__(self, max_workers=5, task_timeout=60.0, name="advisor-worker"):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        self.max_workers = max_workers
+        self.task_timeout = task_timeout
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._busy = {}  # key -> start time (None while queued)
+        self._stats = {}
+        self._threads = []
+        for index in range(max_workers):
+            thread = threading.Thread(target=self._work, name=f"{name}-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Queue fn(*args, **kwargs) under `key`; returns a Future, or None if the key is busy."""
+        with self._lock:
+            stats = self._stats.setdefault(key, TaskStats())
+            if key in self._busy:
+                stats.skipped += 1
+                return None
+            self._busy[key] = None
+        future = Future()
+        self._queue.put((key, fn, args, kwargs, future))
+        return future
+
+    def run_round(self, keys, fn):
+        """
+        Submit fn(key) for every key and wait until each task has finished or timed out.
+
+        A task that raised is printed with its traceback and left out of the results.
+
+        :return: dict of key -> result for the tasks that completed successfully.
+        """
+        futures = {}
+        for key in keys:
+            future = self.submit(key, fn, key)
+            if future is not None:
+                futures[future] = key
+
+        results = {}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=self._next_deadline(pending, futures), return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    results[futures[future]] = future.result()
+                else:
+                    print(f"❌ Exception in thread {futures[future]}: {error}")
+                    print("".join(traceback.format_exception(type(error), error, error.__traceback__)), end="")
+            pending = {future for future in pending if not self._expire(futures[future])}
+        return results
+
+    def stats(self):
+        with self._lock:
+            return {key: stats.as_dict() for key, stats in self._stats.items()}
+
+    def shutdown(self, wait_for_tasks=True):
+        for _ in self._threads:
+            self._queue.put(None)
+        if wait_for_tasks:
+            for thread in self._threads:
+                thread.join()
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            key, fn, args, kwargs, future = item
+            if not future.set_running_or_notify_cancel():
+                self._release(key)
+                continue
+
+            started = time.monotonic()
+            with self._lock:
+                self._busy[key] = started
+            failed = False
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                failed = True
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._stats[key].record(time.monotonic() - started, failed)
+                self._release(key)
+
+    def _release(self, key):
+        with self._lock:
+            self._busy.pop(key, None)
+
+    def _next_deadline(self, pending, futures):
+        if self.task_timeout is None:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            starts = [self._busy.get(futures[future]) for future in pending]
+        running = [start for start in starts if start is not None]
+        if not running:
+            return min(self.task_timeout, 0.5)  # only queued tasks; check again shortly
+        return max(0.0, min(running) + self.task_timeout - now)
+
+    def _expire(self, key):
+        if self.task_timeout is None:
+            return False
+        with self._lock:
+            started = self._busy.get(key)
+            if started is None or time.monotonic() - started < self.task_timeout:
+                return False
+            self._stats[key].timeouts += 1
+        print(f'⏱️ {key} evaluation exceeded {self.task_timeout}s, moving on without it.')
+        return True
@@ -0,0 +1,404 @@
+import collections
+import itertools
+import threading
+import zlib
+
+import numpy as np
+
+from advisor.Client import Timeframes
+from advisor.Client.Rates import RATES_DTYPE
+from advisor.Scheduler.BarScheduler import SystemClock
+from advisor.Simulator import SyntheticBars
+
+# Subset of the MetaTrader5 package constants used by the advisor (same values)
+TIMEFRAME_M1 = Timeframes.TIMEFRAME_M1
+TIMEFRAME_M5 = Timeframes.TIMEFRAME_M5
+TIMEFRAME_M15 = Timeframes.TIMEFRAME_M15
+TIMEFRAME_M30 = Timeframes.TIMEFRAME_M30
+TIMEFRAME_H1 = Timeframes.TIMEFRAME_H1
+TIMEFRAME_H4 = Timeframes.TIMEFRAME_H4
+TIMEFRAME_D1 = Timeframes.TIMEFRAME_D1
+TIMEFRAME_W1 = Timeframes.TIMEFRAME_W1
+TIMEFRAME_MN1 = Timeframes.TIMEFRAME_MN1
+
+ORDER_TYPE_BUY = 0
+ORDER_TYPE_SELL = 1
+TRADE_ACTION_DEAL = 1
+ORDER_TIME_GTC = 0
+ORDER_FILLING_FOK = 0
+ORDER_FILLING_IOC = 1
+ORDER_FILLING_RETURN = 2
+SYMBOL_FILLING_FOK = 1
+SYMBOL_FILLING_IOC = 2
+SYMBOL_TRADE_MODE_DISABLED = 0
+SYMBOL_TRADE_MODE_FULL = 4
+
+TRADE_RETCODE_REQUOTE = 10004
+TRADE_RETCODE_DONE = 10009
+TRADE_RETCODE_INVALID = 10013
+TRADE_RETCODE_INVALID_VOLUME = 10014
+TRADE_RETCODE_INVALID_STOPS = 10016
+TRADE_RETCODE_TRADE_DISABLED = 10017
+TRADE_RETCODE_INVALID_FILL = 10030
+
+RES_S_OK = 1
+RES_E_FAIL = -1
+RES_E_INVALID_PARAMS = -2
+RES_E_NOT_FOUND = -4
+RES_E_AUTH_FAILED = -6
+RES_E_INTERNAL_FAIL_INIT = -10003
+
+SymbolInfo = collections.namedtuple('SymbolInfo', [
+    'name', 'visible', 'select', 'digits', 'point', 'spread', 'trade_mode', 'filling_mode',
+    'trade_contract_size', 'trade_tick_size', 'trade_tick_value', 'trade_stops_level',
+    'volume_min', 'volume_max', 'volume_step', 'currency_base', 'currency_profit'])
+Tick = collections.namedtuple('Tick', ['time', 'bid', 'ask', 'last', 'volume', 'time_msc', 'flags', 'volume_real'])
+OrderSendResult = collections.namedtuple('OrderSendResult', [
+    'retcode', 'deal', 'order', 'volume', 'price', 'bid', 'ask', 'comment', 'request_id',
+    'retcode_external', 'request'])
+AccountInfo = collections.namedtuple('AccountInfo', [
+    'login', 'server', 'name', 'currency', 'balance', 'equity', 'margin_free', 'leverage', 'trade_allowed'])
+TerminalInfo = collections.namedtuple('TerminalInfo', [
+    'connected', 'trade_allowed', 'name', 'company', 'path', 'build', 'ping_last'])
+
+MAJORS = ('EURUSD', 'GBPUSD', 'USDJPY', 'USDCHF', 'AUDUSD', 'USDCAD', 'NZDUSD', 'EURJPY', 'EURGBP', 'GBPJPY')
+
+
+class _Series:
+    """Generated or recorded bars of one (symbol, timeframe), extended forward as the clock moves."""
+
+    __slots__ = ('rates', 'timeframe', 'step', 'digits', 'seed', 'extendable')
+
+    def __init__(self, rates, timeframe, digits, seed, extendable):
+        self.rates = rates
+        self.timeframe = timeframe
+        self.step = Timeframes.timeframe_seconds(timeframe)
+        self.digits = digits
+        self.seed = seed
+        self.extendable = extendable
+
+
+class MT5Simulator:
+    """
+    In-process stand-in for the MetaTrader5 package: the subset of its API the
+    advisor uses, backed by synthetic or recorded bars.
+
+    - Each symbol has one `base_timeframe` series, generated on first use (seeded
+      from the symbol name) and extended as the clock advances. Timeframes that
+      are whole multiples of the base are aggregated from it, so H1, H4 and D1
+      agree; lower timeframes get their own series. The bar containing the
+      clock's current time is returned as the still-forming bar, like the terminal.
+    - load_rates() installs recorded bars (e.g. from a BarStore) instead.
+    - Ticks are the close of the forming base bar; ask = bid + spread.
+    - order_send fills deals at the current bid/ask after `fill_latency` seconds;
+      other calls wait `latency` seconds. Waits go through the clock, so a virtual
+      clock makes them free.
+
+    Usage:
+        from advisor.Client import Backend
+        Backend.use(MT5Simulator(symbols=2000, latency=0.002))
+    """
+
+    def __init__(self, symbols=MAJORS, history=5000, latency=0.0, fill_latency=0.0, clock=None, seed=0,
+                 spread=12, trade_mode=SYMBOL_TRADE_MODE_FULL, base_timeframe=TIMEFRAME_H1, balance=10_000.0):
+        if isinstance(symbols, int):
+            symbols = list(MAJORS[:symbols]) + [f"SIM{i:05d}" for i in range(max(0, symbols - len(MAJORS)))]
+        self.history = history
+        self.latency = latency
+        self.fill_latency = fill_latency
+        self.clock = clock or SystemClock()
+        self.seed = seed
+        self.base_timeframe = base_timeframe
+        self.balance = balance
+        self._symbols = {name: _symbol_info(name, spread, trade_mode) for name in symbols}
+        self._series = {}
+        self._aggregates = {}
+        self._lock = threading.Lock()
+        self._error = (RES_S_OK, "Success")
+        self._initialized = False
+        self._login = None
+        self._ids = itertools.count(1)
+        self.deals = []
+
+    def __getattr__(self, name):
+        # The MetaTrader5 package exposes its constants as module attributes (mt5.ORDER_TYPE_BUY)
+        if name.isupper() and name in globals():
+            return globals()[name]
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    # ---------- session ----------
+
+    def initialize(self, path=None, login=None, password=None, server=None, timeout=None, portable=False):
+        self._wait(self.latency)
+        self._initialized = True
+        self._login = (login, server)
+        return self._ok(True)
+
+    def login(self, login, password=None, server=None, timeout=None):
+        self._login = (login, server)
+        return self._ok(True)
+
+    def shutdown(self):
+        self._initialized = False
+        return None
+
+    def last_error(self):
+        return self._error
+
+    def version(self):
+        return (500, 4000, "simulator")
+
+    def account_info(self):
+        if not self._check_initialized():
+            return None
+        login, server = self._login or (None, None)
+        equity = self.balance
+        return self._ok(AccountInfo(login or 0, server or "Simulator", "Simulated account", "USD",
+                                    self.balance, equity, equity, 100, True))
+
+    def terminal_info(self):
+        if not self._check_initialized():
+            return None
+        return self._ok(TerminalInfo(True, True, "MT5Simulator", "advisor", "", 4000, 0))
+
+    # ---------- symbols ----------
+
+    def symbols_total(self):
+        return len(self._symbols)
+
+    def symbols_get(self, group=None):
+        if not self._check_initialized():
+            return None
+        self._wait(self.latency)
+        return self._ok(tuple(self._symbols.values()))
+
+    def symbol_info(self, symbol):
+        if not self._check_initialized():
+            return None
+        info = self._symbols.get(symbol)
+        if info is None:
+            return self._fail(RES_E_NOT_FOUND, f"Symbol {symbol} not found")
+        return self._ok(info)
+
+    def symbol_select(self, symbol, enable=True):
+        return self._ok(symbol in self._symbols)
+
+    def symbol_info_tick(self, symbol):
+        if not self._check_initialized():
+            return None
+        info = self._symbols.get(symbol)
+        if info is None:
+            return self._fail(RES_E_NOT_FOUND, f"Symbol {symbol} not found")
+        now = self.clock.time()
+        rates = self._visible(symbol, self.base_timeframe, now)
+        if rates is None or len(rates) == 0:
+            return self._fail(RES_E_NOT_FOUND, f"No prices for {symbol}")
+        bid = float(rates['close'][-1])
+        ask = round(bid + info.spread * info.point, info.digits)
+        return self._ok(Tick(int(now), bid, ask, 0.0, 0, int(now * 1000), 6, 0.0))
+
+    # ---------- rates ----------
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        if not self._check_initialized():
+            return None
+        self._wait(self.latency)
+        rates = self._visible(symbol, timeframe, self.clock.time())
+        if rates is None:
+            return None
+        end = len(rates) - int(start_pos)
+        if end <= 0 or count <= 0:
+            return self._ok(np.empty(0, dtype=RATES_DTYPE))
+        return self._ok(rates[max(0, end - int(count)):end].copy())
+
+    def copy_rates_from(self, symbol, timeframe, date_from, count):
+        if not self._check_initialized():
+            return None
+        self._wait(self.latency)
+        rates = self._visible(symbol, timeframe, self.clock.time())
+        if rates is None:
+            return None
+        end = int(np.searchsorted(rates['time'], Timeframes.to_epoch(date_from), side='right'))
+        return self._ok(rates[max(0, end - int(count)):end].copy())
+
+    def copy_rates_range(self, symbol, timeframe, date_from, date_to):
+        if not self._check_initialized():
+            return None
+        self._wait(self.latency)
+        rates = self._visible(symbol, timeframe, self.clock.time())
+        if rates is None:
+            return None
+        lo = int(np.searchsorted(rates['time'], Timeframes.to_epoch(date_from), side='left'))
+        hi = int(np.searchsorted(rates['time'], Timeframes.to_epoch(date_to), side='right'))
+        return self._ok(rates[lo:hi].copy())
+
+    def load_rates(self, symbol, timeframe, rates):
+        """
+        Serve recorded `rates` (RATES_DTYPE) for this symbol and timeframe instead of
+        generated bars. Recorded base-timeframe bars also feed the timeframes derived
+        from them; the bar forming at the clock's time is shown open-only.
+        """
+        rates = np.asarray(rates).astype(RATES_DTYPE, copy=True)
+        rates.sort(order='time')
+        if symbol not in self._symbols:
+            self._symbols[symbol] = _symbol_info(symbol, 12, SYMBOL_TRADE_MODE_FULL)
+        with self._lock:
+            self._series[(symbol, timeframe)] = _Series(rates, timeframe, self._symbols[symbol].digits, 0, False)
+            self._aggregates = {k: v for k, v in self._aggregates.items() if k[0] != symbol}
+
+    # ---------- trading ----------
+
+    def order_send(self, request):
+        if not self._check_initialized():
+            return None
+        request = dict(request)
+        symbol = request.get('symbol')
+        info = self._symbols.get(symbol)
+        if info is None:
+            return self._fail(RES_E_INVALID_PARAMS, f"Symbol {symbol} not found")
+
+        self._wait(self.fill_latency)
+        tick = self.symbol_info_tick(symbol)
+        if tick is None:
+            return None
+        order_type = request.get('type')
+        price = tick.ask if order_type == ORDER_TYPE_BUY else tick.bid
+
+        retcode, comment = self._validate(request, info, price)
+        deal = order = 0
+        if retcode == TRADE_RETCODE_DONE:
+            deal = order = next(self._ids)
+            with self._lock:
+                self.deals.append({'deal': deal, 'time': tick.time, 'symbol': symbol, 'type': order_type,
+                                   'volume': request['volume'], 'price': price, 'sl': request.get('sl', 0.0),
+                                   'tp': request.get('tp', 0.0), 'magic': request.get('magic', 0)})
+        else:
+            price = 0.0
+        volume = request.get('volume', 0.0) if retcode == TRADE_RETCODE_DONE else 0.0
+        return self._ok(OrderSendResult(retcode, deal, order, volume, price, tick.bid, tick.ask, comment,
+                                        0, 0, request))
+
+    def _validate(self, request, info, price):
+        if request.get('action') != TRADE_ACTION_DEAL or request.get('type') not in (ORDER_TYPE_BUY, ORDER_TYPE_SELL):
+            return TRADE_RETCODE_INVALID, "Invalid request"
+        if info.trade_mode == SYMBOL_TRADE_MODE_DISABLED:
+            return TRADE_RETCODE_TRADE_DISABLED, "Trade disabled"
+        volume = request.get('volume', 0.0)
+        steps = round(volume / info.volume_step, 6)
+        if not info.volume_min <= volume <= info.volume_max or steps != int(steps):
+            return TRADE_RETCODE_INVALID_VOLUME, "Invalid volume"
+        filling = request.get('type_filling', ORDER_FILLING_FOK)
+        if filling == ORDER_FILLING_FOK and not info.filling_mode & SYMBOL_FILLING_FOK or \
+                filling == ORDER_FILLING_IOC and not info.filling_mode & SYMBOL_FILLING_IOC:
+            return TRADE_RETCODE_INVALID_FILL, "Unsupported filling mode"
+        requested = request.get('price')
+        if requested and abs(requested - price) > request.get('deviation', 0) * info.point + 1e-12:
+            return TRADE_RETCODE_REQUOTE, "Requote"
+        direction = 1 if request['type'] == ORDER_TYPE_BUY else -1
+        sl, tp = request.get('sl', 0.0), request.get('tp', 0.0)
+        if sl and direction * (price - sl) <= 0 or tp and direction * (tp - price) <= 0:
+            return TRADE_RETCODE_INVALID_STOPS, "Invalid stops"
+        return TRADE_RETCODE_DONE, "Request executed"
+
+    # ---------- internals ----------
+
+    def _visible(self, symbol, timeframe, now):
+        """Bars of (symbol, timeframe) with open time <= now, or None with last_error set."""
+        if symbol not in self._symbols:
+            self._fail(RES_E_INVALID_PARAMS, f"Terminal: Invalid params, unknown symbol {symbol}")
+            return None
+        if Timeframes.is_monthly(timeframe):
+            self._fail(RES_E_INVALID_PARAMS, "Terminal: Invalid params, monthly bars are not simulated")
+            return None
+        with self._lock:
+            if timeframe != self.base_timeframe and (symbol, timeframe) not in self._series and self._derived(timeframe):
+                return self._aggregate(symbol, timeframe, now)
+            return self._until(symbol, timeframe, now)
+
+    def _derived(self, timeframe):
+        base = Timeframes.timeframe_seconds(self.base_timeframe)
+        return Timeframes.timeframe_seconds(timeframe) % base == 0
+
+    def _until(self, symbol, timeframe, now):
+        """
+        Own bars of (symbol, timeframe) up to `now`. A recorded bar that is still
+        forming at `now` only shows its open, so a replay never sees later prices.
+        """
+        key = (symbol, timeframe)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = self._generate(symbol, timeframe, now)
+        elif series.extendable and series.rates['time'][-1] + series.step <= now:
+            self._extend(series, now)
+        rates = series.rates[:int(np.searchsorted(series.rates['time'], now, side='right'))]
+        if not series.extendable and len(rates) and rates['time'][-1] + series.step > now:
+            rates = rates.copy()
+            for field in ('high', 'low', 'close'):
+                rates[field][-1] = rates['open'][-1]
+            rates['tick_volume'][-1] = 1
+        return rates
+
+    def _aggregate(self, symbol, timeframe, now):
+        base = self._until(symbol, self.base_timeframe, now)
+        key = (symbol, timeframe)
+        version = (len(base), base[-1].tobytes() if len(base) else b'')  # the forming bar can complete in place
+        cached = self._aggregates.get(key)
+        if cached is None or cached[0] != version:
+            rates = SyntheticBars.aggregate(base, timeframe)
+            if len(rates) and rates['time'][0] < base['time'][0]:
+                rates = rates[1:]  # the first bucket started before the base history
+            cached = self._aggregates[key] = (version, rates)
+        return cached[1]
+
+    def _generate(self, symbol, timeframe, now):
+        step = Timeframes.timeframe_seconds(timeframe)
+        info = self._symbols[symbol]
+        seed = zlib.crc32(f"{self.seed}:{symbol}:{timeframe}".encode())
+        last_open = int(now) // step * step
+        rates = SyntheticBars.generate_rates(
+            self.history, timeframe, start=last_open - (self.history - 1) * step, price=_base_price(symbol),
+            digits=info.digits, spread=info.spread, weekends=False, seed=seed)
+        return _Series(rates, timeframe, info.digits, seed, True)
+
+    def _extend(self, series, now):
+        last = series.rates[-1]
+        bars = (int(now) - int(last['time'])) // series.step
+        continuation = SyntheticBars.generate_rates(
+            bars, series.timeframe, start=int(last['time']) + series.step, price=float(last['close']),
+            digits=series.digits, spread=int(last['spread']), weekends=False, seed=series.seed + int(last['time']))
+        series.rates = np.concatenate([series.rates, continuation])
+
+    def _wait(self, seconds):
+        if seconds:
+            self.clock.sleep(seconds)
+
+    def _check_initialized(self):
+        if not self._initialized:
+            self._fail(RES_E_INTERNAL_FAIL_INIT, "IPC initialize failed, call initialize() first")
+            return False
+        return True
+
+    def _ok(self, value):
+        self._error = (RES_S_OK, "Success")
+        return value
+
+    def _fail(self, code, message):
+        self._error = (code, message)
+        return None
+
+
+def _symbol_info(name, spread, trade_mode):
+    jpy = name.endswith("JPY")
+    digits = 3 if jpy else 5
+    return SymbolInfo(
+        name=name, visible=True, select=True, digits=digits, point=10.0 ** -digits, spread=spread,
+        trade_mode=trade_mode, filling_mode=SYMBOL_FILLING_FOK | SYMBOL_FILLING_IOC,
+        trade_contract_size=100_000.0, trade_tick_size=10.0 ** -digits, trade_tick_value=1.0,
+        trade_stops_level=0, volume_min=0.01, volume_max=100.0, volume_step=0.01,
+        currency_base=name[:3], currency_profit=name[3:6])
+
+
+def _base_price(symbol):
+    if symbol.endswith("JPY"):
+        return 150.0
+    return 0.6 + (zlib.crc32(symbol.encode()) % 1000) / 1000.0
@@ -0,0 +1,201 @@
+import contextlib
+import functools
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from advisor.Client import Backend
+from advisor.Client import Timeframes
+from advisor.Client.Advisor import MetaTrader5Client
+from advisor.MovingAverage.StreamingMA import IndicatorEngine
+from advisor.Simulator.MT5Simulator import MT5Simulator
+from advisor.Trade import TradesAlgo as algorithim
+from advisor.Trade.Evaluator import SymbolEvaluator
+
+DEFAULT_USER_DATA = {"volume": 0.01, "sl": 100, "tp": 300}
+
+
+class ReplayClock:
+    """Virtual clock for the replay: time only moves when set, so nothing ever sleeps."""
+
+    def __init__(self, now=0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds, stop_event=None):
+        self.now += seconds
+        return False
+
+
+class ReplayMessenger:
+    """Stands in for TelegramMessenger and keeps every message with the virtual time it was sent."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.messages = []
+
+    def send_message(self, message, symbol=None):
+        self.messages.append({'time': self.clock.time(), 'symbol': symbol, 'message': message})
+        return True
+
+    def close(self, timeout=None):
+        pass
+
+
+class Ledger:
+    """
+    Every place_order call the decision path made during a replay, stamped with the virtual time.
+
+    Price, SL, TP and volume are those of the request place_order sent; they stay
+    empty when no order went out (trading disabled for the symbol, or a rejected order).
+    """
+
+    COLUMNS = ['time', 'symbol', 'action', 'price', 'sl', 'tp', 'volume', 'placed']
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.orders = []
+        self._lock = threading.Lock()
+
+    def record(self, symbol, action, request=None):
+        order = {'time': self.clock.time(), 'symbol': symbol, 'action': action, 'placed': request is not None}
+        for field in ('price', 'sl', 'tp', 'volume'):
+            order[field] = request[field] if request is not None else None
+        with self._lock:
+            self.orders.append(order)
+
+    def to_frame(self):
+        frame = pd.DataFrame(self.orders, columns=self.COLUMNS)
+        frame['time'] = pd.to_datetime(frame['time'], unit='s')
+        return frame
+
+    def summary(self):
+        """Order counts per symbol and side."""
+        frame = self.to_frame()
+        if frame.empty:
+            return pd.DataFrame(columns=['symbol', 'buy', 'sell'])
+        counts = frame.groupby(['symbol', 'action']).size().unstack(fill_value=0)
+        return counts.reindex(columns=['buy', 'sell'], fill_value=0).reset_index()
+
+
+class ReplayTrader(algorithim.MT5TradingAlgorithm):
+    """MT5TradingAlgorithm that also writes each place_order call to the replay ledger."""
+
+    def __init__(self, symbol, telegram, user_data, ledger, magic_number=1000):
+        super().__init__(symbol, telegram, user_data, magic_number)
+        self.ledger = ledger
+
+    def place_order(self, action, stop_loss=100, take_profit=300):
+        result = super().place_order(action, stop_loss=stop_loss, take_profit=take_profit)
+        # Only a sent order comes back as (True, request); the signal-only path returns plain True
+        self.ledger.record(self.symbol, action, request=result[1] if isinstance(result, tuple) else None)
+        return result
+
+
+class ReplayResult:
+    def __init__(self, ledger, messages, deals, steps, evaluations, elapsed):
+        self.ledger = ledger
+        self.messages = messages
+        self.deals = deals
+        self.steps = steps
+        self.evaluations = evaluations
+        self.elapsed = elapsed
+
+
+class Replay:
+    """
+    Replays stored history through the live decision path (SymbolEvaluator ->
+    MT5TradingAlgorithm.run_Trades) as fast as the CPU allows.
+
+    The bars are served by an MT5Simulator on a virtual clock. For every LTF bar
+    the clock is set to that bar's open plus `grace`, which is when the live
+    scheduler fires. Every symbol is then evaluated once, as one worker round.
+    The forming bars only show their open, so no later prices leak in.
+    Orders go to a Ledger and messages to a ReplayMessenger.
+
+    While run() executes, the simulator is installed as the process-wide MT5 backend.
+
+    :param history: dict of symbol -> {"LTF": rates[, "HTF": rates]} in RATES_DTYPE. Without
+                    "HTF" the higher timeframe is aggregated from the LTF bars, as the terminal's is.
+    :param start: first LTF bar to replay; earlier bars only warm up the indicators.
+    """
+
+    def __init__(self, history, timeframes=None, user_data=None, threshold=0.0100, grace=5.0, client_history=1000,
+                 trade_mode=None, start=None):
+        if not history:
+            raise ValueError("history must hold at least one symbol.")
+        self.history = history
+        self.timeframes = timeframes or {"HTF": Timeframes.TIMEFRAME_H4, "LTF": Timeframes.TIMEFRAME_H1}
+        self.user_data = dict(DEFAULT_USER_DATA, **(user_data or {}))
+        self.threshold = threshold
+        self.grace = grace
+        self.client_history = client_history
+        self.trade_mode = trade_mode
+        self.start = start
+
+    @classmethod
+    def from_store(cls, store, symbols, start=None, end=None, timeframes=None, **kwargs):
+        """Replay LTF bars read from a database.BarStore up to `end`."""
+        timeframes = timeframes or {"HTF": Timeframes.TIMEFRAME_H4, "LTF": Timeframes.TIMEFRAME_H1}
+        history = {}
+        for symbol in symbols:
+            rates = store.read_range(symbol, timeframes["LTF"], None, end)
+            if len(rates):
+                history[symbol] = {"LTF": rates}
+        return cls(history, timeframes=timeframes, start=start, **kwargs)
+
+    def run(self, start=None, end=None, quiet=True):
+        """
+        Replay every LTF bar opening between `start` (default: the constructor's) and `end`.
+
+        :param quiet: discard the decision path's prints while replaying.
+        :return: ReplayResult with the ledger, the messages and the simulator's deals.
+        """
+        start = Timeframes.to_epoch(start if start is not None else self.start)
+        end = Timeframes.to_epoch(end)
+        clock = ReplayClock()
+        options = {} if self.trade_mode is None else {'trade_mode': self.trade_mode}
+        simulator = MT5Simulator(symbols=list(self.history), clock=clock, base_timeframe=self.timeframes["LTF"],
+                                 **options)
+        for symbol, series in self.history.items():
+            for name, rates in series.items():
+                simulator.load_rates(symbol, self.timeframes[name], rates)
+
+        times = np.unique(np.concatenate([np.asarray(series["LTF"]['time'], dtype=np.int64)
+                                          for series in self.history.values()]))
+        if start is not None:
+            times = times[times >= start]
+        if end is not None:
+            times = times[times <= end]
+
+        ledger = Ledger(clock)
+        messenger = ReplayMessenger(clock)
+        previous = Backend.use(simulator)
+        evaluations = 0
+        began = time.perf_counter()
+        try:
+            with open(os.devnull, 'w') as devnull, \
+                    (contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext()):
+                clock.now = int(times[0]) + self.grace if len(times) else 0
+                client = MetaTrader5Client(threshold=self.threshold, timeframes=self.timeframes,
+                                           history=self.client_history)
+                client.initialize(None)
+                evaluator = SymbolEvaluator(client, IndicatorEngine(), messenger, self.user_data,
+                                            trader=functools.partial(ReplayTrader, ledger=ledger))
+                for bar_time in times:
+                    clock.now = int(bar_time) + self.grace
+                    for symbol in self.history:
+                        evaluator.evaluate(symbol)
+                        evaluations += 1
+        finally:
+            Backend.use(previous)
+        return ReplayResult(ledger, messenger.messages, list(simulator.deals), len(times), evaluations,
+                            time.perf_counter() - began)
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+from advisor.Client import Timeframes
+from advisor.Client import Resampler
+from advisor.Client.Rates import RATES_DTYPE
+
+
+def generate_rates(bars, timeframe=Timeframes.TIMEFRAME_H1, start="2020-01-06", price=1.10, annual_volatility=0.08, drift=0.0,
+                   digits=5, spread=12, clustering=0.9, weekends=True, seed=0):
+    """
+    Synthetic bars in the mt5.copy_rates_* dtype (RATES_DTYPE).
+
+    Closes follow a geometric random walk. Per-bar volatility is scaled from
+    `annual_volatility` and mean-reverts with persistence `clustering`, which
+    gives the calm and busy stretches seen in real FX data. Each bar opens at the
+    previous close. High and low extend past the open/close by a random fraction
+    of the bar's volatility. Tick volume rises with the size of the move. Prices
+    are rounded to `digits`. With `weekends`, bars between Friday 22:00 and
+    Sunday 22:00 UTC are skipped, as on an FX feed.
+
+    :return: structured array of `bars` rows, times ascending.
+    """
+    if bars < 0:
+        raise ValueError("bars must be non-negative.")
+    rng = np.random.default_rng(seed)
+    step = Timeframes.timeframe_seconds(timeframe)
+    times = _bar_times(bars, step, Timeframes.to_epoch(start), weekends)
+
+    bar_volatility = annual_volatility * np.sqrt(step / (252 * 86400))
+    shocks = rng.standard_normal(bars)
+    # Log-volatility is an AR(1) process around 0, so busy periods persist for a while
+    log_scale = _ar1(rng.normal(0.0, 0.25 * np.sqrt(1 - clustering ** 2), bars), clustering)
+    sigma = bar_volatility * np.exp(log_scale - (log_scale.var() / 2 if bars else 0.0))
+    returns = drift * step / (252 * 86400) + sigma * shocks
+
+    close = price * np.exp(np.cumsum(returns))
+    open_ = np.empty(bars)
+    if bars:
+        open_[0] = price
+        open_[1:] = close[:-1]
+    body_high = np.maximum(open_, close)
+    body_low = np.minimum(open_, close)
+    high = body_high * (1 + sigma * np.abs(rng.standard_normal(bars)) * 0.5)
+    low = body_low * (1 - sigma * np.abs(rng.standard_normal(bars)) * 0.5)
+
+    rates = np.empty(bars, dtype=RATES_DTYPE)
+    rates['time'] = times
+    rates['open'] = np.round(open_, digits)
+    rates['close'] = np.round(close, digits)
+    # Rounding must not push the wicks inside the body
+    rates['high'] = np.maximum(np.round(high, digits), np.maximum(rates['open'], rates['close']))
+    rates['low'] = np.minimum(np.round(low, digits), np.minimum(rates['open'], rates['close']))
+    rates['tick_volume'] = (50 + 400 * np.abs(returns) / bar_volatility + rng.poisson(20, bars)).astype(np.uint64)
+    rates['spread'] = spread
+    rates['real_volume'] = 0
+    return rates
+
+
+def generate_multi_tf(bars, timeframes, base_timeframe=None, **kwargs):
+    """
+    Consistent bars for several timeframes: the base (lowest) timeframe is
+    generated and the others are aggregated from it, as the terminal's would be.
+
+    :param bars: number of base-timeframe bars.
+    :param timeframes: dict of name -> MT5 timeframe, e.g. {"HTF": H4, "LTF": H1}.
+    :return: dict of name -> structured array (RATES_DTYPE).
+    """
+    if base_timeframe is None:
+        base_timeframe = min(timeframes.values(), key=Timeframes.timeframe_seconds)
+    base = generate_rates(bars, base_timeframe, **kwargs)
+    return {name: base if tf == base_timeframe else aggregate(base, tf) for name, tf in timeframes.items()}
+
+
+def aggregate(rates, timeframe):
+    """Aggregate bars into the buckets of `timeframe` (not monthly) starting at each bucket's open time."""
+    return Resampler.resample(rates, timeframe)
+
+
+def rates_frame(rates):
+    """DataFrame with datetime times, as BarSeries.to_frame() returns."""
+    frame = pd.DataFrame(rates)
+    frame['time'] = pd.to_datetime(frame['time'], unit='s')
+    return frame
+
+
+def _ar1(innovation, phi, block=64):
+    """x[t] = phi * x[t-1] + innovation[t], solved in closed form per block of `block` values."""
+    if phi <= 0:
+        return innovation.copy()
+    out = np.empty_like(innovation)
+    powers = phi ** np.arange(1, block + 1)
+    level = 0.0
+    for start in range(0, len(innovation), block):
+        chunk = innovation[start:start + block]
+        p = powers[:len(chunk)]
+        out[start:start + len(chunk)] = p * (level + np.cumsum(chunk / p))
+        level = out[start + len(chunk) - 1]
+    return out
+
+
+def _bar_times(bars, step, start, weekends):
+    if not weekends:
+        return start + step * np.arange(bars, dtype=np.int64)
+    # Generate candidates in chunks and drop the closed hours until enough bars exist
+    times = np.empty(0, dtype=np.int64)
+    cursor = start
+    while len(times) < bars:
+        chunk = cursor + step * np.arange(max(1024, 2 * (bars - len(times))), dtype=np.int64)
+        cursor = int(chunk[-1]) + step
+        times = np.concatenate([times, chunk[_market_open(chunk)]])
+    return times[:bars]
+
+
+def _market_open(times):
+    """FX hours: closed from Friday 22:00 to Sunday 22:00 UTC."""
+    seconds_into_week = (times + 3 * 86400) % (7 * 86400)  # 0 = Monday 00:00 (the epoch was a Thursday)
+    friday_close = 4 * 86400 + 22 * 3600
+    sunday_open = 6 * 86400 + 22 * 3600
+    return (seconds_into_week < friday_close) | (seconds_into_week >= sunday_open)
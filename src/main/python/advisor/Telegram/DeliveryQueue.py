@@ -0,0 +1,243 @@
+import collections
+import threading
+import time
+
+import requests
+
+from advisor.Metrics.Registry import timed
+
+TELEGRAM_API_URL = "https://api.telegram.org"
+MAX_MESSAGE_LENGTH = 4096
+
+
+class OutgoingMessage:
+    """One sendMessage call waiting in a chat's outbox."""
+
+    __slots__ = ('chat_id', 'text', 'parse_mode', 'attempts', 'parts')
+
+    def __init__(self, chat_id, text, parse_mode, parts=1):
+        self.chat_id = chat_id
+        self.text = text
+        self.parse_mode = parse_mode
+        self.attempts = 0
+        self.parts = parts
+
+
+class DeliveryQueue:
+    """
+    Outbound Telegram delivery on a background sender thread.
+
+    enqueue() only appends to an in-memory queue, so trading threads never wait on
+    the network. The sender thread:
+    - posts through one keep-alive requests.Session,
+    - keeps each chat to one message per `chat_interval` seconds and all chats to
+      `global_rate` messages per second (Telegram's documented limits),
+    - retries network errors and 5xx responses with exponential backoff, and honours
+      `retry_after` on 429 responses,
+    - waits `digest_window` seconds after the first message of a burst and merges
+      `digest_threshold` or more messages for the same chat into one digest.
+
+    Usage:
+        delivery = DeliveryQueue(token)
+        delivery.enqueue(chat_id, "🟢 Buy EURUSD")
+        delivery.close()
+    """
+
+    def __init__(self, token, base_url=TELEGRAM_API_URL, chat_interval=1.0, global_rate=30.0,
+                 digest_window=0.5, digest_threshold=3, max_retries=5, backoff=1.0, max_backoff=60.0,
+                 timeout=10.0, max_queue=10_000, session=None):
+        if not token:
+            raise ValueError("A bot token is required.")
+        self.url = f"{base_url.rstrip('/')}/bot{token}/sendMessage"
+        self.chat_interval = chat_interval
+        self.global_interval = 1.0 / global_rate if global_rate else 0.0
+        self.digest_window = digest_window
+        self.digest_threshold = digest_threshold
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+        self._incoming = collections.deque(maxlen=max_queue)
+        self._burst_started = None
+        self._outbox = collections.OrderedDict()  # chat_id -> deque of OutgoingMessage
+        self._ready_at = {}  # chat_id -> monotonic time the chat may send again
+        self._next_send = 0.0
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._closing = False
+        self._stats = collections.Counter()
+        self._thread = threading.Thread(target=self._run, name="telegram-delivery", daemon=True)
+        self._thread.start()
+
+    def enqueue(self, chat_id, text, parse_mode="HTML"):
+        """Queue `text` for `chat_id` and return immediately. Returns False once the queue is closed."""
+        with self._condition:
+            if self._closing:
+                return False
+            if len(self._incoming) == self._incoming.maxlen:
+                self._stats['dropped'] += 1  # the deque discards the oldest message
+            if self._burst_started is None:
+                self._burst_started = time.monotonic()
+            self._incoming.append((chat_id, text, parse_mode))
+            self._stats['queued'] += 1
+            self._condition.notify()
+        return True
+
+    def flush(self, timeout=None):
+        """Wait until every queued message has been delivered or given up on. Returns True if drained."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._incoming or self._outbox or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.notify_all()
+                self._condition.wait(remaining if remaining is not None else 0.1)
+        return True
+
+    def close(self, timeout=10.0):
+        """Stop accepting messages, deliver what is queued within `timeout` and stop the sender."""
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self.session.close()
+
+    def stats(self):
+        with self._condition:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._incoming) + sum(len(outbox) for outbox in self._outbox.values())
+        return stats
+
+    # ---------- sender thread ----------
+
+    def _run(self):
+        while True:
+            with self._condition:
+                message = self._next_message()
+                if message is None:
+                    return
+                self._in_flight += 1
+            try:
+                delay = self._deliver(message)
+            finally:
+                with self._condition:
+                    self._in_flight -= 1
+                    self._settle(message, delay)
+                    self._condition.notify_all()
+
+    def _next_message(self):
+        """Block until a message may be sent and pop it; None when closed and drained. Holds the lock."""
+        while True:
+            now = time.monotonic()
+            if self._incoming:
+                burst_ends = self._burst_started + self.digest_window
+                if now < burst_ends and not self._closing:
+                    self._condition.wait(burst_ends - now)
+                    continue
+                self._coalesce()
+
+            if not self._outbox:
+                if self._closing:
+                    return None
+                self._condition.wait()
+                continue
+
+            chat_id = min(self._outbox, key=lambda chat: self._ready_at.get(chat, 0.0))
+            ready_at = max(self._ready_at.get(chat_id, 0.0), self._next_send)
+            if ready_at > now:
+                self._condition.wait(ready_at - now)
+                continue
+
+            self._next_send = now + self.global_interval
+            self._ready_at[chat_id] = now + self.chat_interval
+            return self._outbox[chat_id][0]
+
+    def _coalesce(self):
+        by_chat = collections.OrderedDict()
+        while self._incoming:
+            chat_id, text, parse_mode = self._incoming.popleft()
+            by_chat.setdefault((chat_id, parse_mode), []).append(text)
+        self._burst_started = None
+
+        for (chat_id, parse_mode), texts in by_chat.items():
+            outbox = self._outbox.setdefault(chat_id, collections.deque())
+            if len(texts) < self.digest_threshold:
+                outbox.extend(OutgoingMessage(chat_id, text, parse_mode) for text in texts)
+                continue
+            self._stats['coalesced'] += len(texts)
+            for chunk in _digest_chunks(texts):
+                outbox.append(OutgoingMessage(chat_id, f"📬 {len(chunk)} updates\n\n" + "\n\n".join(chunk),
+                                              parse_mode, parts=len(chunk)))
+
+    def _deliver(self, message):
+        """POST one message. Returns None when done with it, or the seconds to wait before retrying."""
+        message.attempts += 1
+        payload = {'chat_id': message.chat_id, 'text': message.text}
+        if message.parse_mode:
+            payload['parse_mode'] = message.parse_mode
+        try:
+            with timed("telegram_post"):
+                response = self.session.post(self.url, data=payload, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"⚠️ Telegram delivery error: {e}")
+            return self._backoff(message)
+
+        if response.status_code == 200:
+            self._stats['sent'] += 1
+            return None
+        if response.status_code == 429:
+            self._stats['rate_limited'] += 1
+            retry_after = _retry_after(response)
+            if retry_after is not None and message.attempts <= self.max_retries:
+                self._stats['retries'] += 1
+                return retry_after
+            return self._backoff(message)
+        if response.status_code >= 500:
+            print(f"⚠️ Telegram returned {response.status_code}, retrying.")
+            return self._backoff(message)
+
+        print(f"❌ Failed to send message: {response.status_code} - {response.text}")
+        self._stats['failed'] += 1
+        return None
+
+    def _backoff(self, message):
+        if message.attempts > self.max_retries:
+            print(f"❌ Giving up on Telegram message after {message.attempts} attempts.")
+            self._stats['failed'] += 1
+            return None
+        self._stats['retries'] += 1
+        return min(self.max_backoff, self.backoff * 2 ** (message.attempts - 1))
+
+    def _settle(self, message, delay):
+        outbox = self._outbox[message.chat_id]
+        if delay is None:
+            outbox.popleft()
+            if not outbox:
+                del self._outbox[message.chat_id]
+        else:
+            self._ready_at[message.chat_id] = time.monotonic() + delay
+
+
+def _retry_after(response):
+    try:
+        return float(response.json()['parameters']['retry_after'])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _digest_chunks(texts, limit=MAX_MESSAGE_LENGTH - 64):
+    """Group texts into digests that stay under Telegram's message length limit."""
+    chunk, size = [], 0
+    for text in texts:
+        text = text[:limit]
+        if chunk and size + len(text) + 2 > limit:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(text)
+        size += len(text) + 2
+    if chunk:
+        yield chunk
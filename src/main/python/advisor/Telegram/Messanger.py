@@ -1,12 +1,19 @@
-from dotenv import load_dotenv
 import os, threading, asyncio
-from telegram.ext import Application, CommandHandler, ContextTypes
-from telegram import Update
-import requests, sys
+import sys
+from typing import TYPE_CHECKING
+
+from advisor.Telegram.DeliveryQueue import DeliveryQueue, TELEGRAM_API_URL
+from advisor.Metrics.Registry import timed
+
+if TYPE_CHECKING:  # python-telegram-bot is imported when the bot starts polling
+    from telegram.ext import ContextTypes
+    from telegram import Update
 
 class TelegramMessenger:
     def __init__(self, chat_id=None):
         
+        from dotenv import load_dotenv
+
         base_dir = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
         env_path = os.path.join(base_dir, '.env')
 
@@ -18,21 +25,23 @@ class TelegramMessenger:
            
         self.chat_id = chat_id
         self.should_run = True  # 🔁 Flag to control bot execution
+        # 📮 Messages are delivered by a background sender so trading threads never block on HTTP
+        self.delivery = DeliveryQueue(self.BOT_TOKEN, base_url=os.getenv("TELEGRAM_API_URL", TELEGRAM_API_URL))
         
     def run_bot_async(self):
         threading.Thread(target=self.run_bot, daemon=True).start()
         
-    async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    async def start(self, update: "Update", context: "ContextTypes.DEFAULT_TYPE"):
         chat_id = update.effective_chat.id
         self.chat_id = chat_id
         self.should_run = True
         await context.bot.send_message(chat_id=chat_id, text=f"✅ Advisor started.\nChat ID: {chat_id}")
 
-    async def stop(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    async def stop(self, update: "Update", context: "ContextTypes.DEFAULT_TYPE"):
         self.should_run = False
         await context.bot.send_message(chat_id=update.effective_chat.id, text="🛑 Advisor stopped by user.")
 
-    async def status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    async def status(self, update: "Update", context: "ContextTypes.DEFAULT_TYPE"):
         if self.should_run:
             await context.bot.send_message(chat_id=update.effective_chat.id, text="✅ Advisor is running.")
         else:
@@ -42,6 +51,8 @@ class TelegramMessenger:
         """
         Starts the Telegram bot and waits for commands.
         """
+        from telegram.ext import Application, CommandHandler
+
         asyncio.set_event_loop(asyncio.new_event_loop())  # 🧠 create and set event loop in thread
         loop = asyncio.get_event_loop()
 
@@ -54,23 +65,14 @@ class TelegramMessenger:
         loop.run_until_complete(app.run_polling())  # 🧠 run polling in the new loop
 
 
-    def send_message(self, message):
+    def send_message(self, message, symbol=None):
+        """Queue `message` for delivery and return immediately. `symbol` only labels the stage metrics."""
         if not self.chat_id:
             print("❌ Chat ID not set. Use /start on your bot first.")
-            return
-
-        url = f"https://api.telegram.org/bot{self.BOT_TOKEN}/sendMessage"
-        payload = {
-            "chat_id": self.chat_id,
-            "text": message,
-            "parse_mode": "HTML",
-        }
+            return False
+        with timed("send_message", symbol):
+            return self.delivery.enqueue(self.chat_id, message, parse_mode="HTML")
 
-        try:
-            response = requests.post(url, data=payload)
-            if response.status_code == 200:
-                print("✅ Message sent successfully")
-            else:
-                print(f"❌ Failed to send message: {response.status_code} - {response.text}")
-        except Exception as e:
-            print(f"❌ Exception occurred while sending message: {e}")
+    def close(self, timeout=10.0):
+        """Deliver any queued messages and stop the sender thread."""
+        self.delivery.close(timeout)
@@ -0,0 +1,52 @@
+import pandas as pd
+
+from advisor.Trade import TradesAlgo as algorithim
+
+
+class SymbolEvaluator:
+    """
+    The live decision path for one symbol. It fetches HTF/LTF bars, updates the
+    streaming moving averages and hands the latest LTF row to
+    MT5TradingAlgorithm.run_Trades.
+
+    RunAdvisorBot's workers and the historical replay both run this, so a replay
+    shows what the live bot would have done.
+
+    :param trader: factory called as trader(symbol, messenger, user_data), MT5TradingAlgorithm by default.
+    """
+
+    def __init__(self, client, indicators, messenger, user_data=None, trader=algorithim.MT5TradingAlgorithm):
+        self.client = client
+        self.indicators = indicators
+        self.messenger = messenger
+        self.user_data = user_data
+        self.trader = trader
+
+    def evaluate(self, symbol):
+        """Run one evaluation cycle for `symbol`; returns (market bias, LTF bias) or None if skipped."""
+        data = self.client.get_multi_tf_data(symbol)
+        if data is None:
+            print(f'❌error: No data returned for {symbol}. Retrying next cycle...')
+            return None
+
+        if "HTF" not in data or "LTF" not in data:
+            print(f'⚠️ error :Missing timeframes for {symbol}. Skipping...')
+            return None
+
+        # Only bars closed since the last cycle are ingested by the indicator engine
+        htf_latest = self.indicators.update(symbol, "HTF", data["HTF"])
+        ltf_latest = self.indicators.update(symbol, "LTF", data["LTF"])
+
+        if htf_latest is None or ltf_latest is None:
+            print(f'⚠️ Moving averages not calculated for {symbol}. Skipping...')
+            return None
+
+        ltf_latest = pd.Series(ltf_latest)
+        current_price = ltf_latest['close']
+
+        market_Bias = htf_latest['Bias']
+        ltf_Bias = "Buy" if ltf_latest["Fast_MA"] > ltf_latest['Slow_MA'] else "Sell"
+
+        trade = self.trader(symbol, self.messenger, self.user_data)
+        trade.run_Trades(market_Bias, ltf_Bias, ltf_latest, current_price, self.client.THRESHOLD, symbol)
+        return market_Bias, ltf_Bias
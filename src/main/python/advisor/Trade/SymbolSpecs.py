@@ -0,0 +1,108 @@
+import threading
+import time
+
+from advisor.Client import Backend
+from advisor.Client.Backend import mt5
+
+
+class SymbolSpec:
+    """Trading specification of one symbol, as read from mt5.symbols_get/symbol_info."""
+
+    __slots__ = ('name', 'point', 'digits', 'tick_size', 'trade_mode', 'volume_min', 'volume_max', 'volume_step',
+                 'filling_mode')
+
+    def __init__(self, name, point, digits, tick_size, trade_mode, volume_min, volume_max, volume_step, filling_mode):
+        self.name = name
+        self.point = point
+        self.digits = digits
+        self.tick_size = tick_size
+        self.trade_mode = trade_mode
+        self.volume_min = volume_min
+        self.volume_max = volume_max
+        self.volume_step = volume_step
+        self.filling_mode = filling_mode
+
+    @classmethod
+    def from_info(cls, info):
+        return cls(info.name, info.point, info.digits, info.trade_tick_size or info.point, info.trade_mode,
+                   info.volume_min, info.volume_max, info.volume_step, info.filling_mode)
+
+    @property
+    def pip(self):
+        """Pip size: ten points on 3/5-digit quotes (e.g. 0.0001 for EURUSD, 0.01 for USDJPY), else one point."""
+        return self.point * 10 if self.digits in (3, 5) else self.point
+
+    def filling_type(self):
+        """ORDER_FILLING_* the symbol accepts, preferring IOC, then FOK, else RETURN."""
+        if self.filling_mode & mt5.SYMBOL_FILLING_IOC:
+            return mt5.ORDER_FILLING_IOC
+        if self.filling_mode & mt5.SYMBOL_FILLING_FOK:
+            return mt5.ORDER_FILLING_FOK
+        return mt5.ORDER_FILLING_RETURN
+
+    def round_volume(self, volume):
+        """Round `volume` down to the volume step, within the symbol's limits."""
+        steps = int(round(volume / self.volume_step, 8))
+        return round(min(max(steps * self.volume_step, self.volume_min), self.volume_max), 8)
+
+    def round_price(self, price):
+        return round(round(price / self.tick_size) * self.tick_size, self.digits)
+
+
+class SymbolSpecCache:
+    """
+    Shared symbol specifications for the order path.
+
+    All specs are loaded with one mt5.symbols_get call and reloaded after `ttl`
+    seconds, or when a different backend is installed. A symbol missing from
+    the bulk load is looked up once with mt5.symbol_info.
+    """
+
+    def __init__(self, ttl=300.0, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._specs = {}
+        self._loaded_at = None
+        self._backend = None
+        self._lock = threading.Lock()
+
+    def get(self, symbol):
+        """SymbolSpec for `symbol`, or None if the terminal does not know it."""
+        if self._stale():
+            self.refresh()
+        spec = self._specs.get(symbol)
+        if spec is None:
+            info = mt5.symbol_info(symbol)
+            if info is None:
+                return None
+            spec = SymbolSpec.from_info(info)
+            with self._lock:
+                self._specs[symbol] = spec
+        return spec
+
+    def pip(self, symbol, default=None):
+        spec = self.get(symbol)
+        return default if spec is None else spec.pip
+
+    def refresh(self):
+        """Reload every spec in one symbols_get call; keeps the previous specs if the call fails."""
+        backend = Backend.current()
+        symbols = mt5.symbols_get()
+        with self._lock:
+            if symbols is not None:
+                self._specs = {info.name: SymbolSpec.from_info(info) for info in symbols}
+            elif backend is not self._backend:
+                self._specs = {}
+            self._loaded_at = self.clock()
+            self._backend = backend
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def _stale(self):
+        return self._loaded_at is None or self.clock() - self._loaded_at >= self.ttl or \
+            Backend.current() is not self._backend
+
+
+SPECS = SymbolSpecCache()
@@ -1,10 +1,15 @@
-import MetaTrader5 as mt5
 import pandas as pd
 import datetime as dt
-from advisor.Telegram import Messanger
+from typing import TYPE_CHECKING
+from advisor.Client.Backend import mt5
+from advisor.Metrics.Registry import timed_method
+from advisor.Trade import SymbolSpecs
+
+if TYPE_CHECKING:  # any messenger with send_message() works, e.g. the replay's collector
+    from advisor.Telegram import Messanger
 
 class MT5TradingAlgorithm:
-    def __init__(self, symbol, telegram: Messanger.TelegramMessenger, user_data, magic_number=1000):
+    def __init__(self, symbol, telegram: "Messanger.TelegramMessenger", user_data, magic_number=1000):
         """
         Initialize the MT5 trading algorithm.
         :param symbol: The trading symbol (e.g., 'USDJPY').
@@ -19,6 +24,7 @@ class MT5TradingAlgorithm:
         self.current_position = None  # Track 'buy', 'sell', or None
         self.telegram = telegram
 
+    @timed_method("place_order")
     def place_order(self, action, stop_loss=100, take_profit=300):
         """
         Place a buy or sell order.
@@ -28,37 +34,40 @@ class MT5TradingAlgorithm:
             # Define order type
             order_type = mt5.ORDER_TYPE_BUY if action == 'buy' else mt5.ORDER_TYPE_SELL
 
-            # Get symbol info
-            symbol_info = mt5.symbol_info(self.symbol)
-            # print(f"Can trade: {symbol_info.trade_mode}") 
-            # print(symbol_info._asdict())
-
-            if not symbol_info:
+            # Cached symbol spec: no symbol_info round trip on the order path
+            spec = SymbolSpecs.SPECS.get(self.symbol)
+            if not spec:
                 print(f"Symbol {self.symbol} not be found, cannot place order.")
                 return False
 
-            point = symbol_info.point
-            price = mt5.symbol_info_tick(self.symbol).ask if action == 'buy' else mt5.symbol_info_tick(self.symbol).bid
+            # One tick snapshot so bid and ask come from the same quote
+            tick = mt5.symbol_info_tick(self.symbol)
+            if tick is None:
+                print(f"❌ No tick for {self.symbol}, cannot place order.")
+                return False
+            point = spec.point
+            price = tick.ask if action == 'buy' else tick.bid
+            direction = 1 if order_type == mt5.ORDER_TYPE_BUY else -1
 
             # Prepare order request
             request = {
                 "action": mt5.TRADE_ACTION_DEAL,
                 "symbol": self.symbol,
-                "volume": self.lot_size,
+                "volume": spec.round_volume(self.lot_size),
                 "type": order_type,
                 "price": price,
-                "sl": price - stop_loss * point if order_type == mt5.ORDER_TYPE_BUY else price + stop_loss * point,
-                "tp": price + take_profit * point if order_type == mt5.ORDER_TYPE_BUY else price - take_profit * point,
+                "sl": spec.round_price(price - direction * stop_loss * point),
+                "tp": spec.round_price(price + direction * take_profit * point),
                 "deviation": 10,
                 "magic": self.magic_number,
                 "comment": f"{action.capitalize()} trade by Moving Average strategy",
                 "type_time": mt5.ORDER_TIME_GTC,
-                "type_filling": mt5.ORDER_FILLING_IOC,
+                "type_filling": spec.filling_type(),
             }
 
             result = None
-            # Send order
-            if symbol_info.trade_mode == 0:
+            # Send the order unless trading is disabled for the symbol; then only the signal goes out
+            if spec.trade_mode != mt5.SYMBOL_TRADE_MODE_DISABLED:
                 result = mt5.order_send(request)
                 if result is None:
                     print("❌ mt5.order_send() returned None — check if MetaTrader is initialized and logged in.")
@@ -69,17 +78,16 @@ class MT5TradingAlgorithm:
                 
                 else:
                     print(f"✅ {action.capitalize()} order placed at {price}. Retcode: {result.retcode}")
-                    self.telegram.send_message(f"🟢Placed {action} {self.symbol} @ {request['price']} | TP: {request['tp']} | SL: {request['sl']}\n NB: use proper risk management")
+                    self.telegram.send_message(f"🟢Placed {action} {self.symbol} @ {request['price']} | TP: {request['tp']} | SL: {request['sl']}\n NB: use proper risk management", symbol=self.symbol)
                 
-                    self.TradesData.add(request)
-                    self.TradesData = self.TradesData.drop(columns=['type_time', 'comment', 'type_filling', 'deviation'])
+                    self.TradesData = pd.DataFrame([request]).drop(columns=['type_time', 'comment', 'type_filling', 'deviation'])
                     self.current_position = action
                     print(f"🟢 {self.symbol} Placing {action.upper()} order...")
                     return True, request
                     
             else:
                 print(f'sending Telegram: {self.symbol} {action} signal...')
-                self.telegram.send_message(f"🟢 {action} {self.symbol} | TP: {request['tp']} | SL: {request['sl']}\n NB: use proper risk management")
+                self.telegram.send_message(f"🟢 {action} {self.symbol} | TP: {request['tp']} | SL: {request['sl']}\n NB: use proper risk management", symbol=self.symbol)
                 return True
             
         except Exception as e:
@@ -0,0 +1,202 @@
+import os
+import threading
+
+import numpy as np
+
+from advisor.Client.Rates import RATES_DTYPE
+from advisor.Client import Timeframes
+
+
+class ColumnStore:
+    """
+    On-disk columnar store of time-keyed records, partitioned by key and month.
+
+    Layout: <root>/<key...>/<YYYY-MM>/<column>.bin, one raw little-endian file per
+    field of `dtype`. Raw files can be opened with numpy.memmap without any
+    parsing. Appending newer records is a plain file append. Records that
+    overlap existing times are upserted by rewriting only the affected month.
+    The `time` column is written last, and its length is the partition length,
+    so an interrupted append is never visible to readers.
+    """
+
+    def __init__(self, root, dtype):
+        if 'time' not in dtype.names:
+            raise ValueError("dtype must have a 'time' field.")
+        self.root = root
+        self.dtype = dtype
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    # ---------- writing ----------
+
+    def upsert(self, key, records):
+        """Insert or replace records by time. Returns the number of records written."""
+        records = np.asarray(records)
+        if len(records) == 0:
+            return 0
+        records = records.astype(self.dtype, copy=False)
+        months = _month_index(records['time'])
+        written = 0
+        with self._lock:
+            for month in np.unique(months):
+                chunk = records[months == month]
+                chunk = chunk[np.argsort(chunk['time'], kind='stable')]
+                path = self._partition(key, _month_name(month))
+                existing = self._read_partition(path)
+                if len(existing) == 0 or chunk['time'][0] > existing['time'][-1]:
+                    self._append(path, _dedupe(chunk))
+                else:
+                    self._rewrite(path, _dedupe(np.concatenate([existing, chunk])))
+                written += len(chunk)
+        return written
+
+    append = upsert
+
+    # ---------- reading ----------
+
+    def read_columns(self, key, start=None, end=None, columns=None):
+        """
+        Records with start <= time <= end as a dict of column arrays.
+
+        A range inside one month is returned as read-only memmap views (zero copy);
+        ranges spanning months are concatenated.
+        """
+        return self._columns(key, start, end, columns)
+
+    def read(self, key, start=None, end=None):
+        """Records in [start, end] as a structured array of `dtype` (a copy)."""
+        columns = self._columns(key, start, end)
+        records = np.empty(len(columns['time']), dtype=self.dtype)
+        for name in self.dtype.names:
+            records[name] = columns[name]
+        return records
+
+    def last_time(self, key):
+        for month in reversed(self.months(key)):
+            times = self._column(self._partition(key, month), 'time')
+            if len(times):
+                return int(times[-1])
+        return None
+
+    def months(self, key):
+        directory = os.path.join(self.root, *map(str, key))
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name for name in os.listdir(directory) if len(name) == 7 and name[4] == '-')
+
+    # ---------- internals ----------
+
+    def _columns(self, key, start=None, end=None, columns=None):
+        columns = columns or self.dtype.names
+        start, end = Timeframes.to_epoch(start), Timeframes.to_epoch(end)
+        parts = []
+        for month in self.months(key):
+            if not _month_overlaps(month, start, end):
+                continue
+            path = self._partition(key, month)
+            times = self._column(path, 'time')
+            lo = 0 if start is None else int(np.searchsorted(times, start, side='left'))
+            hi = len(times) if end is None else int(np.searchsorted(times, end, side='right'))
+            if hi > lo:
+                parts.append({name: self._column(path, name, len(times))[lo:hi] for name in columns})
+        if not parts:
+            return {name: np.empty(0, dtype=self.dtype[name]) for name in columns}
+        if len(parts) == 1:
+            return parts[0]
+        return {name: np.concatenate([part[name] for part in parts]) for name in columns}
+
+    def _partition(self, key, month):
+        return os.path.join(self.root, *map(str, key), month)
+
+    def _column(self, path, name, length=None):
+        file_name = os.path.join(path, f"{name}.bin")
+        dtype = self.dtype[name]
+        if not os.path.exists(file_name):
+            return np.empty(0, dtype=dtype)
+        if length is None:
+            length = os.path.getsize(file_name) // dtype.itemsize
+        if length == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(file_name, dtype=dtype, mode='r', shape=(length,))
+
+    def _read_partition(self, path):
+        times = self._column(path, 'time')
+        records = np.empty(len(times), dtype=self.dtype)
+        for name in self.dtype.names:
+            records[name] = self._column(path, name, len(times))
+        return records
+
+    def _append(self, path, records):
+        os.makedirs(path, exist_ok=True)
+        length = len(self._column(path, 'time'))
+        names = [name for name in self.dtype.names if name != 'time'] + ['time']
+        for name in names:
+            file_name = os.path.join(path, f"{name}.bin")
+            with open(file_name, 'ab') as f:
+                # Drop bytes left over by an interrupted append before extending
+                f.truncate(length * self.dtype[name].itemsize)
+                f.write(np.ascontiguousarray(records[name]).tobytes())
+
+    def _rewrite(self, path, records):
+        os.makedirs(path, exist_ok=True)
+        names = [name for name in self.dtype.names if name != 'time'] + ['time']
+        for name in names:
+            file_name = os.path.join(path, f"{name}.bin")
+            with open(file_name + ".tmp", 'wb') as f:
+                f.write(np.ascontiguousarray(records[name]).tobytes())
+            os.replace(file_name + ".tmp", file_name)
+
+
+class BarStore(ColumnStore):
+    """
+    Local history of MT5 bars, keyed by symbol and timeframe, in the copy_rates_* dtype.
+
+    Usage:
+        store = BarStore("~/Documents/TradingBotData/bars")
+        store.upsert("EURUSD", mt5.TIMEFRAME_H1, rates)
+        rates = store.read_range("EURUSD", mt5.TIMEFRAME_H1, start, end)
+    """
+
+    def __init__(self, root):
+        super().__init__(os.path.expanduser(root), RATES_DTYPE)
+
+    def upsert(self, symbol, timeframe, rates):
+        return super().upsert(self._key(symbol, timeframe), rates)
+
+    append = upsert
+
+    def read_range(self, symbol, timeframe, start=None, end=None):
+        return self.read(self._key(symbol, timeframe), start, end)
+
+    def read_columns(self, symbol, timeframe, start=None, end=None, columns=None):
+        return super().read_columns(self._key(symbol, timeframe), start, end, columns)
+
+    def last_time(self, symbol, timeframe):
+        return super().last_time(self._key(symbol, timeframe))
+
+    @staticmethod
+    def _key(symbol, timeframe):
+        return (symbol, Timeframes.timeframe_name(timeframe))
+
+
+def _dedupe(records):
+    """Sort by time and keep the last record written for each time."""
+    order = np.argsort(records['time'], kind='stable')
+    records = records[order]
+    keep = np.append(records['time'][1:] != records['time'][:-1], True)
+    return records[keep]
+
+
+def _month_index(times):
+    return np.asarray(times, dtype='datetime64[s]').astype('datetime64[M]').astype(np.int64)
+
+
+def _month_name(month_index):
+    year, month = divmod(int(month_index), 12)
+    return f"{1970 + year:04d}-{month + 1:02d}"
+
+
+def _month_overlaps(month, start, end):
+    first = int(np.datetime64(month, 's').astype(np.int64))
+    following = int((np.datetime64(month, 'M') + 1).astype('datetime64[s]').astype(np.int64))
+    return (start is None or following > start) and (end is None or first <= end)
@@ -1,18 +1,165 @@
-import mysql.connector
+import queue
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-import MetaTrader5 as mt5  # Assuming you're using MetaTrader5 for data fetching
+
+CANDLE_COLUMNS = ["symbol", "timestamp", "open_price", "high_price", "low_price", "close_price", "volume"]
+# Unique key the candle upsert relies on: (name, columns)
+CANDLE_KEY = ("symbol_timestamp", ["symbol", "timestamp"])
+
+
+class MySQLDialect:
+	"""SQL differences for MySQL (mysql.connector)."""
+	placeholder = "%s"
+
+	@staticmethod
+	def candle_schema():
+		return """
+			id INT AUTO_INCREMENT PRIMARY KEY,
+			symbol VARCHAR(10),
+			timestamp DATETIME,
+			open_price FLOAT,
+			high_price FLOAT,
+			low_price FLOAT,
+			close_price FLOAT,
+			volume FLOAT,
+			UNIQUE KEY symbol_timestamp (symbol, timestamp)
+		"""
+
+	@staticmethod
+	def upsert_clause(conflict_columns, update_columns):
+		updates = ", ".join(f"{column} = VALUES({column})" for column in update_columns)
+		return f"ON DUPLICATE KEY UPDATE {updates}"
+
+	@staticmethod
+	def has_unique_key(cursor, table_name, name, columns):
+		cursor.execute(f"SHOW INDEX FROM {table_name} WHERE Key_name = %s", (name,))
+		return len(cursor.fetchall()) > 0
+
+	@staticmethod
+	def add_unique_key(table_name, name, columns):
+		return f"ALTER TABLE {table_name} ADD UNIQUE KEY {name} ({', '.join(columns)})"
+
+
+class SQLiteDialect:
+	"""SQL differences for sqlite3, used as a local stand-in for MySQL in tests and benchmarks."""
+	placeholder = "?"
+
+	@staticmethod
+	def candle_schema():
+		return """
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			symbol VARCHAR(10),
+			timestamp DATETIME,
+			open_price FLOAT,
+			high_price FLOAT,
+			low_price FLOAT,
+			close_price FLOAT,
+			volume FLOAT,
+			UNIQUE (symbol, timestamp)
+		"""
+
+	@staticmethod
+	def upsert_clause(conflict_columns, update_columns):
+		updates = ", ".join(f"{column} = excluded.{column}" for column in update_columns)
+		return f"ON CONFLICT ({', '.join(conflict_columns)}) DO UPDATE SET {updates}"
+
+	@staticmethod
+	def has_unique_key(cursor, table_name, name, columns):
+		"""Any unique index on exactly `columns`; inline UNIQUE constraints get generated names."""
+		cursor.execute(f"PRAGMA index_list({table_name})")
+		for index in [row[1] for row in cursor.fetchall() if row[2]]:
+			cursor.execute(f"PRAGMA index_info({index})")
+			if [row[2] for row in cursor.fetchall()] == list(columns):
+				return True
+		return False
+
+	@staticmethod
+	def add_unique_key(table_name, name, columns):
+		return f"CREATE UNIQUE INDEX {name} ON {table_name} ({', '.join(columns)})"
+
+
+class ConnectionPool:
+	"""
+	Thread-safe pool of DB-API connections.
+
+	Connections are created lazily up to `size`; a thread that finds the pool
+	exhausted waits up to `timeout` seconds for one to be returned.
+	"""
+
+	def __init__(self, factory, size=5, timeout=30.0):
+		self.factory = factory
+		self.size = size
+		self.timeout = timeout
+		self._idle = queue.LifoQueue()
+		self._created = 0
+		self._lock = threading.Lock()
+
+	@contextmanager
+	def connection(self):
+		connection = self._acquire()
+		try:
+			yield connection
+		except Exception:
+			connection.rollback()
+			raise
+		finally:
+			self._idle.put(connection)
+
+	def close(self):
+		while True:
+			try:
+				self._idle.get_nowait().close()
+			except queue.Empty:
+				break
+
+	def _acquire(self):
+		try:
+			return self._idle.get_nowait()
+		except queue.Empty:
+			pass
+		with self._lock:
+			if self._created < self.size:
+				self._created += 1
+				create = True
+			else:
+				create = False
+		if create:
+			try:
+				return self.factory()
+			except Exception:
+				with self._lock:
+					self._created -= 1
+				raise
+		try:
+			return self._idle.get(timeout=self.timeout)
+		except queue.Empty:
+			raise TimeoutError(f"No database connection available after {self.timeout}s.")
+
 
 # Database Utility Class
 class MySQLDatabase:
-	def __init__(self, host, user, password, database):
+	def __init__(self, host, user, password, database, pool_size=5, connect=None, dialect=MySQLDialect):
+		"""
+		:param connect: optional connection factory replacing mysql.connector.connect,
+						e.g. lambda: sqlite3.connect(path, check_same_thread=False) with SQLiteDialect.
+		"""
 		self.host = host
 		self.user = user
 		self.password = password
 		self.database = database
+		self.dialect = dialect
+		self._connect = connect
+		self.pool = ConnectionPool(self.connect, size=pool_size)
+		self._checked_keys = set()  # (table, key name) already known to exist
 		self.connection = self.connect()
 		self.cursor = self.connection.cursor()
 
 	def connect(self):
+		if self._connect is not None:
+			return self._connect()
+		import mysql.connector
+
 		return mysql.connector.connect(
 			host=self.host,
 			user=self.user,
@@ -20,16 +167,46 @@ class MySQLDatabase:
 			database=self.database
 		)
 
-	def create_table(self, table_name, schema):
+	def create_table(self, table_name, schema, unique_key=None):
+		"""
+		Create `table_name` if it does not exist.
+
+		:param unique_key: optional (name, columns) the table must have. Tables created before
+						   the key existed are migrated: duplicate rows are removed, keeping the
+						   newest (highest id) of each, and the key is added.
+		"""
 		create_table_query = f"""
 		CREATE TABLE IF NOT EXISTS {table_name} (
 				{schema}
 		);
 		"""
-		self.cursor.execute(create_table_query)
+		# Pooled so worker threads can create tables without sharing self.cursor
+		with self.pool.connection() as connection:
+			cursor = connection.cursor()
+			try:
+				cursor.execute(create_table_query)
+				if unique_key is not None and (table_name, unique_key[0]) not in self._checked_keys:
+					self._ensure_unique_key(cursor, table_name, *unique_key)
+					self._checked_keys.add((table_name, unique_key[0]))
+				connection.commit()
+			finally:
+				cursor.close()
+
+	def _ensure_unique_key(self, cursor, table_name, name, columns):
+		if self.dialect.has_unique_key(cursor, table_name, name, columns):
+			return
+		print(f"Migrating {table_name}: removing duplicate rows and adding unique key {name}...")
+		group = ", ".join(columns)
+		# The derived table lets MySQL read the table it deletes from
+		cursor.execute(f"""
+		DELETE FROM {table_name} WHERE id NOT IN (
+			SELECT id FROM (SELECT MAX(id) AS id FROM {table_name} GROUP BY {group}) AS newest
+		)
+		""")
+		cursor.execute(self.dialect.add_unique_key(table_name, name, columns))
 
 	def insert_row(self, table_name, columns, values):
-		placeholders = ", ".join(["%s"] * len(values))
+		placeholders = ", ".join([self.dialect.placeholder] * len(values))
 		columns_string = ", ".join(columns)
 		insert_query = f"""
 		INSERT INTO {table_name} ({columns_string})
@@ -51,17 +228,63 @@ class MySQLDatabase:
 			self.cursor.execute(delete_query)
 			self.connection.commit()
 
+	def insert_rows(self, table_name, columns, rows, conflict_columns=None, batch_size=500, max_rows=None):
+		"""
+		Bulk insert `rows` (sequences ordered like `columns`) on a pooled connection.
+
+		Rows go out as multi-row INSERT statements of up to `batch_size` rows. With
+		`conflict_columns` they upsert on that unique key instead of failing. When
+		`max_rows` is given, retention runs once after the whole batch and everything
+		is committed in one transaction.
+
+		:return: number of rows sent.
+		"""
+		rows = [tuple(row) for row in rows]
+		if not rows:
+			return 0
+		columns_string = ", ".join(columns)
+		row_placeholder = "(" + ", ".join([self.dialect.placeholder] * len(columns)) + ")"
+		upsert = ""
+		if conflict_columns:
+			update_columns = [column for column in columns if column not in conflict_columns]
+			upsert = self.dialect.upsert_clause(conflict_columns, update_columns)
+
+		with self.pool.connection() as connection:
+			cursor = connection.cursor()
+			try:
+				for start in range(0, len(rows), batch_size):
+					batch = rows[start:start + batch_size]
+					insert_query = f"INSERT INTO {table_name} ({columns_string}) VALUES " \
+						f"{', '.join([row_placeholder] * len(batch))} {upsert}"
+					cursor.execute(insert_query, [value for row in batch for value in row])
+				if max_rows is not None:
+					self.trim_rows(table_name, max_rows, cursor)
+				connection.commit()
+			finally:
+				cursor.close()
+		return len(rows)
+
+	def trim_rows(self, table_name, max_rows, cursor):
+		"""Keep only the newest `max_rows` rows (by id) with two statements, whatever the row count."""
+		cursor.execute(f"SELECT id FROM {table_name} ORDER BY id DESC LIMIT 1 OFFSET {int(max_rows)}")
+		boundary = cursor.fetchone()
+		if boundary is not None:
+			cursor.execute(f"DELETE FROM {table_name} WHERE id <= {self.dialect.placeholder}", (boundary[0],))
+
 	def commit(self):
 		self.connection.commit()
 
 	def close(self):
 		self.cursor.close()
 		self.connection.close()
+		self.pool.close()
 
 # MetaTrader5 Data Fetcher
 class MetaTrader5Data:
 	@staticmethod
 	def fetch_candles(symbol, timeframe, num_candles):
+		from advisor.Client.Backend import mt5
+
 		if not mt5.initialize():
 				raise Exception("MetaTrader5 initialization failed")
 		
@@ -81,37 +304,27 @@ class MetaTrader5Data:
 		return candles
 
 # Reusable Candle Data Saver
-	def save_candle_data(db, table_name, candles, max_rows=200):
-		# Create the table if it doesn't exist
-		schema = """
-			id INT AUTO_INCREMENT PRIMARY KEY,
-			symbol VARCHAR(10),
-			timestamp DATETIME,
-			open_price FLOAT,
-			high_price FLOAT,
-			low_price FLOAT,
-			close_price FLOAT,
-			volume FLOAT
+	def save_candle_data(db, table_name, candles, max_rows=200, symbol="USDCHF"):
+		"""
+		Upsert candles on (symbol, timestamp) in multi-row batches and apply the
+		row limit once per call instead of once per candle.
 		"""
-		db.create_table(table_name, schema)
-
-		# Insert candles and maintain row limit
-		for candle in candles:
-			db.insert_row(
-				table_name,
-				["symbol", "timestamp", "open_price", "high_price", "low_price", "close_price", "volume"],
-				[
-					"USDCHF",  # Example symbol, update dynamically if needed
-					candle["timestamp"],
-					candle["open_price"],
-					candle["high_price"],
-					candle["low_price"],
-					candle["close_price"],
-					candle["volume"]
-				]
+		# Create the table if it doesn't exist
+		db.create_table(table_name, db.dialect.candle_schema(), unique_key=CANDLE_KEY)
+
+		rows = [
+			(
+				symbol,
+				candle["timestamp"],
+				candle["open_price"],
+				candle["high_price"],
+				candle["low_price"],
+				candle["close_price"],
+				candle["volume"]
 			)
-			db.delete_oldest_rows(table_name, max_rows)
-		db.commit()
+			for candle in candles
+		]
+		return db.insert_rows(table_name, CANDLE_COLUMNS, rows, conflict_columns=["symbol", "timestamp"], max_rows=max_rows)
 
 """# Main Program
 if __name__ == "__main__":
@@ -0,0 +1,144 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from advisor.Client import Timeframes
+from advisor.database.BarStore import ColumnStore
+
+# One record per processed LTF bar; side is 1 for Buy, -1 for Sell and 0 for no signal
+SIGNAL_DTYPE = np.dtype([
+    ('time', '<i8'), ('close', '<f8'), ('Fast_MA', '<f8'), ('Slow_MA', '<f8'),
+    ('side', 'i1'), ('Level', '<f8'), ('SL', '<f8'), ('TP', '<f8'),
+])
+SIDES = {'Buy': 1, 'Sell': -1}
+
+
+class SignalLog(ColumnStore):
+    """
+    Per-symbol log of the processed entry-level frame, appended incrementally.
+
+    Each append keeps only the bars newer than the symbol's high-water mark (the last
+    persisted time), so re-running the strategy on a growing window never writes a
+    bar twice. Storage is the month-partitioned ColumnStore; last_signals() walks
+    partitions from the newest and stops once it has N signals. With `csv_dir` the
+    new rows are also appended to <csv_dir>/<symbol>_entry_levels.csv.
+
+    Usage:
+        log = SignalLog("~/Documents/TradingBotData/signals")
+        log.append("EURUSD", entries)  # identify_entry_levels output
+        recent = log.last_signals("EURUSD", 20)
+    """
+
+    def __init__(self, root, csv_dir=None):
+        super().__init__(os.path.expanduser(root), SIGNAL_DTYPE)
+        self.csv_dir = csv_dir
+        self._watermarks = {}
+
+    def watermark(self, symbol):
+        """Time (UTC epoch) of the newest persisted bar for `symbol`, or None."""
+        if symbol not in self._watermarks:
+            self._watermarks[symbol] = self.last_time((symbol,))
+        return self._watermarks[symbol]
+
+    def append(self, symbol, entries):
+        """Persist the rows of `entries` newer than the high-water mark. Returns the number written."""
+        records = to_records(entries)
+        watermark = self.watermark(symbol)
+        fresh = records['time'] > watermark if watermark is not None else np.ones(len(records), dtype=bool)
+        if not fresh.any():
+            return 0
+        written = self.upsert((symbol,), records[fresh])
+        self._watermarks[symbol] = int(records['time'][fresh].max())
+        if self.csv_dir is not None:
+            append_csv(os.path.join(self.csv_dir, f"{symbol}_entry_levels.csv"), entries[fresh])
+        return written
+
+    def last_signals(self, symbol, n):
+        """The newest `n` Buy/Sell records in time order, reading only the partitions needed."""
+        parts, found = [], 0
+        if n <= 0:
+            return np.empty(0, dtype=self.dtype)
+        for month in reversed(self.months((symbol,))):
+            path = self._partition((symbol,), month)
+            length = len(self._column(path, 'time'))
+            side = self._column(path, 'side', length)
+            positions = np.flatnonzero(side)[-(n - found):]
+            if len(positions):
+                records = np.empty(len(positions), dtype=self.dtype)
+                for name in self.dtype.names:
+                    records[name] = self._column(path, name, length)[positions]
+                parts.append(records)
+                found += len(positions)
+            if found >= n:
+                break
+        if not parts:
+            return np.empty(0, dtype=self.dtype)
+        return np.concatenate(parts[::-1])
+
+    def read_frame(self, symbol, start=None, end=None):
+        return to_frame(self.read((symbol,), start, end))
+
+    def export_csv(self, symbol, path, start=None, end=None):
+        """Write the logged rows in [start, end] to `path` as CSV, replacing the file."""
+        self.read_frame(symbol, start, end).to_csv(path, index=False)
+        return path
+
+
+def to_records(entries):
+    """identify_entry_levels output (DataFrame) as SIGNAL_DTYPE records."""
+    records = np.zeros(len(entries), dtype=SIGNAL_DTYPE)
+    records['time'] = Timeframes.epoch_seconds(entries['time'])
+    for name in ('close', 'Fast_MA', 'Slow_MA', 'Level', 'SL', 'TP'):
+        records[name] = entries[name].to_numpy(dtype=float) if name in entries else np.nan
+    if 'Entry' in entries:
+        side = entries['Entry'].to_numpy(dtype=object)
+        for name, value in SIDES.items():
+            records['side'][side == name] = value
+    return records
+
+
+def to_frame(records):
+    frame = pd.DataFrame({name: records[name] for name in SIGNAL_DTYPE.names if name != 'side'})
+    frame['time'] = pd.to_datetime(frame['time'], unit='s')
+    frame.insert(4, 'Entry', np.select([records['side'] == 1, records['side'] == -1], ['Buy', 'Sell'], None))
+    return frame
+
+
+def csv_last_time(path):
+    """
+    Time of the last row of a CSV written by append_csv/save_signals_to_csv, or None.
+
+    Reads only the header and the file's tail.
+    """
+    if not os.path.isfile(path) or os.path.getsize(path) == 0:
+        return None
+    with open(path, 'rb') as f:
+        header = f.readline().decode('utf-8').rstrip('\r\n').split(',')
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - 64 * 1024))
+        lines = f.read().decode('utf-8', errors='replace').splitlines()
+    if 'time' not in header or len(lines) < 2 or not lines[-1].strip():
+        return None
+    last = lines[-1].split(',')[header.index('time')]
+    return int(last) if last.isdigit() else int(pd.Timestamp(last).timestamp())
+
+
+def append_csv(path, entries):
+    """
+    Append the rows of `entries` newer than the file's last time to the CSV at `path`.
+
+    Creates the file (with a header) when missing. Returns the number of rows written.
+    """
+    last = csv_last_time(path)
+    if last is not None:
+        entries = entries[Timeframes.epoch_seconds(entries['time']) > last]
+    if len(entries) == 0:
+        return 0
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    new_file = not os.path.isfile(path) or os.path.getsize(path) == 0
+    entries.to_csv(path, index=False, mode='w' if new_file else 'a', header=new_file)
+    return len(entries)
@@ -0,0 +1,46 @@
+"""Test doubles shared by several test modules."""
+
+NOW = 1_700_000_000
+
+
+class FakeClock:
+    """
+    Clock that only moves when told to: by sleep() or by setting `now` / `mono`.
+
+    Stands in for SystemClock wherever a clock is injected (MT5Simulator,
+    BarCloseScheduler, SymbolSpecCache). Every sleep is recorded in `slept`.
+    """
+
+    def __init__(self, now=NOW, mono=1000.0):
+        self.now = now
+        self.mono = mono
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.mono
+
+    def sleep(self, seconds, stop_event=None):
+        self.slept.append(seconds)
+        self.now += seconds
+        self.mono += seconds
+        return False
+
+
+class FakeMessenger:
+    """Stands in for TelegramMessenger and keeps every message text it was asked to send."""
+
+    def __init__(self):
+        self.messages = []
+
+    def send_message(self, message, symbol=None):
+        self.messages.append(message)
+        return True
+
+    def close(self, timeout=None):
+        pass
@@ -0,0 +1,57 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Client.BarCache import BarCache
+
+RATES_DTYPE = np.dtype([('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+                        ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8')])
+
+
+class FakeTerminal:
+    def __init__(self, bars):
+        self.bars = bars
+        self.requests = []
+
+    def rates(self):
+        rates = np.zeros(self.bars, dtype=RATES_DTYPE)
+        rates['time'] = np.arange(self.bars) * 3600
+        rates['close'] = np.arange(self.bars, dtype=float)
+        rates['close'][-1] += 0.5  # still-forming bar keeps changing
+        return rates
+
+    def copy_rates_from_pos(self, symbol, timeframe, count):
+        self.requests.append(count)
+        return self.rates()[-count:]
+
+
+class Test_BarCache(unittest.TestCase):
+
+    def test_DeltaFetchMatchesFullHistory(self):
+        terminal = FakeTerminal(500)
+        cache = BarCache(history=100)
+
+        cache.get('EURUSD', 16385, terminal.copy_rates_from_pos)
+        for new_bars in [0, 1, 2, 7, 60, 1, 300]:
+            terminal.bars += new_bars
+            rates = cache.get('EURUSD', 16385, terminal.copy_rates_from_pos)
+            np.testing.assert_array_equal(rates, terminal.rates()[-100:])
+
+        stats = cache.stats()
+        self.assertEqual(terminal.requests[:3], [100, 3, 3])
+        self.assertEqual(stats['misses'], 2)  # cold start and the 300-bar gap
+        self.assertEqual(stats['hits'], 6)
+        self.assertEqual(stats['bytes_transferred'], RATES_DTYPE.itemsize * stats['bars_transferred'])
+
+    def test_FailedFetchReturnsNone(self):
+        cache = BarCache(history=10)
+        self.assertIsNone(cache.get('EURUSD', 16385, lambda symbol, timeframe, count: None))
+        self.assertEqual(cache.stats()['series'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
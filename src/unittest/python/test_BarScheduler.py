@@ -0,0 +1,59 @@
+import calendar
+import os
+import sys
+import threading
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from advisor.Scheduler.BarScheduler import BarCloseScheduler
+from fakes import FakeClock
+
+TIMEFRAME_M15 = 15
+TIMEFRAME_H1 = 0x4000 | 1
+TIMEFRAME_H4 = 0x4000 | 4
+TIMEFRAME_W1 = 0x8000 | 1
+TIMEFRAME_MN1 = 0xC000 | 1
+
+
+class Test_BarScheduler(unittest.TestCase):
+
+    def setUp(self):
+        # Wednesday 2024-01-03 10:20:00 UTC
+        self.now = calendar.timegm((2024, 1, 3, 10, 20, 0))
+        self.clock = FakeClock(self.now)
+        self.scheduler = BarCloseScheduler({"HTF": TIMEFRAME_H4, "LTF": TIMEFRAME_H1}, grace=5, clock=self.clock)
+
+    def test_NextFireTimes(self):
+        fire_times = self.scheduler.next_fire_times()
+        self.assertEqual(fire_times["LTF"], calendar.timegm((2024, 1, 3, 11, 0, 5)))
+        self.assertEqual(fire_times["HTF"], calendar.timegm((2024, 1, 3, 12, 0, 5)))
+        self.assertEqual(self.scheduler.next_close(TIMEFRAME_M15), calendar.timegm((2024, 1, 3, 10, 30, 0)))
+        self.assertEqual(self.scheduler.next_close(TIMEFRAME_W1), calendar.timegm((2024, 1, 7, 0, 0, 0)))
+        self.assertEqual(self.scheduler.next_close(TIMEFRAME_MN1), calendar.timegm((2024, 2, 1, 0, 0, 0)))
+
+    def test_ServerOffsetShiftsBoundaries(self):
+        scheduler = BarCloseScheduler({"HTF": TIMEFRAME_H4}, grace=0, server_offset=2 * 3600, clock=self.clock)
+        # 12:20 server time, the H4 bar closes at 16:00 server = 14:00 UTC
+        self.assertEqual(scheduler.next_close("HTF"), calendar.timegm((2024, 1, 3, 14, 0, 0)))
+
+    def test_WaitUsesInjectedClockAndDoesNotDrift(self):
+        fired = []
+        stop = threading.Event()
+
+        def evaluate(fire_time):
+            fired.append(fire_time)
+            self.clock.now += 37  # a slow cycle must not push the next wake-up back
+            self.clock.mono += 37
+            if len(fired) == 3:
+                stop.set()
+
+        self.scheduler.run("LTF", evaluate, stop)
+
+        self.assertEqual(fired, [calendar.timegm((2024, 1, 3, hour, 0, 5)) for hour in (11, 12, 13)])
+        self.assertEqual(self.clock.now, fired[-1] + 37)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Client.Rates import RATES_DTYPE
+from advisor.database.BarStore import BarStore
+
+TIMEFRAME_H1 = 0x4000 | 1
+
+
+def hourly_rates(start, bars, price=1.0):
+    rates = np.zeros(bars, dtype=RATES_DTYPE)
+    rates['time'] = start + np.arange(bars) * 3600
+    rates['close'] = price + np.arange(bars)
+    return rates
+
+
+class Test_BarStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = BarStore(self.directory.name)
+        self.start = 1_704_067_200  # 2024-01-01 00:00 UTC
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_AppendAndRangeAcrossMonths(self):
+        rates = hourly_rates(self.start, 24 * 45)
+        self.store.append("EURUSD", TIMEFRAME_H1, rates[:500])
+        self.store.append("EURUSD", TIMEFRAME_H1, rates[500:])
+
+        self.assertEqual(self.store.months(("EURUSD", "H1")), ["2024-01", "2024-02"])
+        self.assertEqual(self.store.last_time("EURUSD", TIMEFRAME_H1), rates['time'][-1])
+        np.testing.assert_array_equal(self.store.read_range("EURUSD", TIMEFRAME_H1), rates)
+
+        window = self.store.read_range("EURUSD", TIMEFRAME_H1, rates['time'][700], rates['time'][800])
+        np.testing.assert_array_equal(window, rates[700:801])
+
+    def test_UpsertReplacesOverlappingBars(self):
+        self.store.upsert("EURUSD", TIMEFRAME_H1, hourly_rates(self.start, 10))
+        self.store.upsert("EURUSD", TIMEFRAME_H1, hourly_rates(self.start + 8 * 3600, 4, price=100.0))
+
+        stored = self.store.read_range("EURUSD", TIMEFRAME_H1)
+        self.assertEqual(len(stored), 12)
+        self.assertEqual(list(stored['close'][7:]), [8.0, 100.0, 101.0, 102.0, 103.0])
+
+    def test_SingleMonthReadIsMemoryMapped(self):
+        self.store.append("EURUSD", TIMEFRAME_H1, hourly_rates(self.start, 100))
+        columns = self.store.read_columns("EURUSD", TIMEFRAME_H1, columns=['time', 'close'])
+        self.assertIsInstance(columns['close'], np.memmap)
+        self.assertEqual(len(columns['time']), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Backtest import BatchBacktest
+from advisor.Client import Backend
+from advisor.Client.Advisor import MetaTrader5Client
+from advisor.Simulator import MT5Simulator as sim
+from advisor.Trade import SymbolSpecs
+
+SYMBOLS = ["EURUSD", "USDJPY", "GBPUSD"]
+
+
+class Test_BatchBacktest(unittest.TestCase):
+
+    def setUp(self):
+        simulator = sim.MT5Simulator(symbols=SYMBOLS, history=5000)
+        simulator.initialize()
+        previous = Backend.use(simulator)
+        self.addCleanup(Backend.use, previous)
+        self.client = MetaTrader5Client(dialogs=False)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = directory.name
+
+    def test_FetchHistoryIsCompact(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            history = BatchBacktest.fetch_history(self.client, SYMBOLS + ["XXXYYY"])
+        self.assertEqual(sorted(history), sorted(SYMBOLS))
+        ltf = history["EURUSD"]["LTF"]
+        self.assertEqual(set(ltf), set(BatchBacktest.COLUMNS))
+        self.assertEqual(ltf['time'].dtype, np.int64)
+        self.assertEqual(ltf['close'].dtype, np.float64)
+        self.assertGreater(len(ltf['close']), 4 * len(history["EURUSD"]["HTF"]['close']) - 8)
+
+    def test_ProcessPoolMatchesSerialRuns(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            report, trades = BatchBacktest.run_batch_backtest(self.client, SYMBOLS, processes=2,
+                                                              signal_dir=self.dir)
+            history = BatchBacktest.fetch_history(self.client, SYMBOLS)
+
+        self.assertEqual(sorted(report['symbol']), sorted(SYMBOLS))
+        self.assertTrue(report['net_pnl'].is_monotonic_decreasing)
+        for symbol in SYMBOLS:
+            summary, serial_trades = BatchBacktest.backtest_symbol(
+                symbol, history[symbol]['HTF'], history[symbol]['LTF'], pip_size=SymbolSpecs.SPECS.pip(symbol))
+            row = report[report['symbol'] == symbol].iloc[0]
+            for column, value in summary.items():
+                if column != 'seconds':
+                    self.assertEqual(row[column], value, f"{symbol} {column}")
+            np.testing.assert_array_equal(trades[symbol], serial_trades)
+
+            entries = pd.read_csv(os.path.join(self.dir, f"{symbol}_entry_levels.csv"))
+            self.assertGreater(len(serial_trades), 0)
+            self.assertGreater(int(entries['Entry'].isin(['Buy', 'Sell']).sum()), 0)
+            self.assertTrue(entries['time'].is_unique)
+
+
+if __name__ == '__main__':
+    unittest.main()
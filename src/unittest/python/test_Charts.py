@@ -0,0 +1,85 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Backtest import Charts
+
+
+def make_entries(bars=5000, every=7):
+    rng = np.random.default_rng(3)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0005, bars))
+    entry = np.full(bars, None, dtype=object)
+    entry[::every] = 'Buy'
+    entry[3::every] = 'Sell'
+    return pd.DataFrame({
+        'time': pd.date_range("2024-01-01", periods=bars, freq="h"),
+        'close': close,
+        'Fast_MA': pd.Series(close).rolling(20).mean().to_numpy(),
+        'Slow_MA': pd.Series(close).rolling(50).mean().to_numpy(),
+        'Entry': entry,
+        'Level': close,
+        'SL': close - 0.002,
+        'TP': close + 0.006,
+    })
+
+
+class Test_Charts(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = directory.name
+
+    def test_LttbKeepsEndpointsAndSpikes(self):
+        x = np.arange(10_000, dtype=float)
+        y = np.sin(x / 500)
+        y[4321] = 50.0
+        kept = Charts.lttb(x, y, 200)
+        self.assertEqual(len(kept), 200)
+        self.assertEqual((kept[0], kept[-1]), (0, 9999))
+        self.assertIn(4321, kept)
+        self.assertTrue(np.all(np.diff(kept) > 0))
+        np.testing.assert_array_equal(Charts.lttb(x[:50], y[:50], 200), np.arange(50))
+
+    def test_OneCollectionPerKind(self):
+        from matplotlib.collections import LineCollection, PathCollection, PolyCollection
+        from matplotlib.figure import Figure
+
+        entries = make_entries()
+        fig = Figure(figsize=(8, 4), dpi=100)
+        ax = Charts.draw_entries(fig, "EURUSD", entries)
+        markers = [c for c in ax.collections if isinstance(c, PathCollection)]
+        levels = [c for c in ax.collections if isinstance(c, LineCollection)]
+        self.assertEqual(len(markers), 2)
+        self.assertEqual(len(levels), 2)
+        zones = [c.get_label() for c in ax.collections if isinstance(c, PolyCollection)]
+        self.assertEqual(zones, ['Bullish Zone', 'Bearish Zone', 'Range'])
+        self.assertEqual(sum(len(c.get_offsets()) for c in markers), int(entries['Entry'].notna().sum()))
+        self.assertEqual(len(levels[0].get_segments()), int(entries['Entry'].notna().sum()))
+        self.assertTrue(all(len(line.get_xdata()) <= 800 for line in ax.get_lines()))
+
+    def test_RendersPngAndSvgOffScreen(self):
+        entries = make_entries()
+        png = Charts.render_entries("EURUSD", entries, os.path.join(self.dir, "EURUSD.png"),
+                                    equity=np.cumsum(np.ones(len(entries))))
+        svg = Charts.render_entries("EURUSD", entries, os.path.join(self.dir, "svg", "EURUSD.svg"))
+        with open(png, "rb") as f:
+            self.assertEqual(f.read(8), b"\x89PNG\r\n\x1a\n")
+        with open(svg, encoding="utf-8") as f:
+            self.assertIn("<svg", f.read(2000))
+
+    def test_RenderAllInWorkerProcesses(self):
+        charts = {"EURUSD": make_entries(2000), "GBPUSD": (make_entries(2000), np.zeros(2000))}
+        paths = Charts.render_all(charts, self.dir, fmt="png", processes=2)
+        self.assertEqual(sorted(paths), ["EURUSD", "GBPUSD"])
+        self.assertTrue(all(os.path.getsize(path) > 0 for path in paths.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
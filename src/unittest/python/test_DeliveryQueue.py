@@ -0,0 +1,147 @@
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Telegram.DeliveryQueue import DeliveryQueue
+
+
+class FakeTelegram(ThreadingHTTPServer):
+    """Local stand-in for the Bot API that records sendMessage calls, can answer 429 and can stall."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeTelegramHandler)
+        self.messages = []
+        self.connections = set()
+        self.rate_limit_next = 0
+        self.answering = threading.Event()  # cleared: requests stall until it is set again
+        self.answering.set()
+        self.lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FakeTelegramHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode()).items()}
+        self.server.answering.wait(5.0)
+        with self.server.lock:
+            self.server.connections.add(self.client_address)
+            if self.server.rate_limit_next:
+                self.server.rate_limit_next -= 1
+                self.reply(429, {"ok": False, "error_code": 429, "parameters": {"retry_after": 0.2}})
+                return
+            self.server.messages.append((time.monotonic(), form))
+        self.reply(200, {"ok": True})
+
+    def reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class Test_DeliveryQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeTelegram()
+
+    def tearDown(self):
+        self.server.answering.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def queue(self, **kwargs):
+        options = dict(base_url=self.server.base_url, chat_interval=0.0, global_rate=None, digest_window=0.05, backoff=0.05)
+        options.update(kwargs)
+        delivery = DeliveryQueue("TOKEN", **options)
+        self.addCleanup(delivery.close, 2.0)
+        return delivery
+
+    def test_EnqueueDoesNotWaitForTheNetwork(self):
+        delivery = self.queue(digest_threshold=1000)
+        self.server.answering.clear()
+        for i in range(100):
+            delivery.enqueue(1, f"message {i}")
+        # Had enqueue waited for a reply, the stalled server would have recorded one by now
+        self.assertEqual(self.server.messages, [])
+
+        self.server.answering.set()
+        self.assertTrue(delivery.flush(5.0))
+        self.assertEqual([form['text'] for _, form in self.server.messages], [f"message {i}" for i in range(100)])
+        self.assertEqual(self.server.messages[0][1]['parse_mode'], "HTML")
+        self.assertEqual(len(self.server.connections), 1)  # one keep-alive connection
+
+    def test_BurstIsCoalescedIntoDigestPerChat(self):
+        delivery = self.queue(digest_threshold=3)
+        for symbol in ("EURUSD", "GBPUSD", "USDJPY", "AUDUSD"):
+            delivery.enqueue(1, f"🟢 Buy {symbol}")
+        delivery.enqueue(2, "🔴 Sell USDCHF")
+        self.assertTrue(delivery.flush(5.0))
+
+        sent = {form['chat_id']: form['text'] for _, form in self.server.messages}
+        self.assertEqual(len(self.server.messages), 2)
+        self.assertTrue(sent['1'].startswith("📬 4 updates"))
+        self.assertIn("🟢 Buy AUDUSD", sent['1'])
+        self.assertEqual(sent['2'], "🔴 Sell USDCHF")
+        self.assertEqual(delivery.stats()['coalesced'], 4)
+
+    def test_PerChatRateLimit(self):
+        delivery = self.queue(chat_interval=0.2, digest_threshold=1000)
+        for i in range(3):
+            delivery.enqueue(1, f"message {i}")
+        delivery.enqueue(2, "other chat")
+        self.assertTrue(delivery.flush(5.0))
+
+        chat_times = [sent for sent, form in self.server.messages if form['chat_id'] == '1']
+        self.assertGreaterEqual(min(b - a for a, b in zip(chat_times, chat_times[1:])), 0.18)
+        # The other chat is not held back by chat 1's limit
+        other = [sent for sent, form in self.server.messages if form['chat_id'] == '2'][0]
+        self.assertLess(other - chat_times[0], 0.15)
+
+    def test_RetryAfterIsHonoured(self):
+        self.server.rate_limit_next = 1
+        delivery = self.queue()
+        started = time.monotonic()
+        delivery.enqueue(1, "after 429")
+        self.assertTrue(delivery.flush(5.0))
+
+        self.assertEqual(len(self.server.messages), 1)
+        self.assertGreaterEqual(self.server.messages[0][0] - started, 0.2)
+        self.assertEqual(delivery.stats()['rate_limited'], 1)
+
+    def test_UnreachableServerGivesUpAfterRetries(self):
+        delivery = self.queue(base_url="http://127.0.0.1:9", max_retries=2, timeout=0.5)
+        delivery.enqueue(1, "lost")
+        self.assertTrue(delivery.flush(5.0))
+        stats = delivery.stats()
+        self.assertEqual((stats['retries'], stats['failed'], stats['pending']), (2, 1, 0))
+
+    def test_CloseDrainsQueue(self):
+        delivery = self.queue(digest_window=10.0, digest_threshold=1000)
+        delivery.enqueue(1, "last words")
+        delivery.close(2.0)
+        self.assertEqual([form['text'] for _, form in self.server.messages], ["last words"])
+        self.assertFalse(delivery.enqueue(1, "too late"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Backtest.EventBacktester import EXIT_END, EXIT_SL, EXIT_TP, run_backtest
+
+
+class Test_EventBacktester(unittest.TestCase):
+
+    def setUp(self):
+        self.open = np.array([1.00, 1.00, 1.01, 1.02, 1.00, 1.00, 0.99, 0.97])
+        self.high = np.array([1.00, 1.01, 1.02, 1.04, 1.00, 1.00, 0.99, 0.98])
+        self.low = np.array([1.00, 0.995, 1.00, 1.01, 0.99, 0.99, 0.97, 0.96])
+        self.close = np.array([1.00, 1.01, 1.02, 1.03, 1.00, 0.99, 0.98, 0.97])
+        self.direction = np.array([1, 1, 0, 0, -1, 1, 0, 0])
+        self.level = self.close.copy()
+        self.sl = self.close - self.direction * 0.02
+        self.tp = self.close + self.direction * 0.03
+
+    def test_ResolvesExitsAgainstHighLow(self):
+        result = run_backtest(self.open, self.high, self.low, self.close,
+                              self.direction, self.level, self.sl, self.tp)
+        trades = result.trades
+
+        # Buy at bar 0 hits TP 1.03 on bar 3; bar 1's signal is ignored while in a position
+        self.assertEqual((trades[0]['entry_index'], trades[0]['exit_index']), (0, 3))
+        self.assertEqual(trades[0]['exit_reason'], EXIT_TP)
+        self.assertAlmostEqual(trades[0]['pnl'], 0.03)
+
+        # Sell at bar 4 reaches TP 0.97 on bar 6
+        self.assertEqual((trades[1]['entry_index'], trades[1]['exit_index']), (4, 6))
+        self.assertEqual(trades[1]['exit_reason'], EXIT_TP)
+        self.assertEqual(len(trades), 2)
+
+        self.assertAlmostEqual(result.equity[2], 0.02)  # marked to market while open
+        self.assertAlmostEqual(result.equity[-1], trades['pnl'].sum())
+
+    def test_GapThroughStopFillsAtOpen(self):
+        direction = np.array([1, 0, 0])
+        result = run_backtest([1.0, 0.95, 0.95], [1.0, 0.96, 0.96], [1.0, 0.94, 0.94], [1.0, 0.95, 0.95],
+                              direction, [1.0, np.nan, np.nan], [0.98, np.nan, np.nan], [1.05, np.nan, np.nan])
+        self.assertEqual(result.trades[0]['exit_reason'], EXIT_SL)
+        self.assertAlmostEqual(result.trades[0]['exit_price'], 0.95)
+
+    def test_OpenPositionClosedAtEnd(self):
+        result = run_backtest([1.0, 1.0], [1.0, 1.01], [1.0, 0.99], [1.0, 1.005],
+                              [1, 0], [1.0, np.nan], [0.9, np.nan], [1.1, np.nan])
+        self.assertEqual(result.trades[0]['exit_reason'], EXIT_END)
+        self.assertAlmostEqual(result.summary()['net_pnl'], 0.005)
+
+
+if __name__ == '__main__':
+    unittest.main()
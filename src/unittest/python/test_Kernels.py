@@ -0,0 +1,96 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.MovingAverage import Kernels
+from advisor.MovingAverage.MovingAverage import MovingAverageCrossover
+from advisor.MovingAverage.StreamingMA import IndicatorEngine
+
+
+def stream(indicator, *columns):
+    return np.array([np.nan if value is None else value for value in map(indicator.update, *columns)])
+
+
+class Test_Kernels(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        bars = 6000
+        close = 1.10 + np.cumsum(rng.normal(0, 0.0005, bars))
+        spread = np.abs(rng.normal(0, 0.0004, bars))
+        self.close, self.high, self.low = close, close + spread, close - spread
+
+    def test_BatchMatchesStreaming(self):
+        for name in Kernels.MOVING_AVERAGES:
+            for period in (1, 2, 9, 50, 200):
+                batch = Kernels.moving_average(name, self.close, period)
+                streamed = stream(Kernels.streaming(name, period), self.close)
+                np.testing.assert_array_equal(np.isnan(batch), np.isnan(streamed), err_msg=f"{name}({period})")
+                np.testing.assert_allclose(batch, streamed, rtol=0, atol=1e-10, err_msg=f"{name}({period})")
+
+        batch = Kernels.atr(self.high, self.low, self.close, 14)
+        streamed = stream(Kernels.AverageTrueRange(14), self.high, self.low, self.close)
+        np.testing.assert_array_equal(np.isnan(batch), np.isnan(streamed))
+        np.testing.assert_allclose(batch, streamed, rtol=0, atol=1e-12)
+        self.assertEqual(int(np.isnan(batch).sum()), 14)
+
+    def test_MatchesReferenceImplementations(self):
+        series = pd.Series(self.close)
+        for period in (5, 50, 400):
+            np.testing.assert_allclose(Kernels.sma(self.close, period), series.rolling(period).mean(),
+                                       rtol=0, atol=1e-12)
+            np.testing.assert_allclose(Kernels.ema(self.close, period),
+                                       series.ewm(span=period, adjust=False, min_periods=period).mean(),
+                                       rtol=0, atol=1e-12)
+            weights = np.arange(1, period + 1, dtype=float)
+            direct = np.convolve(self.close, weights[::-1], 'valid') / weights.sum()
+            np.testing.assert_allclose(Kernels.wma(self.close, period)[period - 1:], direct, rtol=0, atol=1e-11)
+
+        np.testing.assert_array_equal(Kernels.shifted([1.0, 2.0, 3.0]), [np.nan, 1.0, 2.0])
+        self.assertEqual(len(Kernels.sma(self.close[:3], 5)), 3)
+
+    def test_UnknownNameRaises(self):
+        with self.assertRaises(ValueError):
+            Kernels.moving_average('kama', self.close, 10)
+        with self.assertRaises(ValueError):
+            Kernels.streaming('kama', 10)
+        with self.assertRaises(ValueError):
+            Kernels.sma(self.close, 0)
+        with self.assertRaises(ValueError):
+            MovingAverageCrossover('EURUSD', None, ma_type='kama')
+
+    def test_StrategyWithEmaAndAtrLevels(self):
+        times = pd.date_range("2024-01-01", periods=len(self.close), freq="h")
+        rates = pd.DataFrame({'time': times, 'open': self.close, 'high': self.high, 'low': self.low,
+                              'close': self.close, 'tick_volume': 0, 'real_volume': 0, 'spread': 0})
+        strategy = MovingAverageCrossover('EURUSD', None, fast_period=10, slow_period=40, ma_type='ema',
+                                          sl_atr=1.5, tp_atr=3.0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            data = strategy.calculate_moving_averages(rates.copy())
+            entries = strategy.identify_entry_levels(data.copy(), data.copy())
+
+        expected = pd.Series(self.close).ewm(span=10, adjust=False, min_periods=10).mean().shift()
+        np.testing.assert_allclose(data['Fast_MA'], expected[data.index], rtol=0, atol=1e-12)
+        signals = entries[entries['Entry'].isin(['Buy', 'Sell'])]
+        self.assertGreater(len(signals), 0)
+        direction = np.where(signals['Entry'] == 'Buy', 1.0, -1.0)
+        np.testing.assert_allclose(signals['Level'] - signals['SL'], direction * 1.5 * signals['ATR'])
+        np.testing.assert_allclose(signals['TP'] - signals['Level'], direction * 3.0 * signals['ATR'])
+
+    def test_EngineStreamsTheSelectedAverage(self):
+        rates = pd.DataFrame({'time': 1_700_000_000 + np.arange(1200) * 3600, 'close': self.close[:1200]})
+        engine = IndicatorEngine(fast_period=20, slow_period=60, ma_type='hma')
+        latest = engine.update('EURUSD', 'LTF', rates)
+        self.assertAlmostEqual(latest['Fast_MA'], Kernels.hma(self.close[:1199], 20)[-1], places=12)
+        self.assertAlmostEqual(latest['Slow_MA'], Kernels.hma(self.close[:1199], 60)[-1], places=12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import csv
+import gzip
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Logs.Logger import AsyncLogWriter, FileLogger
+
+
+def read_rows(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, mode='rt', newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+class Test_Logger(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "logs.csv")
+
+    def logger(self, **options):
+        logger = FileLogger({'server': 'Demo', 'account_id': 42}, filename=self.path, redirect=False, **options)
+        self.addCleanup(logger.close)
+        return logger
+
+    def test_PrintLinesAreBatchedAndFlushedOnClose(self):
+        logger = self.logger(flush_interval=60.0)
+        print("🟢 first", file=logger)
+        print("", file=logger)
+        print("second\n", file=logger)
+        self.assertFalse(os.path.exists(self.path))  # nothing written yet: below batch size and interval
+
+        logger.close()
+        rows = read_rows(self.path)
+        self.assertEqual([row[1] for row in rows], [": 🟢 first", ": second"])
+        self.assertTrue(rows[0][0].endswith("»»» Demo-42"))
+
+    def test_FlushWaitsForTheWriter(self):
+        logger = self.logger(flush_interval=60.0)
+        logger.write("queued")
+        self.assertTrue(logger.writer.flush(timeout=5.0))
+        self.assertEqual(len(read_rows(self.path)), 1)
+
+    def test_BatchSizeTriggersWrite(self):
+        logger = self.logger(flush_interval=60.0, batch_size=10)
+        for i in range(10):
+            logger.write(f"line {i}")
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline and not (os.path.exists(self.path) and len(read_rows(self.path)) == 10):
+            time.sleep(0.01)
+        self.assertEqual(len(read_rows(self.path)), 10)
+
+    def test_ConcurrentWritersLoseNothing(self):
+        logger = self.logger(flush_interval=0.01)
+
+        def produce(name):
+            for i in range(500):
+                logger.write(f"{name} {i}")
+
+        threads = [threading.Thread(target=produce, args=(f"T{t}",)) for t in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logger.close()
+        self.assertEqual(len(read_rows(self.path)), 4000)
+
+    def test_DroppedRecordsAreCountedExactly(self):
+        writer = AsyncLogWriter(self.path, lambda record: list(record), flush_interval=0.001, max_pending=20)
+        self.addCleanup(writer.close)
+
+        def produce(name):
+            for i in range(500):
+                writer.submit((time.time(), f"{name} {i}"))
+
+        threads = [threading.Thread(target=produce, args=(f"T{t}",)) for t in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(writer.flush(timeout=5.0))
+        self.assertEqual(len(read_rows(self.path)) + writer.dropped, 4000)
+
+    def test_SizeRotationWithCompression(self):
+        logger = self.logger(flush_interval=60.0, max_bytes=2000, backup_count=2, compress=True)
+        for batch in range(4):
+            for i in range(20):
+                logger.write(f"batch {batch} line {i}")
+            logger.writer.flush(timeout=5.0)
+        logger.close()
+
+        self.assertTrue(os.path.exists(self.path + ".1.gz"))
+        self.assertTrue(os.path.exists(self.path + ".2.gz"))
+        self.assertFalse(os.path.exists(self.path + ".3.gz"))
+        self.assertLessEqual(os.path.getsize(self.path), 2000)
+        self.assertEqual(read_rows(self.path)[-1][1], ": batch 3 line 19")
+        self.assertEqual(read_rows(self.path + ".1.gz")[0][1], ": batch 2 line 0")
+
+    def test_TimeRotation(self):
+        writer = AsyncLogWriter(self.path, lambda record: [record[1]], flush_interval=60.0, rotate_interval=3600)
+        self.addCleanup(writer.close)
+        writer.submit((7200.0, "hour 2"))
+        writer.flush(timeout=5.0)
+        writer.submit((7300.0, "still hour 2"))
+        writer.submit((10800.0, "hour 3"))  # batch starts in hour 2, so no rotation yet
+        writer.flush(timeout=5.0)
+        writer.submit((10900.0, "hour 3 again"))
+        writer.close()
+
+        self.assertEqual(read_rows(self.path + ".1"), [["hour 2"], ["still hour 2"], ["hour 3"]])
+        self.assertEqual(read_rows(self.path), [["hour 3 again"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
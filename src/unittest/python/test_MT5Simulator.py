@@ -0,0 +1,187 @@
+import contextlib
+import datetime
+import io
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from advisor.Client import Backend
+from advisor.Client import Timeframes
+from advisor.Client.Advisor import MetaTrader5Client
+from advisor.Client.Rates import RATES_DTYPE
+from advisor.Simulator import MT5Simulator as sim
+from advisor.Simulator import SyntheticBars
+from fakes import FakeClock
+
+HOUR = 3600
+NOW = 1_700_000_000 // HOUR * HOUR + 1800  # half way through an H1 bar
+
+
+def make_simulator(**kwargs):
+    simulator = sim.MT5Simulator(clock=kwargs.pop('clock', FakeClock(NOW)), history=500, **kwargs)
+    simulator.initialize()
+    return simulator
+
+
+def buy_request(simulator, symbol="EURUSD", **overrides):
+    tick = simulator.symbol_info_tick(symbol)
+    request = {'action': sim.TRADE_ACTION_DEAL, 'symbol': symbol, 'volume': 0.1, 'type': sim.ORDER_TYPE_BUY,
+               'price': tick.ask, 'sl': tick.ask - 0.005, 'tp': tick.ask + 0.01, 'deviation': 10,
+               'type_filling': sim.ORDER_FILLING_IOC, 'type_time': sim.ORDER_TIME_GTC}
+    request.update(overrides)
+    return request
+
+
+class Test_MT5Simulator(unittest.TestCase):
+
+    def test_CallsFailBeforeInitialize(self):
+        simulator = sim.MT5Simulator(clock=FakeClock(NOW))
+        self.assertIsNone(simulator.copy_rates_from_pos("EURUSD", sim.TIMEFRAME_H1, 0, 10))
+        self.assertEqual(simulator.last_error()[0], sim.RES_E_INTERNAL_FAIL_INIT)
+        self.assertTrue(simulator.initialize())
+        self.assertEqual(simulator.last_error()[0], sim.RES_S_OK)
+
+    def test_SymbolsAndAccount(self):
+        simulator = make_simulator(symbols=25)
+        names = [s.name for s in simulator.symbols_get()]
+        self.assertEqual(len(names), 25)
+        self.assertEqual(names[:2], ["EURUSD", "GBPUSD"])
+        self.assertEqual(simulator.symbol_info("USDJPY").digits, 3)
+        self.assertIsNone(simulator.symbol_info("XXXYYY"))
+        self.assertEqual(simulator.last_error()[0], sim.RES_E_NOT_FOUND)
+        self.assertEqual(simulator.account_info().balance, 10_000.0)
+
+    def test_RatesEndWithTheFormingBar(self):
+        simulator = make_simulator()
+        rates = simulator.copy_rates_from_pos("EURUSD", sim.TIMEFRAME_H1, 0, 100)
+        self.assertEqual(rates.dtype, RATES_DTYPE)
+        self.assertEqual(len(rates), 100)
+        self.assertEqual(rates['time'][-1], NOW // HOUR * HOUR)
+
+        naive = datetime.datetime.fromtimestamp(NOW, datetime.timezone.utc).replace(tzinfo=None)
+        for value in (NOW, np.int64(NOW), float(NOW), naive, naive.replace(tzinfo=datetime.timezone.utc),
+                      np.datetime64(NOW, 's'), naive.isoformat()):
+            self.assertEqual(Timeframes.to_epoch(value), NOW, repr(value))
+        self.assertIsNone(Timeframes.to_epoch(None))
+        self.assertTrue((np.diff(rates['time']) == HOUR).all())
+
+        closed = simulator.copy_rates_from_pos("EURUSD", sim.TIMEFRAME_H1, 1, 10)
+        np.testing.assert_array_equal(closed, rates[-11:-1])
+        self.assertIsNone(simulator.copy_rates_from_pos("XXXYYY", sim.TIMEFRAME_H1, 0, 10))
+        self.assertEqual(simulator.last_error()[0], sim.RES_E_INVALID_PARAMS)
+
+    def test_HigherTimeframesAgreeWithTheBase(self):
+        simulator = make_simulator()
+        h1 = simulator.copy_rates_from_pos("EURUSD", sim.TIMEFRAME_H1, 0, 500)
+        h4 = simulator.copy_rates_from_pos("EURUSD", sim.TIMEFRAME_H4, 0, 50)
+        self.assertTrue((h4['time'] % (4 * HOUR) == 0).all())
+        self.assertEqual(h4['close'][-1], h1['close'][-1])
+        self.assertEqual(simulator.symbol_info_tick("EURUSD").bid, h1['close'][-1])
+
+    def test_RangeUsesNaiveDatetimesAsUTC(self):
+        simulator = make_simulator()
+        end = datetime.datetime.fromtimestamp(NOW, datetime.timezone.utc).replace(tzinfo=None)
+        rates = simulator.copy_rates_range("EURUSD", sim.TIMEFRAME_H1, end - datetime.timedelta(hours=10), end)
+        self.assertEqual(len(rates), 10)  # the range starts half way through a bar
+        self.assertEqual(rates['time'][-1], NOW // HOUR * HOUR)
+
+    def test_BarsExtendAsTheClockMoves(self):
+        clock = FakeClock(NOW)
+        simulator = make_simulator(clock=clock)
+        before = simulator.copy_rates_from_pos("EURUSD", sim.TIMEFRAME_H1, 0, 10)
+        clock.now += 3 * HOUR
+        after = simulator.copy_rates_from_pos("EURUSD", sim.TIMEFRAME_H1, 0, 10)
+        self.assertEqual(after['time'][-1] - before['time'][-1], 3 * HOUR)
+        # Bars that were already closed do not change
+        np.testing.assert_array_equal(after[:-3][:-1], before[3:][:-1])
+        self.assertEqual(after['open'][-3], before['close'][-1])
+
+    def test_LatencyGoesThroughTheClock(self):
+        clock = FakeClock(NOW)
+        simulator = make_simulator(clock=clock, latency=0.25, fill_latency=0.5)
+        simulator.copy_rates_from_pos("EURUSD", sim.TIMEFRAME_H1, 0, 10)
+        simulator.order_send(buy_request(simulator))
+        self.assertEqual(clock.slept, [0.25, 0.25, 0.5])
+
+    def test_OrderSendFillsAtTheAsk(self):
+        simulator = make_simulator()
+        request = buy_request(simulator)
+        result = simulator.order_send(request)
+        self.assertEqual(result.retcode, sim.TRADE_RETCODE_DONE)
+        self.assertEqual(result.price, request['price'])
+        self.assertEqual(len(simulator.deals), 1)
+        self.assertEqual(simulator.deals[0]['volume'], 0.1)
+
+    def test_OrderSendRejections(self):
+        simulator = make_simulator()
+        cases = [
+            ({'volume': 0.015}, sim.TRADE_RETCODE_INVALID_VOLUME),
+            ({'type_filling': sim.ORDER_FILLING_RETURN + 5, 'type': 7}, sim.TRADE_RETCODE_INVALID),
+            ({'price': 1.0}, sim.TRADE_RETCODE_REQUOTE),
+            ({'sl': 10.0}, sim.TRADE_RETCODE_INVALID_STOPS),
+        ]
+        for overrides, retcode in cases:
+            with self.subTest(overrides=overrides):
+                self.assertEqual(simulator.order_send(buy_request(simulator, **overrides)).retcode, retcode)
+        self.assertEqual(simulator.deals, [])
+
+        disabled = make_simulator(trade_mode=sim.SYMBOL_TRADE_MODE_DISABLED)
+        self.assertEqual(disabled.order_send(buy_request(disabled)).retcode, sim.TRADE_RETCODE_TRADE_DISABLED)
+
+    def test_RecordedRatesAreServedAsLoaded(self):
+        simulator = make_simulator()
+        recorded = SyntheticBars.generate_rates(50, sim.TIMEFRAME_H4, start=NOW - 60 * 4 * HOUR, weekends=False)
+        simulator.load_rates("EURUSD", sim.TIMEFRAME_H4, recorded)
+        rates = simulator.copy_rates_from_pos("EURUSD", sim.TIMEFRAME_H4, 0, 100)
+        np.testing.assert_array_equal(rates, recorded)
+
+    def test_RecordedFormingBarsOnlyShowTheirOpen(self):
+        simulator = make_simulator()
+        recorded = SyntheticBars.generate_rates(100, sim.TIMEFRAME_H1, start=NOW // HOUR * HOUR - 99 * HOUR, weekends=False)
+        simulator.load_rates("EURUSD", sim.TIMEFRAME_H1, recorded)
+
+        h1 = simulator.copy_rates_from_pos("EURUSD", sim.TIMEFRAME_H1, 0, 10)
+        forming = h1[-1]
+        self.assertEqual(forming['time'], recorded['time'][-1])
+        self.assertEqual((forming['high'], forming['low'], forming['close']), (forming['open'],) * 3)
+        np.testing.assert_array_equal(h1[:-1], recorded[-10:-1])
+        self.assertEqual(simulator.symbol_info_tick("EURUSD").bid, recorded['open'][-1])
+
+        # H4 is aggregated from the recorded H1 bars visible so far
+        h4 = simulator.copy_rates_from_pos("EURUSD", sim.TIMEFRAME_H4, 0, 1)
+        self.assertEqual(h4['close'][-1], recorded['open'][-1])
+        self.assertLessEqual(h4['high'][-1], recorded['high'][-(int(NOW // HOUR) % 4) - 1:].max())
+
+    def test_ConstantsAreAttributes(self):
+        simulator = make_simulator()
+        self.assertEqual(simulator.ORDER_TYPE_SELL, 1)
+        self.assertEqual(simulator.TRADE_RETCODE_DONE, 10009)
+        with self.assertRaises(AttributeError):
+            simulator.NOT_A_CONSTANT
+
+    def test_BackendSelection(self):
+        with self.assertRaises(ValueError):
+            Backend.create_backend("paper")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertIsInstance(Backend.create_backend("simulator"), sim.MT5Simulator)
+
+    def test_ClientRunsAgainstTheSimulator(self):
+        simulator = make_simulator()
+        previous = Backend.use(simulator)
+        self.addCleanup(Backend.use, previous)
+
+        client = MetaTrader5Client(history=200)
+        with contextlib.redirect_stdout(io.StringIO()):
+            data = client.get_multi_tf_data("EURUSD")
+        self.assertEqual(set(data), {"HTF", "LTF"})
+        self.assertEqual(len(data["LTF"]), 200)
+        self.assertEqual(Timeframes.epoch_seconds(data["LTF"]['time'])[-1], NOW // HOUR * HOUR)
+
+
+if __name__ == '__main__':
+    unittest.main()
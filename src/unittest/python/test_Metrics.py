@@ -0,0 +1,103 @@
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Metrics import Registry
+from advisor.Metrics.Exporter import MetricsServer, SnapshotWriter, prometheus_text
+from advisor.MovingAverage import MovingAverage as MA
+
+
+class Test_Metrics(unittest.TestCase):
+
+    def setUp(self):
+        Registry.REGISTRY.clear()
+        Registry.REGISTRY.enabled = True
+
+    def series(self, metric, stage):
+        return {tuple(labels.values()): child for labels, child in metric.series() if labels['stage'] == stage}
+
+    def test_TimedRecordsLatencyAndErrors(self):
+        for _ in range(3):
+            with Registry.timed("place_order", "EURUSD", "H1"):
+                time.sleep(0.002)
+        with self.assertRaises(RuntimeError):
+            with Registry.timed("place_order", "EURUSD", "H1"):
+                raise RuntimeError("rejected")
+
+        histogram = Registry.STAGE_SECONDS.labels("place_order", "EURUSD", "H1").snapshot()
+        self.assertEqual(histogram['count'], 4)
+        self.assertGreaterEqual(histogram['sum'], 0.006)
+        self.assertEqual(histogram['buckets']['+Inf'], 4)
+        self.assertEqual(Registry.STAGE_ERRORS.labels("place_order", "EURUSD", "H1").value, 1)
+
+    def test_DisabledRegistryRecordsNothing(self):
+        Registry.REGISTRY.enabled = False
+        with Registry.timed("send_message", "EURUSD"):
+            pass
+        Registry.count_bars("get_multi_tf_data", "EURUSD", "H1", [1, 2, 3])
+        self.assertEqual(Registry.REGISTRY.snapshot()['metrics']['advisor_stage_seconds']['series'], [])
+
+    def test_HistogramQuantiles(self):
+        histogram = Registry.Histogram((0.01, 0.1, 1.0))
+        for value in [0.005] * 90 + [0.5] * 10:
+            histogram.observe(value)
+        snapshot = histogram.snapshot()
+        self.assertLessEqual(snapshot['p50'], 0.01)
+        self.assertGreater(snapshot['p95'], 0.1)
+        self.assertEqual(snapshot['max'], 0.5)
+        self.assertEqual(snapshot['buckets'], {'0.01': 90, '0.1': 90, '1.0': 100, '+Inf': 100})
+
+    def test_StrategyStagesAreLabelled(self):
+        rng = np.random.default_rng(0)
+        frame = lambda n: pd.DataFrame({
+            'time': pd.date_range("2024-01-01", periods=n, freq="h"), 'close': 1.1 + np.cumsum(rng.normal(0, 1e-3, n)),
+            'tick_volume': 0, 'real_volume': 0, 'spread': 0})
+        strategy = MA.MovingAverageCrossover("EURUSD", None, fast_period=5, slow_period=20)
+        htf = strategy.calculate_moving_averages(frame(100), timeframe="H4")
+        ltf = strategy.calculate_moving_averages(frame(400), timeframe="H1")
+        strategy.identify_entry_levels(htf, ltf.reset_index(drop=True), timeframe="H1")
+
+        self.assertEqual(set(self.series(Registry.STAGE_SECONDS, "calculate_moving_averages")),
+                         {("calculate_moving_averages", "EURUSD", "H4"), ("calculate_moving_averages", "EURUSD", "H1")})
+        self.assertEqual(Registry.STAGE_SECONDS.labels("identify_entry_levels", "EURUSD", "H1").count, 1)
+
+    def test_PrometheusEndpointAndSnapshotFile(self):
+        with Registry.timed("get_multi_tf_data", "EUR\"USD", "H1"):
+            pass
+        Registry.count_bars("get_multi_tf_data", "EURUSD", "H1", range(1000))
+
+        text = prometheus_text()
+        self.assertIn("# TYPE advisor_stage_seconds histogram", text)
+        self.assertIn('advisor_stage_seconds_bucket{stage="get_multi_tf_data",symbol="EUR\\"USD",timeframe="H1",le="+Inf"} 1',
+                      text)
+        self.assertIn('advisor_bars_total{stage="get_multi_tf_data",symbol="EURUSD",timeframe="H1"} 1000.0', text)
+
+        server = MetricsServer(port=0).start()
+        self.addCleanup(server.stop)
+        base = f"http://127.0.0.1:{server.port}"
+        with urllib.request.urlopen(base + "/metrics") as response:
+            self.assertTrue(response.headers['Content-Type'].startswith("text/plain"))
+            self.assertEqual(response.read().decode(), prometheus_text())
+        with urllib.request.urlopen(base + "/metrics.json") as response:
+            self.assertIn('advisor_bars_total', json.load(response)['metrics'])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.json")
+            writer = SnapshotWriter(path, interval=3600).start()
+            writer.stop()
+            with open(path) as f:
+                series = json.load(f)['metrics']['advisor_stage_seconds']['series']
+            self.assertEqual(series[0]['labels']['stage'], "get_multi_tf_data")
+
+
+if __name__ == '__main__':
+    unittest.main()
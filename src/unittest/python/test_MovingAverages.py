@@ -1,6 +1,8 @@
 import unittest
+import numpy as np
 import pandas as pd
 import advisor.MovingAverage as MA
+from advisor.MovingAverage.MovingAverage import MovingAverageCrossover
 import advisor.Client.Advisor as Client
 import MetaTrader5 as mt5
 
@@ -46,5 +48,33 @@ class test_MovingAverages(unittest.TestCase):
         self.assertTrue('Cumulative_Market_Returns' in BackTestedData.columns)
         self.assertTrue('Cumulative_Strategy_Returns' in BackTestedData.columns)
     
+    def test_IdentifyEntryLevels(self):
+        htf = pd.DataFrame({
+            'time': pd.to_datetime(['2024-01-01 00:00', '2024-01-01 04:00']),
+            'Bias': ['Bullish', 'Bearish'],
+        })
+        ltf = pd.DataFrame({
+            'time': pd.to_datetime(['2023-12-31 23:00', '2024-01-01 01:00', '2024-01-01 02:00',
+                                    '2024-01-01 05:00', '2024-01-01 06:00']),
+            'close': [1.1000, 1.1010, 1.1100, 1.0990, 1.0990],
+            'Fast_MA': [1.1000, 1.1000, 1.1000, 1.1000, 1.1000],
+            'Bias': ['Bullish', 'Bullish', 'Bullish', 'Bearish', 'Bullish'],
+            'Signal': 0, 'tick_volume': 0, 'real_volume': 0, 'spread': 0,
+        })
+
+        entries = MovingAverageCrossover('EURUSD', ltf).identify_entry_levels(htf, ltf)
+
+        self.assertTrue(pd.isna(entries.loc[0, 'Market_bias']))
+        self.assertEqual(list(entries['Market_bias'][1:]), ['Bullish', 'Bullish', 'Bearish', 'Bearish'])
+        self.assertEqual(entries.loc[1, 'Entry'], 'Buy')
+        self.assertAlmostEqual(entries.loc[1, 'SL'], 1.1010 - 0.003)
+        self.assertAlmostEqual(entries.loc[1, 'TP'], 1.1010 + 0.01)
+        self.assertIsNone(entries.loc[2, 'Entry'])
+        self.assertTrue(np.isnan(entries.loc[2, 'Level']))
+        self.assertEqual(entries.loc[3, 'Entry'], 'Sell')
+        self.assertAlmostEqual(entries.loc[3, 'TP'], 1.0990 - 0.01)
+        self.assertTrue(pd.isna(entries.loc[4, 'Entry']))
+        self.assertNotIn('Signal', entries.columns)
+
     def test_runMovingAverageStrategy(self):
         pass
\ No newline at end of file
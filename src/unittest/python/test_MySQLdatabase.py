@@ -0,0 +1,92 @@
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.database.MySQLdatabase import CANDLE_COLUMNS, CANDLE_KEY, MetaTrader5Data, MySQLDatabase, SQLiteDialect
+
+
+def candles(count, start=datetime(2024, 1, 1), price=1.0):
+    return [{
+        "timestamp": start + timedelta(minutes=i),
+        "open_price": price, "high_price": price, "low_price": price, "close_price": price + i,
+        "volume": 10.0,
+    } for i in range(count)]
+
+
+class Test_MySQLdatabase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        path = os.path.join(self.directory.name, "candles.db")
+        self.db = MySQLDatabase(None, None, None, path, pool_size=3, dialect=SQLiteDialect,
+                                connect=lambda: sqlite3.connect(path, check_same_thread=False, timeout=30))
+
+    def tearDown(self):
+        self.db.close()
+        self.directory.cleanup()
+
+    def count(self, query="SELECT COUNT(*) FROM candles"):
+        self.db.cursor.execute(query)
+        return self.db.cursor.fetchone()[0]
+
+    def test_BulkUpsertAndRetention(self):
+        MetaTrader5Data.save_candle_data(self.db, "candles", candles(300), max_rows=200, symbol="EURUSD")
+        self.assertEqual(self.count(), 200)
+
+        # Re-sending the newest candles updates them in place instead of duplicating
+        MetaTrader5Data.save_candle_data(self.db, "candles", candles(300, price=2.0)[-50:], max_rows=200, symbol="EURUSD")
+        self.assertEqual(self.count(), 200)
+        self.assertEqual(self.count("SELECT MAX(close_price) FROM candles"), 2.0 + 299)
+
+    def test_ExistingTableGetsTheUniqueKey(self):
+        # Candle table as created before the unique key existed, already holding duplicates
+        self.db.create_table("candles", SQLiteDialect.candle_schema().replace(",\n\t\t\tUNIQUE (symbol, timestamp)", ""))
+        old = [("EURUSD", c["timestamp"], 1.0, 1.0, 1.0, c["close_price"], 10.0) for c in candles(10)]
+        self.db.insert_rows("candles", CANDLE_COLUMNS, old + old[:4])
+        self.assertEqual(self.count(), 14)
+
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            MetaTrader5Data.save_candle_data(self.db, "candles", candles(12, price=3.0), max_rows=100, symbol="EURUSD")
+        self.assertIn("Migrating candles", out.getvalue())
+        self.assertEqual(self.count(), 12)
+        self.assertEqual(self.count("SELECT COUNT(DISTINCT timestamp) FROM candles"), 12)
+        self.assertEqual(self.count("SELECT MIN(open_price) FROM candles"), 3.0)
+        self.assertTrue(SQLiteDialect.has_unique_key(self.db.cursor, "candles", *CANDLE_KEY))
+
+        # Checked once per table: later saves do not migrate again
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            MetaTrader5Data.save_candle_data(self.db, "candles", candles(12), max_rows=100, symbol="EURUSD")
+        self.assertEqual(out.getvalue(), "")
+        self.assertEqual(self.count(), 12)
+
+    def test_PoolIsSharedAcrossThreads(self):
+        MetaTrader5Data.save_candle_data(self.db, "candles", [], max_rows=1000)
+        errors = []
+
+        def ingest(symbol):
+            try:
+                MetaTrader5Data.save_candle_data(self.db, "candles", candles(100), max_rows=10_000, symbol=symbol)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=ingest, args=(f"SYM{i}",)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.count(), 600)
+        self.assertLessEqual(self.db.pool._created, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Backtest.ParameterSweep import SharedMovingAverages, sweep
+from advisor.MovingAverage.MovingAverage import MovingAverageCrossover
+
+
+def synthetic_rates(bars, freq, seed, start):
+    rng = np.random.default_rng(seed)
+    close = 1.10 + np.cumsum(rng.normal(0, 0.0015, bars))
+    open_ = np.r_[close[0], close[:-1]]
+    return pd.DataFrame({
+        'time': pd.date_range(start, periods=bars, freq=freq),
+        'open': open_, 'high': np.maximum(open_, close) + 0.0005, 'low': np.minimum(open_, close) - 0.0005,
+        'close': close, 'tick_volume': 1, 'spread': 1, 'real_volume': 0,
+    })
+
+
+class Test_ParameterSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.ltf = synthetic_rates(1500, 'h', 1, '2024-01-01')
+        self.htf = synthetic_rates(600, '4h', 2, '2023-10-01')
+
+    def test_SharedMeansMatchPandasRolling(self):
+        means = SharedMovingAverages(self.ltf['close'])
+        for period in (5, 50, 150):
+            expected = self.ltf['close'].rolling(period).mean().shift().to_numpy()
+            np.testing.assert_allclose(means.mean(period), expected, rtol=1e-10, equal_nan=True)
+
+    def test_SweepMatchesPandasPipeline(self):
+        strategy = MovingAverageCrossover('EURUSD', None)
+        with contextlib.redirect_stdout(io.StringIO()):
+            htf = strategy.calculate_moving_averages(self.htf.copy())
+            ltf = strategy.calculate_moving_averages(self.ltf.copy())
+            expected = strategy.backtest_trades(strategy.identify_entry_levels(htf, ltf)).summary()
+            table = sweep(self.htf, self.ltf, [20, 50], [150], symbol='EURUSD')
+
+        row = table[table['ltf_fast'] == 50].iloc[0]
+        self.assertEqual(row['trades'], expected['trades'])
+        self.assertAlmostEqual(row['net_pnl'], expected['net_pnl'])
+        self.assertEqual(len(table), 2)
+        self.assertGreaterEqual(table['net_pnl'].iloc[0], table['net_pnl'].iloc[1])
+
+    def test_IndependentHTFGrid(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            table = sweep(self.htf, self.ltf, [10, 20], [40], htf_fast_periods=[5, 10], htf_slow_periods=[30, 60])
+        self.assertEqual(len(table), 2 * 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from advisor.Backtest.BatchBacktest import compact_rates
+from advisor.Client import Backend
+from advisor.Client import Timeframes
+from advisor.Client.Advisor import MetaTrader5Client
+from advisor.Client.Rates import BarSeries
+from advisor.MovingAverage.StreamingMA import IndicatorEngine
+from advisor.Simulator import SyntheticBars
+from advisor.Simulator.MT5Simulator import MT5Simulator
+from fakes import FakeClock
+
+
+class Test_Rates(unittest.TestCase):
+
+    def setUp(self):
+        self.rates = SyntheticBars.generate_rates(300, Timeframes.TIMEFRAME_H1)
+        self.series = BarSeries(self.rates, "EURUSD", Timeframes.TIMEFRAME_H1)
+
+    def test_ColumnsAreViewsOfTheRates(self):
+        self.assertEqual(len(self.series), 300)
+        self.assertTrue(np.shares_memory(self.series['close'], self.rates))
+        self.assertTrue(np.shares_memory(self.series.time, self.rates))
+        np.testing.assert_array_equal(self.series.high, self.rates['high'])
+        self.assertIn('open', self.series)
+        self.assertNotIn('spread', self.series)
+        with self.assertRaises(KeyError):
+            self.series['tick_volume']
+
+    def test_SlicesAreViews(self):
+        tail = self.series[-10:]
+        self.assertIsInstance(tail, BarSeries)
+        self.assertEqual(len(tail), 10)
+        self.assertEqual(tail.symbol, "EURUSD")
+        self.assertTrue(np.shares_memory(tail.close, self.rates))
+
+    def test_FrameIsBuiltOnDemand(self):
+        frame = self.series.to_frame()
+        self.assertEqual(list(frame.columns), list(self.rates.dtype.names))
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(frame['time']))
+        self.assertEqual(frame['time'].iloc[0], pd.Timestamp(int(self.rates['time'][0]), unit='s'))
+
+        compact = self.series.to_frame(columns=['time', 'close'], parse_dates=False)
+        self.assertEqual(list(compact.columns), ['time', 'close'])
+        self.assertEqual(compact['time'].iloc[-1], self.rates['time'][-1])
+
+    def test_ConsumersAcceptBarSeries(self):
+        np.testing.assert_array_equal(compact_rates(self.series)['close'], self.rates['close'])
+        latest = IndicatorEngine(fast_period=5, slow_period=20).update("EURUSD", "LTF", self.series)
+        self.assertEqual(latest['close'], self.rates['close'][-1])
+        self.assertAlmostEqual(latest['Slow_MA'], self.rates['close'][-21:-1].mean())
+
+    def test_ClientReturnsViewsOfTheBarCache(self):
+        simulator = MT5Simulator(clock=FakeClock(), history=500)
+        simulator.initialize()
+        previous = Backend.use(simulator)
+        self.addCleanup(Backend.use, previous)
+
+        client = MetaTrader5Client(history=100)
+        with contextlib.redirect_stdout(io.StringIO()):
+            data = client.get_multi_tf_data("EURUSD")
+            live = client.get_live_data("EURUSD", Timeframes.TIMEFRAME_H1, bars=10)
+        ltf = data["LTF"]
+        self.assertIsInstance(ltf, BarSeries)
+        self.assertEqual(ltf.timeframe, Timeframes.TIMEFRAME_H1)
+        cached = client.bar_cache._series[("EURUSD", Timeframes.TIMEFRAME_H1)].buffer
+        self.assertTrue(np.shares_memory(ltf.close, cached))
+        self.assertIsInstance(live, pd.DataFrame)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Client import Backend
+from advisor.Client import Timeframes
+from advisor.Simulator import SyntheticBars
+from advisor.Simulator.MT5Simulator import SYMBOL_TRADE_MODE_DISABLED
+from advisor.Simulator.Replay import Replay
+
+HOUR = 3600
+THRESHOLD = 0.0100
+
+
+def expected_decisions(rates, start):
+    """Recompute the live rules with pandas from bars closed before each replayed bar opens."""
+    frame = SyntheticBars.rates_frame(rates).set_index('time')
+    fast = frame['close'].rolling(50).mean().shift(1)  # MAs of the bars closed before this one opens
+    slow = frame['close'].rolling(150).mean().shift(1)
+
+    htf = pd.DataFrame(SyntheticBars.aggregate(rates, Timeframes.TIMEFRAME_H4))
+    htf_bullish = pd.Series((htf['close'].rolling(50).mean() > htf['close'].rolling(150).mean()).values,
+                            index=pd.to_datetime(htf['time'] + 4 * HOUR, unit='s'))  # known once the H4 bar closes
+    htf_ready = pd.Series(htf['close'].rolling(150).mean().notna().values, index=htf_bullish.index)
+    bullish = htf_bullish.reindex(frame.index, method='ffill')
+    ready = htf_ready.reindex(frame.index, method='ffill', fill_value=False).astype(bool)
+
+    price = frame['open']  # the forming bar only shows its open
+    near = (price - fast).abs() <= THRESHOLD
+    buy = ready & near & (bullish == True) & (fast > slow) & (price > fast)
+    sell = ready & near & (bullish == False) & (fast < slow) & (price < fast)
+    decisions = pd.Series(np.where(buy, 'buy', np.where(sell, 'sell', '')), index=frame.index)
+    decisions = decisions[decisions.index >= pd.Timestamp(start, unit='s')]
+    return decisions[decisions != '']
+
+
+class Test_Replay(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.history = {symbol: {"LTF": SyntheticBars.generate_rates(1400, Timeframes.TIMEFRAME_H1, seed=seed)}
+                       for seed, symbol in enumerate(["EURUSD", "USDJPY"])}
+        cls.start = int(cls.history["EURUSD"]["LTF"]['time'][700])
+        cls.result = Replay(cls.history, start=cls.start, threshold=THRESHOLD).run()
+
+    def test_EveryBarIsEvaluatedForEverySymbol(self):
+        self.assertEqual(self.result.steps, 700)
+        self.assertEqual(self.result.evaluations, 1400)
+
+    def test_DecisionsMatchTheLiveRules(self):
+        orders = self.result.ledger.to_frame()
+        self.assertGreater(len(orders), 0)
+        for symbol, series in self.history.items():
+            with self.subTest(symbol=symbol):
+                expected = expected_decisions(series["LTF"], self.start)
+                replayed = orders[orders['symbol'] == symbol]
+                self.assertEqual(list(replayed['time'] - pd.Timedelta(seconds=5)), list(expected.index))
+                self.assertEqual(list(replayed['action']), list(expected.values))
+
+    def test_OrdersUseTheOpenOfTheFormingBar(self):
+        rates = self.history["EURUSD"]["LTF"]
+        opens = dict(zip(rates['time'], rates['open']))
+        for order in self.result.ledger.orders:
+            if order['symbol'] == "EURUSD":
+                spread = 12 * 1e-5 if order['action'] == 'buy' else 0.0
+                self.assertAlmostEqual(order['price'], opens[order['time'] - 5] + spread, places=9)
+
+    def test_SignalsAreCollectedNotSent(self):
+        self.assertEqual(len(self.result.messages), len(self.result.ledger.orders))
+        self.assertTrue(all(m['symbol'] in self.history for m in self.result.messages))
+        summary = self.result.ledger.summary()
+        self.assertEqual(int(summary[['buy', 'sell']].to_numpy().sum()), len(self.result.ledger.orders))
+
+    def test_LedgerRecordsTheSentRequests(self):
+        orders = self.result.ledger.to_frame()
+        self.assertTrue(orders['placed'].all())
+        self.assertEqual(len(self.result.deals), len(orders))
+        np.testing.assert_allclose(orders['sl'], [deal['sl'] for deal in self.result.deals])
+
+    def test_SignalOnlyOrdersAreNotPlaced(self):
+        history = {"EURUSD": self.history["EURUSD"]}
+        result = Replay(history, start=self.start, threshold=THRESHOLD, trade_mode=SYMBOL_TRADE_MODE_DISABLED).run()
+        orders = result.ledger.to_frame()
+        self.assertGreater(len(orders), 0)
+        self.assertFalse(orders['placed'].any())
+        self.assertTrue(orders['price'].isna().all())
+        self.assertEqual(result.deals, [])
+
+    def test_BackendIsRestored(self):
+        previous = Backend.use(None)
+        self.addCleanup(Backend.use, previous)
+        Replay({"EURUSD": {"LTF": self.history["EURUSD"]["LTF"][:200]}}).run()
+        self.assertIsNone(Backend.mt5._backend)
+
+    def test_EmptyHistoryIsRejected(self):
+        with self.assertRaises(ValueError):
+            Replay({})
+
+
+if __name__ == '__main__':
+    unittest.main()
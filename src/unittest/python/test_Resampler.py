@@ -0,0 +1,135 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from advisor.Client import Backend
+from advisor.Client import Resampler
+from advisor.Client import Timeframes
+from advisor.Client.Advisor import MetaTrader5Client
+from advisor.Simulator import MT5Simulator as sim
+from advisor.Simulator import SyntheticBars
+from fakes import FakeClock
+
+HOUR = 3600
+NOW = 1_700_000_000 // HOUR * HOUR + 1800  # half way through an H1 bar
+
+
+class RecordingBackend:
+    """Simulator proxy that records the timeframe of every copy_rates_from_pos call."""
+
+    def __init__(self, simulator):
+        self.simulator = simulator
+        self.requested = []
+
+    def __getattr__(self, name):
+        return getattr(self.simulator, name)
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        self.requested.append(timeframe)
+        return self.simulator.copy_rates_from_pos(symbol, timeframe, start_pos, count)
+
+
+def forming(rates):
+    """Copy of `rates` whose last bar has only just opened, as the terminal returns it."""
+    rates = rates.copy()
+    for field in ('high', 'low', 'close'):
+        rates[field][-1] = rates['open'][-1]
+    rates['tick_volume'][-1] = 1
+    return rates
+
+
+class Test_Resampler(unittest.TestCase):
+
+    def setUp(self):
+        self.m15 = SyntheticBars.generate_rates(4000, Timeframes.TIMEFRAME_M15, start="2024-01-03 05:30", seed=4)
+        self.h1 = SyntheticBars.generate_rates(3000, Timeframes.TIMEFRAME_H1, start="2024-01-01", seed=5)
+
+    def test_MatchesPandasResampleWithSessionOffset(self):
+        frame = SyntheticBars.rates_frame(self.m15).set_index('time')
+        for timeframe, rule, offset in ((Timeframes.TIMEFRAME_H4, '4h', 0),
+                                        (Timeframes.TIMEFRAME_D1, '1D', -2 * HOUR),
+                                        (Timeframes.TIMEFRAME_W1, '7D', 0)):
+            bars = Resampler.resample(self.m15, timeframe, session_offset=offset)
+            origin = pd.Timestamp("1969-12-28") if timeframe == Timeframes.TIMEFRAME_W1 else 'epoch'
+            expected = frame.resample(rule, origin=origin, offset=pd.Timedelta(seconds=offset)).agg(
+                {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'tick_volume': 'sum'}).dropna()
+            np.testing.assert_array_equal(bars['time'], Timeframes.epoch_seconds(expected.index))
+            for field in ('open', 'high', 'low', 'close', 'tick_volume'):
+                np.testing.assert_array_equal(bars[field], expected[field].to_numpy(), err_msg=rule)
+
+        days = Resampler.resample(self.m15, Timeframes.TIMEFRAME_D1, session_offset=-2 * HOUR)
+        self.assertTrue(np.all(days['time'] % 86400 == 22 * HOUR))
+        self.assertEqual(Resampler.resample(self.m15, Timeframes.TIMEFRAME_H4, drop_partial=True)['time'][0],
+                         Timeframes.epoch_seconds(np.datetime64("2024-01-03T08:00"))[()])
+
+    def test_IncrementalUpdatesMatchAFullResample(self):
+        resampler = Resampler.Resampler(Timeframes.TIMEFRAME_H4, Timeframes.TIMEFRAME_H1, history=300)
+        for end in list(range(1000, 1200)) + list(range(1203, 1300, 3)) + [2900]:
+            window = forming(self.h1[end - 1000:end])
+            bars = resampler.update(window)
+            full = Resampler.resample(np.concatenate([self.h1[:end - 1], window[-1:]]), Timeframes.TIMEFRAME_H4)
+            self.assertLessEqual(len(bars), 300)
+            np.testing.assert_array_equal(bars, full[-len(bars):], err_msg=str(end))
+            self.assertEqual(bars['time'][-1], Resampler.bucket_starts(window['time'][-1:], Timeframes.TIMEFRAME_H4)[0])
+
+    def test_RejectsTimeframesThatAreNotMultiples(self):
+        with self.assertRaises(ValueError):
+            Resampler.Resampler(Timeframes.TIMEFRAME_M30, Timeframes.TIMEFRAME_H1)
+        with self.assertRaises(ValueError):
+            Resampler.Resampler(Timeframes.TIMEFRAME_MN1, Timeframes.TIMEFRAME_H1)
+
+    def test_CompareReportsDifferences(self):
+        local = Resampler.resample(self.h1, Timeframes.TIMEFRAME_H4)
+        self.assertTrue(Resampler.compare(local, local)['ok'])
+
+        broker = local.copy()
+        broker['high'][10] += 0.0005
+        broker = np.delete(broker, 20)
+        report = Resampler.compare(local[5:], broker)
+        self.assertFalse(report['ok'])
+        self.assertEqual(report['mismatched'], [int(local['time'][10])])
+        self.assertEqual(report['extra'], [int(local['time'][20])])
+        self.assertEqual(report['missing'], [])
+        self.assertAlmostEqual(report['max_diff']['high'], 0.0005)
+        self.assertEqual(report['compared'], len(local) - 7)
+        self.assertTrue(Resampler.compare(local, broker, fields=('open',), tolerance=1e-3)['extra'])
+
+    def test_ClientDerivesHigherTimeframesFromTheBase(self):
+        clock = FakeClock(NOW)
+        simulator = sim.MT5Simulator(clock=clock, history=3000)
+        simulator.initialize()
+        backend = RecordingBackend(simulator)
+        previous = Backend.use(backend)
+        self.addCleanup(Backend.use, previous)
+
+        client = MetaTrader5Client(history=200, derive_timeframes=True, validate_derived=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for elapsed in (0, 5 * HOUR, HOUR):
+                clock.now += elapsed
+                backend.requested.clear()
+                data = client.get_multi_tf_data("EURUSD")
+
+        self.assertEqual(backend.requested, [Timeframes.TIMEFRAME_H1, Timeframes.TIMEFRAME_H4])  # H4 only to validate
+        self.assertEqual((len(data["LTF"]), len(data["HTF"])), (200, 200))
+        broker = simulator.copy_rates_from_pos("EURUSD", Timeframes.TIMEFRAME_H4, 0, 200)
+        np.testing.assert_array_equal(data["HTF"].rates, broker)
+        self.assertTrue(client.derived_reports[("EURUSD", Timeframes.TIMEFRAME_H4)]['ok'])
+
+        shifted = MetaTrader5Client(history=200, derive_timeframes=True, session_offset=HOUR)
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            data = shifted.get_multi_tf_data("EURUSD")
+            report = shifted.validate_timeframe("EURUSD", Timeframes.TIMEFRAME_H4, data["HTF"].rates, broker)
+        self.assertFalse(report['ok'])
+        self.assertIn("differ from the broker's", out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import contextlib
+import io
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from advisor import RunAdvisorBot as runner
+from advisor.Client import Backend
+from advisor.Simulator.MT5Simulator import MT5Simulator
+from fakes import FakeMessenger
+
+ENVIRON = {
+    "ADVISOR_VOLUME": "0.05", "ADVISOR_SL": "20", "ADVISOR_RR": "1:3",
+    "ADVISOR_SERVER": "Broker-Demo", "ADVISOR_ACCOUNT": "12345678", "ADVISOR_PASSWORD": "secret123",
+}
+# Seconds the first round may take before the test stops the bot and fails
+ROUND_TIMEOUT = 60
+
+
+@unittest.skipUnless(hasattr(signal, "SIGTERM") and threading.current_thread() is threading.main_thread(),
+                     "needs POSIX signals on the main thread")
+class Test_RunAdvisorBot(unittest.TestCase):
+
+    def setUp(self):
+        self.simulator = MT5Simulator(symbols=["EURUSD", "GBPUSD", "USDJPY"], history=1200)
+        previous = Backend.use(self.simulator)
+        self.addCleanup(Backend.use, previous)
+        home = tempfile.TemporaryDirectory()
+        self.addCleanup(home.cleanup)
+        patcher = mock.patch.dict(os.environ, {**ENVIRON, "ADVISOR_METRICS_PORT": "0", "HOME": home.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            self.addCleanup(signal.signal, signum, signal.getsignal(signum))
+
+    def test_HeadlessRunStopsOnSigterm(self):
+        messenger = FakeMessenger()
+        bot = runner.RunAdvisorBot(max_workers=2, headless=True, messenger=messenger,
+                                   user_data=runner.UserConfig.load_user_data())
+        signal.signal(signal.SIGTERM, bot.stop)
+
+        output = io.StringIO()
+        timed_out = threading.Event()
+
+        # Signal once the first round is done and the loop waits for the next bar close;
+        # past the deadline stop the bot directly so start_bot_logic cannot block until a real H1 close
+        def terminate_when_waiting():
+            deadline = time.monotonic() + ROUND_TIMEOUT
+            while "Workers sleeping" not in output.getvalue():
+                if time.monotonic() > deadline:
+                    timed_out.set()
+                    bot.stop()
+                    return
+                threading.Event().wait(0.01)
+            os.kill(os.getpid(), signal.SIGTERM)
+
+        threading.Thread(target=terminate_when_waiting, daemon=True).start()
+        with contextlib.redirect_stdout(output):
+            bot.start_bot_logic()
+
+        self.assertFalse(timed_out.is_set(), f"no worker round finished within {ROUND_TIMEOUT}s")
+        self.assertTrue(bot.stop_event.is_set())
+        self.assertIsNone(bot.gui)
+        self.assertIn("Stop requested by signal", output.getvalue())
+        self.assertIn("All workers completed", output.getvalue())
+        self.assertEqual(sorted(bot.symbols), ["EURUSD", "GBPUSD", "USDJPY"])
+        self.assertFalse(bot.client.dialogs)
+        self.assertIs(Backend.mt5._backend, self.simulator)  # the closed session is uninstalled
+        self.assertNotIn("advisor.GUI.userInput", sys.modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
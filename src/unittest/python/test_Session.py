@@ -0,0 +1,187 @@
+import contextlib
+import io
+import os
+import sys
+import threading
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from advisor.Client import Backend
+from advisor.Client.Advisor import MetaTrader5Client
+from advisor.Client.Session import MT5Session
+from advisor.Simulator import MT5Simulator as sim
+from fakes import FakeClock
+
+
+class RecordingSimulator(sim.MT5Simulator):
+    """Simulator that records the calling thread, can be paused and can drop the connection."""
+
+    def __init__(self, **kwargs):
+        super().__init__(clock=FakeClock(), history=200, **kwargs)
+        self.calls = []
+        self.threads = set()
+        self.gate = threading.Event()
+        self.gate.set()
+        self.entered = threading.Event()
+        self.disconnects = 0
+        self.order_timeouts = 0
+
+    def _record(self, name):
+        self.calls.append(name)
+        self.threads.add(threading.get_ident())
+
+    def initialize(self, *args, **kwargs):
+        self._record('initialize')
+        return super().initialize(*args, **kwargs)
+
+    def shutdown(self):
+        self._record('shutdown')
+        return super().shutdown()
+
+    def terminal_info(self):
+        self._record('terminal_info')
+        return super().terminal_info()
+
+    def symbol_info_tick(self, symbol):
+        self._record('symbol_info_tick')
+        self.entered.set()
+        self.gate.wait(5)
+        if self.disconnects:
+            self.disconnects -= 1
+            self._initialized = False
+            return self._fail(-10004, "No IPC connection")
+        return super().symbol_info_tick(symbol)
+
+    def order_send(self, request):
+        self._record('order_send')
+        if self.order_timeouts:
+            self.order_timeouts -= 1
+            self._initialized = False
+            return self._fail(-10005, "IPC timeout")
+        return super().order_send(request)
+
+
+class Test_Session(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = RecordingSimulator()
+        self.session = MT5Session(self.backend, reconnect_delay=0.0).start()
+        self.addCleanup(self.session.close)
+        self.assertTrue(self.session.initialize(login=12345, server="Demo"))
+
+    def paused(self):
+        """Block the dispatcher inside a symbol_info_tick call until the returned event is set."""
+        self.backend.gate.clear()
+        self.backend.entered.clear()
+        blocker = self.session.submit("symbol_info_tick", "GBPUSD")
+        self.assertTrue(self.backend.entered.wait(5))
+        return blocker
+
+    def test_CallsRunOnTheDispatcherThread(self):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.session.symbol_info_tick("EURUSD")))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 8)
+        self.assertEqual(self.backend.threads, {self.session._thread.ident})
+
+    def test_IdenticalReadsAreCoalesced(self):
+        blocker = self.paused()
+        futures = [self.session.submit("symbol_info_tick", "EURUSD") for _ in range(5)]
+        other = self.session.submit("symbol_info_tick", "USDJPY")
+        self.backend.gate.set()
+
+        ticks = {id(f.result(5)) for f in futures}
+        self.assertEqual(len(ticks), 1)
+        self.assertEqual(other.result(5).bid, self.backend.symbol_info_tick("USDJPY").bid)
+        blocker.result(5)
+        self.assertEqual(self.session.stats()['coalesced'], 4)
+        self.assertEqual(self.backend.calls.count('symbol_info_tick'), 4)  # blocker, EURUSD, USDJPY, the check
+
+    def test_OrdersJumpTheReadQueue(self):
+        blocker = self.paused()
+        read = self.session.submit("symbol_info_tick", "EURUSD")
+        order = self.session.submit("order_send", {'action': sim.TRADE_ACTION_DEAL, 'symbol': 'EURUSD', 'volume': 0.1,
+                                                   'type': sim.ORDER_TYPE_BUY})
+        self.backend.gate.set()
+        for future in (blocker, read, order):
+            future.result(5)
+        # After the blocker: the order (which reads its own tick), then the queued read
+        self.assertEqual(self.backend.calls[-4:], ['symbol_info_tick', 'order_send', 'symbol_info_tick',
+                                                   'symbol_info_tick'])
+
+    def test_ReconnectsOnIPCErrors(self):
+        self.backend.disconnects = 1
+        with contextlib.redirect_stdout(io.StringIO()):
+            tick = self.session.symbol_info_tick("EURUSD")
+        self.assertIsNotNone(tick)
+        self.assertEqual(self.session.stats()['reconnects'], 1)
+        self.assertEqual(self.backend.calls.count('initialize'), 2)
+        self.assertEqual(self.session.last_error()[0], sim.RES_S_OK)
+
+    def test_OrdersAreNeverRetried(self):
+        self.backend.order_timeouts = 1
+        request = {'action': sim.TRADE_ACTION_DEAL, 'symbol': 'EURUSD', 'volume': 0.1, 'type': sim.ORDER_TYPE_BUY}
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = self.session.order_send(request)
+        self.assertIsNone(result)
+        self.assertEqual(self.session.last_error()[0], -10005)
+        self.assertEqual(self.backend.calls.count('order_send'), 1)
+        self.assertEqual(self.session.stats()['reconnects'], 1)
+        self.assertIsNotNone(self.session.symbol_info_tick("EURUSD"))  # reconnected for the next call
+        self.assertEqual(len(self.backend.deals), 0)
+
+    def test_LastErrorBelongsToTheCallingThread(self):
+        self.assertIsNone(self.session.symbol_info("XXXYYY"))
+        errors = []
+        thread = threading.Thread(target=lambda: errors.append((self.session.symbol_info("EURUSD"),
+                                                               self.session.last_error())))
+        thread.start()
+        thread.join()
+        self.assertEqual(errors[0][1][0], sim.RES_S_OK)
+        self.assertEqual(self.session.last_error()[0], sim.RES_E_NOT_FOUND)
+
+    def test_RepeatedInitializeDoesNotLogInAgain(self):
+        self.assertTrue(self.session.initialize(login=12345, server="Demo"))
+        self.assertEqual(self.backend.calls.count('initialize'), 1)
+        self.assertTrue(self.session.initialize(login=67890, server="Demo"))
+        self.assertEqual(self.backend.calls.count('initialize'), 2)
+
+    def test_ConstantsComeFromTheBackend(self):
+        self.assertEqual(self.session.ORDER_TYPE_SELL, sim.ORDER_TYPE_SELL)
+
+    def test_ClientWorksThroughTheSession(self):
+        previous = Backend.use(self.session)
+        self.addCleanup(Backend.use, previous)
+        client = MetaTrader5Client(history=100)
+        with contextlib.redirect_stdout(io.StringIO()):
+            data = client.get_multi_tf_data("EURUSD")
+        self.assertEqual(len(data["LTF"]), 100)
+        self.assertEqual(self.backend.threads, {self.session._thread.ident})
+
+    def test_ClosedSessionRejectsCalls(self):
+        self.session.close()
+        with self.assertRaises(RuntimeError):
+            self.session.submit("symbol_info_tick", "EURUSD")
+
+    def test_CloseNeverCallsTheTerminalAlongsideTheDispatcher(self):
+        blocker = self.paused()
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.session.close(timeout=0.05)
+        self.assertIn("still busy", out.getvalue())
+        self.assertNotIn('shutdown', self.backend.calls)
+
+        self.backend.gate.set()
+        blocker.result(5)
+        self.session._thread.join(5)
+        self.assertEqual(self.backend.calls[-1], 'shutdown')
+        self.assertEqual(self.backend.threads, {self.session._thread.ident})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.database import SignalLog as signals
+from advisor.MovingAverage.MovingAverage import MovingAverageCrossover
+
+
+def entry_frame(start, bars):
+    """identify_entry_levels-shaped frame of hourly bars; every 5th bar buys, every 7th sells."""
+    times = pd.date_range(start, periods=bars, freq="h")
+    close = 1.1 + np.arange(bars) * 1e-4
+    entry = np.full(bars, np.nan, dtype=object)
+    hours = ((times - pd.Timestamp("2024-01-01")) // pd.Timedelta(hours=1)).to_numpy()
+    entry[hours % 5 == 0] = 'Buy'
+    entry[hours % 7 == 0] = 'Sell'
+    signal = np.isin(entry, ['Buy', 'Sell'])
+    return pd.DataFrame({
+        'time': times, 'open': close, 'high': close, 'low': close, 'close': close,
+        'Fast_MA': close - 1e-4, 'Slow_MA': close - 2e-4, 'Entry': entry,
+        'Level': np.where(signal, close, np.nan), 'SL': np.where(signal, close - 0.003, np.nan),
+        'TP': np.where(signal, close + 0.01, np.nan),
+    })
+
+
+class Test_SignalLog(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = directory.name
+
+    def test_OverlappingAppendsWriteEachBarOnce(self):
+        log = signals.SignalLog(os.path.join(self.dir, "store"), csv_dir=self.dir)
+        full = entry_frame("2024-01-20", 24 * 30)
+        self.assertEqual(log.append("EURUSD", full.iloc[:400]), 400)
+        self.assertEqual(log.append("EURUSD", full.iloc[100:500]), 100)
+        self.assertEqual(log.append("EURUSD", full.iloc[200:500]), 0)
+        self.assertEqual(log.append("EURUSD", full), len(full) - 500)
+
+        stored = log.read(("EURUSD",))
+        np.testing.assert_array_equal(stored['time'], signals.Timeframes.epoch_seconds(full['time']))
+        self.assertEqual(log.months(("EURUSD",)), ["2024-01", "2024-02"])
+        csv = pd.read_csv(os.path.join(self.dir, "EURUSD_entry_levels.csv"))
+        self.assertEqual(len(csv), len(full))
+
+        reopened = signals.SignalLog(os.path.join(self.dir, "store"))
+        self.assertEqual(reopened.watermark("EURUSD"), int(stored['time'][-1]))
+        self.assertEqual(reopened.append("EURUSD", full), 0)
+
+    def test_LastSignalsAcrossPartitions(self):
+        log = signals.SignalLog(self.dir)
+        full = entry_frame("2024-01-31", 48)
+        log.append("EURUSD", full)
+        expected = full[full['Entry'].isin(['Buy', 'Sell'])].tail(12)
+
+        last = log.last_signals("EURUSD", 12)
+        np.testing.assert_array_equal(last['time'], signals.Timeframes.epoch_seconds(expected['time']))
+        np.testing.assert_array_equal(last['side'], np.where(expected['Entry'] == 'Buy', 1, -1))
+        np.testing.assert_allclose(last['TP'], expected['TP'])
+        self.assertEqual(len(log.last_signals("EURUSD", 1000)), int(full['Entry'].isin(['Buy', 'Sell']).sum()))
+        self.assertEqual(len(log.last_signals("GBPUSD", 5)), 0)
+
+        frame = log.read_frame("EURUSD")
+        self.assertEqual(frame['Entry'].value_counts().to_dict(), full['Entry'].value_counts().to_dict())
+
+    def test_SaveSignalsToCsvSkipsPersistedRows(self):
+        path = os.path.join(self.dir, "EURUSD_entry_levels.csv")
+        strategy = MovingAverageCrossover("EURUSD", None)
+        full = entry_frame("2024-03-01", 300)
+        with contextlib.redirect_stdout(io.StringIO()):
+            strategy.save_signals_to_csv(full.iloc[:200], file_name=path)
+            strategy.save_signals_to_csv(full.iloc[:250], file_name=path)
+            strategy.save_signals_to_csv(full, file_name=path)
+        saved = pd.read_csv(path, parse_dates=['time'])
+        self.assertEqual(len(saved), 300)
+        self.assertTrue(saved['time'].is_unique)
+        self.assertEqual(signals.csv_last_time(path), int(full['time'].iloc[-1].timestamp()))
+
+
+if __name__ == '__main__':
+    unittest.main()
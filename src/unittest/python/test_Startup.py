@@ -0,0 +1,48 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Metrics.Startup import ImportProfile, profile_import
+
+# Generous for slow CI machines: pandas and numpy take ~0.5 s of it; matplotlib alone used to add ~0.5 s
+HEADLESS_IMPORT_BUDGET = float(os.getenv("ADVISOR_IMPORT_BUDGET", "2.0"))
+
+HEADLESS_MODULES = (
+    "advisor.RunAdvisorBot",
+    "advisor.Client.Advisor",
+    "advisor.MovingAverage.MovingAverage",
+    "advisor.Trade.Evaluator",
+    "advisor.Backtest.BatchBacktest",
+)
+
+
+class Test_Startup(unittest.TestCase):
+
+    def test_HeadlessPathSkipsOptionalDependencies(self):
+        for target in HEADLESS_MODULES:
+            with self.subTest(target=target):
+                self.assertEqual(profile_import(target).loaded, [])
+
+    def test_HeadlessImportTimeIsCapped(self):
+        profile = min((profile_import("advisor.RunAdvisorBot") for _ in range(3)), key=lambda p: p.total)
+        self.assertLess(profile.total, HEADLESS_IMPORT_BUDGET, profile.report())
+
+    def test_ReportListsModules(self):
+        profile = ImportProfile("advisor.Client.Advisor", [
+            ("numpy", 0.05, 0.08), ("pandas", 0.2, 0.3), ("pandas.core", 0.1, 0.1), ("advisor.Client.Advisor", 0.01, 0.4),
+        ], [])
+        self.assertAlmostEqual(profile.total, 0.36)
+        self.assertEqual(profile.by_package()[0][0], "pandas")
+        self.assertAlmostEqual(profile.by_package()[0][1], 0.3)
+        self.assertIn("advisor.Client.Advisor", profile.report())
+        self.assertIn("optional dependencies loaded: none", profile.report())
+
+    def test_FailedImportRaises(self):
+        with self.assertRaises(ValueError):
+            profile_import("advisor.NoSuchModule")
+
+
+if __name__ == '__main__':
+    unittest.main()
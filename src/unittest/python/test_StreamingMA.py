@@ -0,0 +1,54 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.MovingAverage.MovingAverage import MovingAverageCrossover
+from advisor.MovingAverage.StreamingMA import IndicatorEngine, RollingMean
+
+
+class Test_StreamingMA(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        bars = 1400
+        self.rates = pd.DataFrame({
+            'time': 1_700_000_000 + np.arange(bars) * 3600,
+            'close': 1.10 + np.cumsum(rng.normal(0, 0.001, bars)),
+        })
+
+    def test_RollingMean(self):
+        mean = RollingMean(3)
+        self.assertIsNone(mean.update(1.0))
+        self.assertIsNone(mean.update(2.0))
+        self.assertAlmostEqual(mean.update(3.0), 2.0)
+        self.assertAlmostEqual(mean.update(7.0), 4.0)
+
+    def test_MatchesPandasRollingPath(self):
+        engine = IndicatorEngine()
+        strategy = MovingAverageCrossover('EURUSD', None)
+
+        for end in [1000, 1001, 1002, 1010, 1250, 1400]:
+            window = self.rates.iloc[end - 1000:end]
+            latest = engine.update('EURUSD', 'LTF', window)
+            expected = strategy.calculate_moving_averages(window.copy()).iloc[-1]
+
+            self.assertAlmostEqual(latest['Fast_MA'], expected['Fast_MA'], places=12)
+            self.assertAlmostEqual(latest['Slow_MA'], expected['Slow_MA'], places=12)
+            self.assertEqual(latest['Signal'], expected['Signal'])
+            self.assertEqual(latest['Crossover'], expected['Crossover'])
+            self.assertEqual(latest['Bias'], expected['Bias'])
+            self.assertEqual(latest['close'], expected['close'])
+
+    def test_NotReadyUntilSlowWindowFull(self):
+        engine = IndicatorEngine(fast_period=5, slow_period=20)
+        self.assertIsNone(engine.update('EURUSD', 'HTF', self.rates.iloc[:20]))
+        self.assertIsNotNone(engine.update('EURUSD', 'HTF', self.rates.iloc[:21]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import collections
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from advisor.Client import Backend
+from advisor.MovingAverage import MovingAverage as MA
+from advisor.Simulator import MT5Simulator as sim
+from advisor.Trade import SymbolSpecs
+from advisor.Trade.TradesAlgo import MT5TradingAlgorithm
+from fakes import FakeClock, FakeMessenger
+
+
+class CountingBackend:
+    """Wraps a backend and counts the calls made through it."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.calls = collections.Counter()
+        self.requests = []
+
+    def __getattr__(self, name):
+        attr = getattr(self.backend, name)
+        if name.isupper() or not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            self.calls[name] += 1
+            if name == 'order_send':
+                self.requests.append(args[0])
+            return attr(*args, **kwargs)
+        return call
+
+
+def install(**kwargs):
+    simulator = sim.MT5Simulator(clock=FakeClock(), history=200, **kwargs)
+    simulator.initialize()
+    backend = CountingBackend(simulator)
+    return backend
+
+
+class Test_SymbolSpecs(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = install()
+        previous = Backend.use(self.backend)
+        self.addCleanup(Backend.use, previous)
+        self.clock = FakeClock()
+        self.cache = SymbolSpecs.SymbolSpecCache(ttl=60, clock=self.clock)
+
+    def test_SpecsAreLoadedInBulk(self):
+        for symbol in ("EURUSD", "USDJPY", "GBPUSD", "EURUSD"):
+            self.assertEqual(self.cache.get(symbol).name, symbol)
+        self.assertEqual(self.backend.calls['symbols_get'], 1)
+        self.assertEqual(self.backend.calls['symbol_info'], 0)
+
+        self.assertIsNone(self.cache.get("XXXYYY"))
+        self.assertEqual(self.backend.calls['symbol_info'], 1)
+
+    def test_SpecsAreRefreshedAfterTheTTL(self):
+        self.cache.get("EURUSD")
+        self.clock.now += 59
+        self.cache.get("EURUSD")
+        self.assertEqual(self.backend.calls['symbols_get'], 1)
+        self.clock.now += 1
+        self.cache.get("EURUSD")
+        self.assertEqual(self.backend.calls['symbols_get'], 2)
+
+    def test_SpecsAreReloadedForANewBackend(self):
+        self.assertEqual(self.cache.get("EURUSD").trade_mode, sim.SYMBOL_TRADE_MODE_FULL)
+        Backend.use(install(trade_mode=sim.SYMBOL_TRADE_MODE_DISABLED))
+        self.assertEqual(self.cache.get("EURUSD").trade_mode, sim.SYMBOL_TRADE_MODE_DISABLED)
+
+    def test_PipSizeFollowsTheDigits(self):
+        self.assertAlmostEqual(self.cache.pip("EURUSD"), 0.0001)
+        self.assertAlmostEqual(self.cache.pip("USDJPY"), 0.01)
+        self.assertEqual(self.cache.pip("XXXYYY", default=0.5), 0.5)
+        self.assertAlmostEqual(MA.entry_threshold("EURJPY", self.cache.pip("EURJPY")), 0.5)
+        self.assertAlmostEqual(MA.entry_threshold("EURJPY"), 0.005)
+
+    def test_FillingTypeComesFromTheBitmask(self):
+        spec = self.cache.get("EURUSD")
+        for mask, expected in ((sim.SYMBOL_FILLING_FOK | sim.SYMBOL_FILLING_IOC, sim.ORDER_FILLING_IOC),
+                               (sim.SYMBOL_FILLING_FOK, sim.ORDER_FILLING_FOK),
+                               (0, sim.ORDER_FILLING_RETURN)):
+            spec.filling_mode = mask
+            self.assertEqual(spec.filling_type(), expected)
+
+    def test_VolumeIsRoundedToTheStep(self):
+        spec = self.cache.get("EURUSD")
+        self.assertEqual(spec.round_volume(0.123), 0.12)
+        self.assertEqual(spec.round_volume(0.001), 0.01)
+        self.assertEqual(spec.round_volume(500), 100.0)
+        self.assertEqual(spec.round_price(1.1234567), 1.12346)
+
+
+class Test_PlaceOrder(unittest.TestCase):
+
+    def place(self, trade_mode):
+        backend = install(trade_mode=trade_mode)
+        previous = Backend.use(backend)
+        self.addCleanup(Backend.use, previous)
+        messenger = FakeMessenger()
+        trader = MT5TradingAlgorithm("EURUSD", messenger, {'volume': 0.123, 'sl': 100, 'tp': 300})
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = trader.place_order("buy", stop_loss=100, take_profit=300)
+        return backend, messenger, result
+
+    def test_OneTickAndNoSymbolInfoPerOrder(self):
+        backend, messenger, result = self.place(sim.SYMBOL_TRADE_MODE_FULL)
+        self.assertEqual(result, (True, backend.requests[0]))
+        self.assertEqual(backend.calls['order_send'], 1)
+        self.assertEqual(backend.calls['symbol_info_tick'], 1)
+        self.assertEqual(backend.calls['symbol_info'], 0)
+        self.assertEqual(len(messenger.messages), 1)
+
+        # The spec cache is shared, so the next order makes no spec call at all
+        with contextlib.redirect_stdout(io.StringIO()):
+            MT5TradingAlgorithm("EURUSD", messenger, {'volume': 0.1}).place_order("sell")
+        self.assertEqual(backend.calls['symbols_get'], 1)
+
+    def test_DisabledSymbolOnlySendsTheSignal(self):
+        backend, messenger, result = self.place(sim.SYMBOL_TRADE_MODE_DISABLED)
+        self.assertIs(result, True)
+        self.assertEqual(backend.calls['order_send'], 0)
+        self.assertEqual(len(messenger.messages), 1)
+        self.assertIn("buy EURUSD", messenger.messages[0])
+
+    def test_RequestUsesTheSpec(self):
+        backend, _, _ = self.place(sim.SYMBOL_TRADE_MODE_FULL)
+        request = backend.requests[0]
+        tick = backend.backend.symbol_info_tick("EURUSD")
+        self.assertEqual(request['price'], tick.ask)
+        self.assertEqual(request['volume'], 0.12)
+        self.assertEqual(request['type_filling'], sim.ORDER_FILLING_IOC)
+        self.assertEqual(request['sl'], round(tick.ask - 100 * 1e-5, 5))
+        self.assertEqual(request['tp'], round(tick.ask + 300 * 1e-5, 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Client import Timeframes
+from advisor.Client.Rates import RATES_DTYPE
+from advisor.MovingAverage import MovingAverage as MA
+from advisor.Simulator import SyntheticBars
+
+
+class Test_SyntheticBars(unittest.TestCase):
+
+    def test_RatesLookLikeTerminalBars(self):
+        rates = SyntheticBars.generate_rates(5000, Timeframes.TIMEFRAME_H1, seed=3)
+        self.assertEqual(rates.dtype, RATES_DTYPE)
+        self.assertEqual(len(rates), 5000)
+        self.assertTrue((np.diff(rates['time']) > 0).all())
+        self.assertTrue((rates['high'] >= np.maximum(rates['open'], rates['close'])).all())
+        self.assertTrue((rates['low'] <= np.minimum(rates['open'], rates['close'])).all())
+        np.testing.assert_array_equal(rates['open'][1:], rates['close'][:-1])
+        np.testing.assert_array_equal(rates['close'], np.round(rates['close'], 5))
+
+        # No bars from Friday 22:00 to Sunday 22:00 UTC
+        times = pd.to_datetime(rates['time'], unit='s')
+        weekend = (times.dayofweek == 5) | ((times.dayofweek == 4) & (times.hour >= 22)) | \
+                  ((times.dayofweek == 6) & (times.hour < 22))
+        self.assertFalse(weekend.any())
+
+    def test_VolatilityMatchesTheTarget(self):
+        rates = SyntheticBars.generate_rates(200_000, Timeframes.TIMEFRAME_M1, annual_volatility=0.10, weekends=False)
+        per_bar = np.std(np.diff(np.log(rates['close'])))
+        expected = 0.10 * np.sqrt(60 / (252 * 86400))
+        self.assertAlmostEqual(per_bar / expected, 1.0, delta=0.1)
+
+    def test_SeedIsReproducible(self):
+        np.testing.assert_array_equal(SyntheticBars.generate_rates(100, seed=7), SyntheticBars.generate_rates(100, seed=7))
+        self.assertFalse(np.array_equal(SyntheticBars.generate_rates(100, seed=7)['close'],
+                                        SyntheticBars.generate_rates(100, seed=8)['close']))
+
+    def test_HigherTimeframesAreAggregatedFromTheBase(self):
+        data = SyntheticBars.generate_multi_tf(1000, {"HTF": Timeframes.TIMEFRAME_H4, "LTF": Timeframes.TIMEFRAME_H1})
+        ltf, htf = data["LTF"], data["HTF"]
+        self.assertTrue((htf['time'] % (4 * 3600) == 0).all())
+        first = ltf[(ltf['time'] >= htf['time'][1]) & (ltf['time'] < htf['time'][1] + 4 * 3600)]
+        self.assertEqual(htf['open'][1], first['open'][0])
+        self.assertEqual(htf['close'][1], first['close'][-1])
+        self.assertEqual(htf['high'][1], first['high'].max())
+        self.assertEqual(htf['tick_volume'][1], first['tick_volume'].sum())
+
+        weekly = SyntheticBars.aggregate(ltf, Timeframes.TIMEFRAME_W1)
+        self.assertTrue((pd.to_datetime(weekly['time'], unit='s').dayofweek == 6).all())
+
+    def test_PipelineRunsOnSyntheticBars(self):
+        data = SyntheticBars.generate_multi_tf(3000, {"HTF": Timeframes.TIMEFRAME_H4, "LTF": Timeframes.TIMEFRAME_H1})
+        strategy = MA.MovingAverageCrossover("EURUSD", None)
+        with contextlib.redirect_stdout(io.StringIO()):
+            htf = strategy.calculate_moving_averages(SyntheticBars.rates_frame(data["HTF"]))
+            ltf = strategy.calculate_moving_averages(SyntheticBars.rates_frame(data["LTF"]))
+            entries = strategy.identify_entry_levels(htf.reset_index(drop=True), ltf.reset_index(drop=True))
+            results = strategy.backtest_strategy(entries)
+
+        self.assertIn('Entry', entries.columns)
+        self.assertTrue(set(results['Position'].unique()) <= {-1.0, 0.0, 1.0})
+        self.assertEqual(len(results), len(entries) - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
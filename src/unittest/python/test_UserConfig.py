@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Client import UserConfig
+
+ENVIRON = {
+    "ADVISOR_VOLUME": "0.05", "ADVISOR_SL": "20", "ADVISOR_RR": "1:3",
+    "ADVISOR_SERVER": "Broker-Demo", "ADVISOR_ACCOUNT": "12345678", "ADVISOR_PASSWORD": "secret123",
+}
+
+
+class Test_UserConfig(unittest.TestCase):
+
+    def write_config(self, text):
+        handle, path = tempfile.mkstemp(suffix=".ini")
+        with os.fdopen(handle, "w", encoding="utf-8") as f:
+            f.write(text)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_FromEnvironment(self):
+        user_data = UserConfig.load_user_data(environ=ENVIRON)
+        self.assertEqual(user_data, {"volume": 0.05, "sl": 20.0, "tp": 60.0, "server": "Broker-Demo",
+                                     "account_id": "12345678", "password": "secret123"})
+
+    def test_FileWithEnvironmentOverrides(self):
+        path = self.write_config("[advisor]\nvolume = 0.01\nsl = 100\nrr = 1:2\nserver = File-Server\n"
+                                 "account = 87654321\npassword = fromfile1\n")
+        user_data = UserConfig.load_user_data(path, environ={"ADVISOR_SERVER": "Env-Server"})
+        self.assertEqual(user_data['tp'], 200.0)
+        self.assertEqual(user_data['server'], "Env-Server")
+        self.assertEqual(user_data['account_id'], "87654321")
+
+        from_env_path = UserConfig.load_user_data(environ={UserConfig.CONFIG_ENV: path})
+        self.assertEqual(from_env_path['server'], "File-Server")
+
+    def test_InvalidSettingsRaise(self):
+        with self.assertRaisesRegex(ValueError, "password"):
+            UserConfig.load_user_data(environ={k: v for k, v in ENVIRON.items() if k != "ADVISOR_PASSWORD"})
+        with self.assertRaisesRegex(ValueError, "Account ID"):
+            UserConfig.load_user_data(environ={**ENVIRON, "ADVISOR_ACCOUNT": "12ab"})
+        with self.assertRaisesRegex(ValueError, "RR Ratio"):
+            UserConfig.load_user_data(environ={**ENVIRON, "ADVISOR_RR": "one to three"})
+        with self.assertRaisesRegex(ValueError, "not found"):
+            UserConfig.load_user_data("/no/such/advisor.ini", environ={})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../main/python")))
+
+from advisor.Scheduler.WorkerPool import WorkerPool
+
+
+class Test_WorkerPool(unittest.TestCase):
+
+    def test_RunRoundIsBounded(self):
+        pool = WorkerPool(max_workers=3, task_timeout=5)
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def evaluate(symbol):
+            with lock:
+                running.append(symbol)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(symbol)
+            return symbol.lower()
+
+        symbols = [f"SYM{i}" for i in range(20)]
+        results = pool.run_round(symbols, evaluate)
+        pool.shutdown()
+
+        self.assertEqual(results, {symbol: symbol.lower() for symbol in symbols})
+        self.assertLessEqual(max(peak), 3)
+        self.assertEqual(pool.stats()["SYM0"]["runs"], 1)
+
+    def test_TimeoutAndBusySymbolsAreSkipped(self):
+        pool = WorkerPool(max_workers=2, task_timeout=0.05)
+        release = threading.Event()
+
+        def evaluate(symbol):
+            if symbol == "SLOW":
+                release.wait(2)
+            if symbol == "BAD":
+                raise RuntimeError("no data")
+            return symbol
+
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            results = pool.run_round(["SLOW", "FAST", "BAD"], evaluate)
+        self.assertEqual(results, {"FAST": "FAST"})
+        self.assertIn("❌ Exception in thread BAD: no data", out.getvalue())
+        self.assertIn("Traceback", out.getvalue())
+        self.assertIn('raise RuntimeError("no data")', out.getvalue())
+        self.assertEqual(pool.stats()["SLOW"]["timeouts"], 1)
+        self.assertEqual(pool.stats()["BAD"]["failures"], 1)
+
+        # SLOW is still running, so the next round must not queue it again
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = pool.run_round(["SLOW", "FAST"], evaluate)
+        self.assertEqual(results, {"FAST": "FAST"})
+        self.assertEqual(pool.stats()["SLOW"]["skipped"], 1)
+
+        release.set()
+        pool.shutdown()
+        self.assertEqual(pool.stats()["SLOW"]["runs"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()